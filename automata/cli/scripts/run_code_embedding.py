@@ -3,12 +3,15 @@ import os
 
 from tqdm import tqdm
 
+from automata.config import SYMBOL_GRAPH_SNAPSHOT_PATH, SYMBOL_SEARCH_QUERY_CACHE_PATH
 from automata.config.base import ConfigCategory
 from automata.core.base.database.vector import JSONVectorDatabase
 from automata.core.coding.py.module_loader import py_module_loader
 from automata.core.embedding.code_embedding import SymbolCodeEmbeddingHandler
+from automata.core.llm.embedding_cache import CachedEmbeddingProvider
 from automata.core.llm.providers.openai import OpenAIEmbeddingProvider
 from automata.core.symbol.graph import SymbolGraph
+from automata.core.symbol.search.query_cache import SymbolSearchQueryCache
 from automata.core.symbol.symbol_utils import get_rankable_symbols
 from automata.core.utils import get_config_fpath
 
@@ -31,13 +34,15 @@ def main(*args, **kwargs) -> str:
         kwargs.get("embedding_file", "symbol_code_embedding.json"),
     )
 
-    symbol_graph = SymbolGraph(scip_path)
+    symbol_graph = SymbolGraph(scip_path, snapshot_dir=SYMBOL_GRAPH_SNAPSHOT_PATH)
 
     all_defined_symbols = symbol_graph.get_all_available_symbols()
     filtered_symbols = sorted(get_rankable_symbols(all_defined_symbols), key=lambda x: x.dotpath)
 
     embedding_db = JSONVectorDatabase(embedding_path)
-    embedding_handler = SymbolCodeEmbeddingHandler(embedding_db, OpenAIEmbeddingProvider())
+    embedding_handler = SymbolCodeEmbeddingHandler(
+        embedding_db, CachedEmbeddingProvider(OpenAIEmbeddingProvider())
+    )
 
     for symbol in tqdm(filtered_symbols):
         try:
@@ -45,4 +50,7 @@ def main(*args, **kwargs) -> str:
             embedding_db.save()
         except Exception as e:
             logger.error(f"Failed to update embedding for {symbol.dotpath}: {e}")
+
+    # The cached SymbolRank searches were ranked against the previous code embeddings
+    SymbolSearchQueryCache(db_path=SYMBOL_SEARCH_QUERY_CACHE_PATH).invalidate()
     return "Success"
@@ -3,6 +3,7 @@ import os
 
 from tqdm import tqdm
 
+from automata.config import SYMBOL_BOUNDING_BOX_CACHE_PATH, SYMBOL_GRAPH_SNAPSHOT_PATH
 from automata.config.base import ConfigCategory
 from automata.core.base.database.vector import JSONVectorDatabase
 from automata.core.coding.py.module_loader import py_module_loader
@@ -55,7 +56,11 @@ def main(*args, **kwargs) -> str:
     )
     embedding_db_l2 = JSONVectorDatabase(embedding_path_l2)
 
-    symbol_graph = SymbolGraph(scip_path)
+    symbol_graph = SymbolGraph(
+        scip_path,
+        snapshot_dir=SYMBOL_GRAPH_SNAPSHOT_PATH,
+        bounding_box_cache_path=SYMBOL_BOUNDING_BOX_CACHE_PATH,
+    )
 
     symbol_code_similarity = SymbolSimilarityCalculator(code_embedding_handler)
 
@@ -3,6 +3,7 @@ import os
 
 from tqdm import tqdm
 
+from automata.config import SYMBOL_BOUNDING_BOX_CACHE_PATH, SYMBOL_GRAPH_SNAPSHOT_PATH
 from automata.config.base import ConfigCategory
 from automata.core.base.database.vector import JSONVectorDatabase
 from automata.core.coding.py.module_loader import py_module_loader
@@ -60,7 +61,11 @@ def main(*args, **kwargs) -> str:
         kwargs.get("symbol_doc_embedding_l3_fpath", "symbol_doc_embedding_l3.json"),
     )
 
-    symbol_graph = SymbolGraph(scip_path)
+    symbol_graph = SymbolGraph(
+        scip_path,
+        snapshot_dir=SYMBOL_GRAPH_SNAPSHOT_PATH,
+        bounding_box_cache_path=SYMBOL_BOUNDING_BOX_CACHE_PATH,
+    )
 
     embedding_db_l3 = JSONVectorDatabase(embedding_path_l3)
 
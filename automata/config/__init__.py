@@ -8,6 +8,11 @@ Environment variables:
 - CONVERSATION_DB_PATH: The abs path to use for storing conversation data.
 - TASK_DB_PATH: The output path for new tasks.
 - MAX_WORKERS: The maximum number of workers to run concurrently.
+- SYMBOL_GRAPH_SNAPSHOT_PATH: The directory used to store built symbol graph snapshots.
+- SYMBOL_BOUNDING_BOX_SOURCE: How symbol bounding boxes are computed, either "ast" or "redbaron".
+- SYMBOL_BOUNDING_BOX_CACHE_PATH: The abs path to use for storing computed symbol bounding boxes.
+- EMBEDDING_CACHE_PATH: The abs path to use for storing the embeddings of queries and source code.
+- SYMBOL_SEARCH_QUERY_CACHE_PATH: The abs path to use for storing the results of SymbolRank searches.
 
 Note that the environment variables are loaded from a .env file using the `load_dotenv()` function from the `dotenv` library.
 """
@@ -28,3 +33,16 @@ TASK_DB_PATH = os.getenv("TASK_DB_PATH", os.path.join("..", "task_db.sqlite3"))
 TASK_OUTPUT_PATH = os.getenv("TASKS_OUTPUT_PATH", os.path.join("..", "tasks"))
 REPOSITORY_NAME = os.getenv("REPOSITORY_NAME", "emrgnt-cmplxty/Automata")
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", 8))
+SYMBOL_GRAPH_SNAPSHOT_PATH = os.getenv(
+    "SYMBOL_GRAPH_SNAPSHOT_PATH", os.path.join("..", "symbol_graph_snapshots")
+)
+SYMBOL_BOUNDING_BOX_SOURCE = os.getenv("SYMBOL_BOUNDING_BOX_SOURCE", "ast")
+SYMBOL_BOUNDING_BOX_CACHE_PATH = os.getenv(
+    "SYMBOL_BOUNDING_BOX_CACHE_PATH", os.path.join("..", "symbol_bounding_boxes.sqlite3")
+)
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", os.path.join("..", "embedding_cache.sqlite3")
+)
+SYMBOL_SEARCH_QUERY_CACHE_PATH = os.getenv(
+    "SYMBOL_SEARCH_QUERY_CACHE_PATH", os.path.join("..", "symbol_search_query_cache.sqlite3")
+)
@@ -48,12 +48,14 @@ class ContextOracleToolBuilder(AgentToolBuilder):
         The function constructs the context by concatenating the source code and documentation of the most semantically
         similar symbol to the query with the documentation summary of the most highly
         ranked symbols. The ranking of symbols is based on their semantic similarity to the query.
+        Ranked symbols without a documentation embedding are skipped, so the query is ranked
+        once in full, and the ranking is walked until enough documented symbols are found.
         """
         doc_output = self.symbol_doc_similarity.calculate_query_similarity_dict(query)
         most_similar_doc_embedding = self.symbol_doc_similarity.embedding_handler.get_embedding(
             sorted(doc_output.items(), key=lambda x: -x[1])[0][0]
         )
-        print("The most similar doc embedding = ", most_similar_doc_embedding)
+        logger.debug("The most similar doc embedding = %s", most_similar_doc_embedding)
         rank_output = self.symbol_search.symbol_rank_search(query)
 
         result = most_similar_doc_embedding.source_code
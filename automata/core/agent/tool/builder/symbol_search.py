@@ -35,9 +35,16 @@ class SymbolSearchToolBuilder(AgentToolBuilder):
         self,
         symbol_search: SymbolSearch,
         search_tools: Optional[List[SearchTool]] = None,
+        symbol_rank_top_k: Optional[int] = None,
     ) -> None:
+        """
+        Args:
+            symbol_rank_top_k: The number of symbols returned by the symbol rank search tool,
+                which returns every ranked symbol by default
+        """
         self.symbol_search = symbol_search
         self.search_tools = search_tools or list(SearchTool)
+        self.symbol_rank_top_k = symbol_rank_top_k
 
     def build_tool(self, tool_type: SearchTool) -> Tool:
         """Builds a suite of tools for searching the associated codebase."""
@@ -74,7 +81,7 @@ class SymbolSearchToolBuilder(AgentToolBuilder):
     # TODO - Cleanup these processors to ensure they behave well.
     # -- Right now these are just simplest implementations I can rattle off
     def _symbol_rank_search_processor(self, query: str) -> str:
-        query_result = self.symbol_search.symbol_rank_search(query)
+        query_result = self.symbol_search.symbol_rank_search(query, top_k=self.symbol_rank_top_k)
         return "\n".join([symbol.uri for symbol, _rank in query_result])
 
     def _symbol_symbol_references_processor(self, query: str) -> str:
@@ -3,6 +3,12 @@ import logging
 import os
 from typing import Any, Dict, List, Sequence, Tuple
 
+from automata.config import (
+    EMBEDDING_CACHE_PATH,
+    SYMBOL_BOUNDING_BOX_CACHE_PATH,
+    SYMBOL_GRAPH_SNAPSHOT_PATH,
+    SYMBOL_SEARCH_QUERY_CACHE_PATH,
+)
 from automata.config.base import ConfigCategory, LLMProvider
 from automata.core.agent.error import AgentGeneralError, UnknownToolError
 from automata.core.agent.tool.registry import AutomataOpenAIAgentToolBuilderRegistry
@@ -18,11 +24,14 @@ from automata.core.context.py.retriever import (
 from automata.core.embedding.code_embedding import SymbolCodeEmbeddingHandler
 from automata.core.embedding.doc_embedding import SymbolDocEmbeddingHandler
 from automata.core.embedding.symbol_similarity import SymbolSimilarityCalculator
+from automata.core.llm.embedding import EmbeddingProvider
+from automata.core.llm.embedding_cache import CachedEmbeddingProvider
 from automata.core.llm.providers.openai import (
     OpenAIChatCompletionProvider,
     OpenAIEmbeddingProvider,
 )
 from automata.core.symbol.graph import SymbolGraph
+from automata.core.symbol.search.query_cache import SymbolSearchQueryCache
 from automata.core.symbol.search.rank import SymbolRankConfig
 from automata.core.symbol.search.symbol_search import SymbolSearch
 from automata.core.utils import get_config_fpath
@@ -68,11 +77,15 @@ class DependencyFactory:
         """
         Keyword Args (Defaults):
             symbol_graph_path (DependencyFactory.DEFAULT_SCIP_FPATH)
+            symbol_graph_snapshot_dir (SYMBOL_GRAPH_SNAPSHOT_PATH)
+            symbol_graph_bounding_box_cache_path (SYMBOL_BOUNDING_BOX_CACHE_PATH)
             flow_rank ("bidirectional")
-            embedding_provider (OpenAIEmbedding())
+            embedding_provider (CachedEmbeddingProvider(OpenAIEmbeddingProvider()))
+            embedding_cache_path (EMBEDDING_CACHE_PATH)
             code_embedding_fpath (DependencyFactory.DEFAULT_CODE_EMBEDDING_FPATH)
             doc_embedding_fpath (DependencyFactory.DEFAULT_DOC_EMBEDDING_FPATH)
             symbol_rank_config (SymbolRankConfig())
+            symbol_search_query_cache_path (SYMBOL_SEARCH_QUERY_CACHE_PATH)
             py_context_retriever_config (PyContextRetrieverConfig())
             coding_project_path (get_root_py_fpath())
             doc_completion_provider (OpenAIChatCompletionProvider())
@@ -115,9 +128,17 @@ class DependencyFactory:
         """
         Associated Keyword Args:
             symbol_graph_path (DependencyFactory.DEFAULT_SCIP_FPATH)
+            symbol_graph_snapshot_dir (SYMBOL_GRAPH_SNAPSHOT_PATH)
+            symbol_graph_bounding_box_cache_path (SYMBOL_BOUNDING_BOX_CACHE_PATH)
         """
         return SymbolGraph(
-            self.overrides.get("symbol_graph_path", DependencyFactory.DEFAULT_SCIP_FPATH)
+            self.overrides.get("symbol_graph_path", DependencyFactory.DEFAULT_SCIP_FPATH),
+            snapshot_dir=self.overrides.get(
+                "symbol_graph_snapshot_dir", SYMBOL_GRAPH_SNAPSHOT_PATH
+            ),
+            bounding_box_cache_path=self.overrides.get(
+                "symbol_graph_bounding_box_cache_path", SYMBOL_BOUNDING_BOX_CACHE_PATH
+            ),
         )
 
     @classmethod_lru_cache()
@@ -131,19 +152,30 @@ class DependencyFactory:
             self.overrides.get("flow_rank", "bidirectional")
         )
 
+    @classmethod_lru_cache()
+    def create_embedding_provider(self) -> EmbeddingProvider:
+        """
+        Associated Keyword Args:
+            embedding_cache_path (EMBEDDING_CACHE_PATH)
+        """
+        return CachedEmbeddingProvider(
+            OpenAIEmbeddingProvider(),
+            db_path=self.overrides.get("embedding_cache_path", EMBEDDING_CACHE_PATH),
+        )
+
     @classmethod_lru_cache()
     def create_symbol_code_similarity(self) -> SymbolSimilarityCalculator:
         """
         Associated Keyword Args:
             code_embedding_fpath (DependencyFactory.DEFAULT_CODE_EMBEDDING_FPATH)
-            embedding_provider (OpenAIEmbedding())
+            embedding_provider (CachedEmbeddingProvider(OpenAIEmbeddingProvider()))
         """
         code_embedding_fpath = self.overrides.get(
             "code_embedding_fpath", DependencyFactory.DEFAULT_CODE_EMBEDDING_FPATH
         )
         code_embedding_db = JSONVectorDatabase(code_embedding_fpath)
 
-        embedding_provider = self.overrides.get("embedding_provider", OpenAIEmbeddingProvider())
+        embedding_provider = self.get("embedding_provider")
         code_embedding_handler = SymbolCodeEmbeddingHandler(code_embedding_db, embedding_provider)
         return SymbolSimilarityCalculator(code_embedding_handler)
 
@@ -152,14 +184,14 @@ class DependencyFactory:
         """
         Associated Keyword Args:
             doc_embedding_fpath (DependencyFactory.DEFAULT_DOC_EMBEDDING_FPATH)
-            embedding_provider (OpenAIEmbedding())
+            embedding_provider (CachedEmbeddingProvider(OpenAIEmbeddingProvider()))
         """
         doc_embedding_fpath = self.overrides.get(
             "doc_embedding_fpath", DependencyFactory.DEFAULT_DOC_EMBEDDING_FPATH
         )
         doc_embedding_db = JSONVectorDatabase(doc_embedding_fpath)
 
-        embedding_provider = self.overrides.get("embedding_provider", OpenAIEmbeddingProvider())
+        embedding_provider = self.get("embedding_provider")
         symbol_search = self.get("symbol_search")
         py_context_retriever = self.get("py_context_retriever")
         completion_provider = self.overrides.get(
@@ -175,11 +207,24 @@ class DependencyFactory:
         )
         return SymbolSimilarityCalculator(doc_embedding_handler)
 
+    @classmethod_lru_cache()
+    def create_symbol_search_query_cache(self) -> SymbolSearchQueryCache:
+        """
+        Associated Keyword Args:
+            symbol_search_query_cache_path (SYMBOL_SEARCH_QUERY_CACHE_PATH)
+        """
+        return SymbolSearchQueryCache(
+            db_path=self.overrides.get(
+                "symbol_search_query_cache_path", SYMBOL_SEARCH_QUERY_CACHE_PATH
+            )
+        )
+
     @classmethod_lru_cache()
     def create_symbol_search(self) -> SymbolSearch:
         """
         Associated Keyword Args:
             symbol_rank_config (SymbolRankConfig())
+            symbol_search_query_cache_path (SYMBOL_SEARCH_QUERY_CACHE_PATH)
         """
         symbol_graph = self.get("symbol_graph")
         symbol_code_similarity = self.get("symbol_code_similarity")
@@ -190,6 +235,7 @@ class DependencyFactory:
             symbol_code_similarity,
             symbol_rank_config,
             symbol_graph_subgraph,
+            query_cache=self.get("symbol_search_query_cache"),
         )
 
     @classmethod_lru_cache()
@@ -223,6 +223,24 @@ class PyModuleLoader(metaclass=Singleton):
             return self._dotpath_map.get_module_fpath_by_dotpath(module_dotpath)  # type: ignore
         return None
 
+    def fetch_module_fpath_by_dotpath(self, module_dotpath: str) -> Optional[str]:
+        """
+        Gets the module fpath for the specified module dotpath, whether or not it has been loaded.
+
+        Args:
+            module_dotpath (str): The module dotpath.
+
+        Returns:
+            str: The module fpath for the specified module dotpath, or None if it is unknown.
+
+        Raises:
+            Exception: If the map or python directory have not been initialized
+        """
+        self._assert_initialized()
+        if not self._dotpath_map.contains_dotpath(module_dotpath):  # type: ignore
+            return None
+        return self._dotpath_map.get_module_fpath_by_dotpath(module_dotpath)  # type: ignore
+
     def get_module_dotpath_by_fpath(self, module_fpath: str) -> str:
         """
         Gets the module dotpath for the specified module fpath.
@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from automata.config import EMBEDDING_CACHE_PATH
+from automata.core.base.database.relational import SQLDatabase
+from automata.core.llm.embedding import EmbeddingProvider
+
+
+class EmbeddingCache(SQLDatabase):
+    """A persistent store of embeddings, keyed by the engine and the hash of the embedded text."""
+
+    TABLE_NAME = "embeddings"
+    TABLE_FIELDS = {
+        "engine": "TEXT",
+        "text_hash": "TEXT",
+        "vector": "BLOB",
+    }
+
+    def __init__(self, db_path: str = EMBEDDING_CACHE_PATH) -> None:
+        self.connect(db_path)
+        self.create_table(self.TABLE_NAME, self.TABLE_FIELDS)
+        self.cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {self.TABLE_NAME}_key "
+            f"ON {self.TABLE_NAME} (engine, text_hash)"
+        )
+        self.conn.commit()
+
+    def get_embedding(self, engine: str, text_hash: str) -> Optional[np.ndarray]:
+        rows = self.select(self.TABLE_NAME, ["vector"], {"engine": engine, "text_hash": text_hash})
+        return np.frombuffer(rows[0][0], dtype=np.float64) if rows else None
+
+    def put_embedding(self, engine: str, text_hash: str, embedding: np.ndarray) -> None:
+        self.cursor.execute(
+            f"INSERT OR REPLACE INTO {self.TABLE_NAME} (engine, text_hash, vector) VALUES (?, ?, ?)",
+            (engine, text_hash, np.asarray(embedding, dtype=np.float64).tobytes()),
+        )
+        self.conn.commit()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    An `EmbeddingProvider` which caches the embeddings of another provider.
+
+    Embeddings are keyed by the engine of the provider and the hash of the text, so that
+    repeated queries and unchanged source code are only embedded once. The most recently
+    used embeddings are kept in memory, and every embedding is stored in an `EmbeddingCache`
+    on disk, unless `db_path` is None. The returned arrays are shared with the cache, so
+    they are read-only.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        db_path: Optional[str] = EMBEDDING_CACHE_PATH,
+        max_memory_entries: int = 4096,
+        engine: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            engine: The name which keys the embeddings of the provider, which defaults to
+                its `engine` attribute, or its class name
+
+        Raises:
+            ValueError: If max_memory_entries is not positive
+        """
+        if max_memory_entries <= 0:
+            raise ValueError(f"max_memory_entries must be positive, but got {max_memory_entries}")
+        self.provider = provider
+        self.engine = (
+            engine
+            if engine is not None
+            else str(getattr(provider, "engine", type(provider).__name__))
+        )
+        self.max_memory_entries = max_memory_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._embeddings: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._disk_cache = EmbeddingCache(db_path) if db_path else None
+
+    def build_embedding_array(self, symbol_source: str) -> np.ndarray:
+        """Gets the embedding of the text from the cache, or from the provider if it is missing."""
+        text_hash = hashlib.sha256(symbol_source.encode()).hexdigest()
+        key = (self.engine, text_hash)
+        embedding = self._embeddings.get(key)
+        if embedding is not None:
+            self.memory_hits += 1
+            self._embeddings.move_to_end(key)
+            return embedding
+
+        if self._disk_cache is not None:
+            embedding = self._disk_cache.get_embedding(self.engine, text_hash)
+        if embedding is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            embedding = np.array(
+                self.provider.build_embedding_array(symbol_source), dtype=np.float64
+            )
+            if self._disk_cache is not None:
+                self._disk_cache.put_embedding(self.engine, text_hash, embedding)
+
+        embedding.setflags(write=False)
+        self._embeddings[key] = embedding
+        while len(self._embeddings) > self.max_memory_entries:
+            self._embeddings.popitem(last=False)
+        return embedding
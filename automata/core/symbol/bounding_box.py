@@ -0,0 +1,319 @@
+import ast
+import hashlib
+import logging
+import os
+from bisect import bisect_left
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from automata.config import SYMBOL_BOUNDING_BOX_CACHE_PATH
+from automata.core.base.database.relational import SQLDatabase
+from automata.core.coding.py.module_loader import py_module_loader
+from automata.core.symbol.symbol_types import Symbol, SymbolDescriptor
+
+logger = logging.getLogger(__name__)
+
+# The number of parsed modules kept in memory, for symbols whose boxes are computed one at a time
+AST_MODULE_CACHE_SIZE = 256
+
+_AstDefinition = Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+class BoundingBoxSource(Enum):
+    """
+    The ways in which the bounding box of a symbol definition can be computed.
+
+    AST parses each module once with the standard library `ast` module, which is far
+    faster than building the RedBaron FST of the module. REDBARON uses the FST objects
+    of the `py_module_loader`, and is also the fallback for symbols that AST cannot locate.
+    """
+
+    AST = "ast"
+    REDBARON = "redbaron"
+
+
+class BoundingBoxPoint(NamedTuple):
+    line: int
+    column: int
+
+
+class BoundingBox(NamedTuple):
+    """
+    The extent of a symbol definition, in the 1-indexed positions used by RedBaron.
+
+    A RedBaron bounding box extends over the blank lines which follow a definition,
+    so `bottom_right` is placed at the start of the line after the definition ends.
+    Either kind of box then encloses exactly the same references.
+    """
+
+    top_left: BoundingBoxPoint
+    bottom_right: BoundingBoxPoint
+
+    @classmethod
+    def from_ast_node(cls, node: _AstDefinition) -> "BoundingBox":
+        start_line = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        return cls(
+            BoundingBoxPoint(start_line, node.col_offset + 1),
+            BoundingBoxPoint((node.end_lineno or node.lineno) + 1, 0),
+        )
+
+
+class _ModuleDefinitions:
+    """
+    The class and function definitions of a parsed module, in depth-first source order.
+
+    Each definition is indexed by its kind and name, and records the end of its run of
+    descendants, so that finding the first definition with a name under another definition
+    is a binary search rather than a walk of the syntax tree.
+    """
+
+    def __init__(self, module: ast.Module) -> None:
+        self.nodes: List[_AstDefinition] = []
+        self.descendants_end: List[int] = []
+        self.positions: Dict[Tuple[SymbolDescriptor.PyKind, str], List[int]] = {}
+        self._add_definitions(module)
+
+    def find(
+        self, kind: SymbolDescriptor.PyKind, name: str, parent: Optional[int]
+    ) -> Optional[int]:
+        """Finds the first definition of a kind and name under `parent`, or in the whole module."""
+        start, end = (
+            (0, len(self.nodes)) if parent is None else (parent + 1, self.descendants_end[parent])
+        )
+        positions = self.positions.get((kind, name), [])
+        i = bisect_left(positions, start)
+        return positions[i] if i < len(positions) and positions[i] < end else None
+
+    def _add_definitions(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                kind = (
+                    SymbolDescriptor.PyKind.Class
+                    if isinstance(child, ast.ClassDef)
+                    else SymbolDescriptor.PyKind.Method
+                )
+                position = len(self.nodes)
+                self.nodes.append(child)
+                self.descendants_end.append(position + 1)
+                self.positions.setdefault((kind, child.name), []).append(position)
+                self._add_definitions(child)
+                self.descendants_end[position] = len(self.nodes)
+            else:
+                self._add_definitions(child)
+
+
+def compute_ast_bounding_boxes(
+    symbols: Iterable[Symbol],
+) -> Tuple[Dict[Symbol, BoundingBox], List[Symbol]]:
+    """
+    Computes the bounding boxes of symbols by parsing their modules with `ast`.
+
+    Each module is parsed at most once while it is unchanged. Symbols whose definition
+    cannot be found are omitted, as RedBaron would not find them either.
+
+    Returns:
+        The bounding boxes which were found, and the symbols whose module could not be
+        parsed, e.g. because it only exists in memory, which should fall back to RedBaron.
+    """
+    symbols_by_module: Dict[str, List[Symbol]] = {}
+    for symbol in symbols:
+        symbols_by_module.setdefault(symbol.module_name, []).append(symbol)
+
+    bounding_boxes: Dict[Symbol, BoundingBox] = {}
+    unparsed_symbols: List[Symbol] = []
+    for module_dotpath, module_symbols in symbols_by_module.items():
+        module_fpath = py_module_loader.fetch_module_fpath_by_dotpath(module_dotpath)
+        if module_fpath is None:
+            continue
+        try:
+            stat = os.stat(module_fpath)
+            definitions = _parse_ast_module(module_fpath, stat.st_mtime_ns, stat.st_size)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.warning(f"Failed to parse {module_fpath} with ast: {e}")
+            unparsed_symbols.extend(module_symbols)
+            continue
+
+        for symbol in module_symbols:
+            node = _find_ast_definition(definitions, symbol)
+            if node is not None:
+                bounding_boxes[symbol] = BoundingBox.from_ast_node(node)
+            else:
+                logger.error(f"Error computing bounding box for {symbol.uri}: not found")
+    return bounding_boxes, unparsed_symbols
+
+
+def get_module_content_hash(module_dotpath: str) -> Optional[str]:
+    """
+    Hashes the source of a module on disk, returning None if it cannot be read,
+    or if the `py_module_loader` is not initialized.
+    """
+    if not py_module_loader.initialized:
+        return None
+    module_fpath = py_module_loader.fetch_module_fpath_by_dotpath(module_dotpath)
+    if module_fpath is None:
+        return None
+    try:
+        with open(module_fpath, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=AST_MODULE_CACHE_SIZE)
+def _parse_ast_module(module_fpath: str, mtime_ns: int, size: int) -> _ModuleDefinitions:
+    """Parses a module, cached by its modification time and size so that edited files are re-read."""
+    with open(module_fpath) as f:
+        return _ModuleDefinitions(ast.parse(f.read(), filename=module_fpath))
+
+
+def _find_ast_definition(
+    definitions: _ModuleDefinitions, symbol: Symbol
+) -> Optional[_AstDefinition]:
+    """
+    Finds the definition of a symbol in its module, mirroring `convert_to_fst_object`,
+    which takes the first match of a depth-first search for each class or method descriptor.
+    """
+    position = None
+    for descriptor in symbol.descriptors[1:]:
+        kind = SymbolDescriptor.convert_scip_to_python_suffix(descriptor.suffix)
+        if kind not in (SymbolDescriptor.PyKind.Class, SymbolDescriptor.PyKind.Method):
+            continue
+        position = definitions.find(kind, descriptor.name, position)
+        if position is None:
+            return None
+    return None if position is None else definitions.nodes[position]
+
+
+class BoundingBoxCache(SQLDatabase):
+    """
+    A persistent store of symbol bounding boxes, keyed by the content hash of their module.
+
+    Bounding boxes only depend on the source of the module which defines a symbol, so
+    they remain valid across restarts until that file is edited. Symbols which could
+    not be located are stored too, so that they are not searched for again.
+    """
+
+    TABLE_NAME = "bounding_boxes"
+    TABLE_FIELDS = {
+        "module": "TEXT",
+        "content_hash": "TEXT",
+        "source": "TEXT",
+        "symbol_uri": "TEXT",
+        "top_line": "INTEGER",
+        "top_column": "INTEGER",
+        "bottom_line": "INTEGER",
+        "bottom_column": "INTEGER",
+    }
+
+    def __init__(self, db_path: str = SYMBOL_BOUNDING_BOX_CACHE_PATH) -> None:
+        self.connect(db_path)
+        self.create_table(self.TABLE_NAME, self.TABLE_FIELDS)
+        self.cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {self.TABLE_NAME}_key "
+            f"ON {self.TABLE_NAME} (module, content_hash, source, symbol_uri)"
+        )
+        self.conn.commit()
+
+    def get_bounding_boxes(
+        self,
+        symbols: Iterable[Symbol],
+        source: BoundingBoxSource,
+        module_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Tuple[Dict[Symbol, Optional[BoundingBox]], List[Symbol]]:
+        """
+        Looks up the bounding boxes of symbols whose module is unchanged since they were stored.
+
+        Args:
+            module_hashes: The content hashes of the modules of the symbols, if the caller
+                already computed them, otherwise each module is hashed here
+
+        Returns:
+            The cached bounding boxes, which are None for symbols known to be missing,
+            and the symbols which were not found in the cache.
+        """
+        cached_boxes: Dict[Symbol, Optional[BoundingBox]] = {}
+        missing_symbols: List[Symbol] = []
+        for module_dotpath, module_symbols in self._group_by_module(symbols).items():
+            content_hash = self._get_content_hash(module_dotpath, module_hashes)
+            if content_hash is None:
+                missing_symbols.extend(module_symbols)
+                continue
+
+            rows = self.select(
+                self.TABLE_NAME,
+                ["symbol_uri", "top_line", "top_column", "bottom_line", "bottom_column"],
+                {"module": module_dotpath, "content_hash": content_hash, "source": source.value},
+            )
+            module_boxes = {
+                row[0]: None
+                if row[1] is None
+                else BoundingBox(
+                    BoundingBoxPoint(row[1], row[2]), BoundingBoxPoint(row[3], row[4])
+                )
+                for row in rows
+            }
+            for symbol in module_symbols:
+                if symbol.uri in module_boxes:
+                    cached_boxes[symbol] = module_boxes[symbol.uri]
+                else:
+                    missing_symbols.append(symbol)
+        return cached_boxes, missing_symbols
+
+    def put_bounding_boxes(
+        self,
+        symbols: Iterable[Symbol],
+        bounding_boxes: Dict[Symbol, Any],
+        source: BoundingBoxSource,
+        module_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        Stores the bounding boxes computed for symbols, along with the symbols that were
+        not found, replacing the entries of previous versions of their modules.
+        The `module_hashes` are used as in `get_bounding_boxes`.
+        """
+        for module_dotpath, module_symbols in self._group_by_module(symbols).items():
+            content_hash = self._get_content_hash(module_dotpath, module_hashes)
+            if content_hash is None:
+                continue
+
+            self.cursor.execute(
+                f"DELETE FROM {self.TABLE_NAME} "
+                "WHERE module = ? AND source = ? AND content_hash != ?",
+                (module_dotpath, source.value, content_hash),
+            )
+            rows = []
+            for symbol in module_symbols:
+                bounding_box = bounding_boxes.get(symbol)
+                coordinates: Tuple[Optional[int], ...] = (
+                    (None, None, None, None)
+                    if bounding_box is None
+                    else (
+                        bounding_box.top_left.line,
+                        bounding_box.top_left.column,
+                        bounding_box.bottom_right.line,
+                        bounding_box.bottom_right.column,
+                    )
+                )
+                rows.append((module_dotpath, content_hash, source.value, symbol.uri) + coordinates)
+            self.cursor.executemany(
+                f"INSERT OR REPLACE INTO {self.TABLE_NAME} "
+                f"({', '.join(self.TABLE_FIELDS)}) VALUES ({', '.join('?' * len(self.TABLE_FIELDS))})",
+                rows,
+            )
+        self.conn.commit()
+
+    @staticmethod
+    def _get_content_hash(
+        module_dotpath: str, module_hashes: Optional[Dict[str, Optional[str]]]
+    ) -> Optional[str]:
+        if module_hashes is not None and module_dotpath in module_hashes:
+            return module_hashes[module_dotpath]
+        return get_module_content_hash(module_dotpath)
+
+    @staticmethod
+    def _group_by_module(symbols: Iterable[Symbol]) -> Dict[str, List[Symbol]]:
+        symbols_by_module: Dict[str, List[Symbol]] = {}
+        for symbol in symbols:
+            symbols_by_module.setdefault(symbol.module_name, []).append(symbol)
+        return symbols_by_module
@@ -0,0 +1,771 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+import numpy as np
+
+from automata.config import MAX_WORKERS
+from automata.core.symbol.graph import GraphNavigator, _ReferenceProcessor
+from automata.core.symbol.parser import parse_symbol, parse_symbols
+from automata.core.symbol.scip_pb2 import Document, Index, SymbolRole  # type: ignore
+from automata.core.symbol.scip_reader import ScipIndexReader
+from automata.core.symbol.symbol_types import (
+    Symbol,
+    SymbolDescriptor,
+    SymbolFile,
+    SymbolReference,
+)
+
+logger = logging.getLogger(__name__)
+
+# The columns stored for each edge label, the first two columns are the edge endpoints
+EDGE_COLUMNS: Dict[str, List[str]] = {
+    "contains": ["file", "symbol"],
+    "reference": ["symbol", "file", "line", "column", "roles"],
+    "relationship": ["source", "target"],
+    "call": ["caller", "callee", "line", "column", "roles"],
+}
+
+# The edge columns which hold file ids, the columns which are neither these nor
+# `EDGE_VALUE_COLUMNS` hold symbol ids
+EDGE_FILE_COLUMNS = {"file"}
+EDGE_VALUE_COLUMNS = {"line", "column", "roles"}
+
+# The adjacency indexes built over the edge labels, as
+# name -> (label, source column, target column, whether the sources are files)
+ADJACENCIES: Dict[str, Any] = {
+    "contains_by_file": ("contains", "file", "symbol", True),
+    "contains_by_symbol": ("contains", "symbol", "file", False),
+    "references_by_symbol": ("reference", "symbol", "file", False),
+    "references_by_file": ("reference", "file", "symbol", True),
+    "relationships_by_source": ("relationship", "source", "target", False),
+    "calls_by_caller": ("call", "caller", "callee", False),
+    "calls_by_callee": ("call", "callee", "caller", False),
+}
+
+# The columns by which the edges of an adjacency index are ordered within each source,
+# so that range queries can binary search over them, e.g. references by position in a file
+ADJACENCY_SORT_COLUMNS: Dict[str, List[str]] = {
+    "references_by_file": ["line", "column"],
+}
+
+
+class _InternTable:
+    """Interns strings, e.g. symbol URIs or file paths, to dense integer ids."""
+
+    def __init__(self, values: Optional[List[str]] = None) -> None:
+        self._values: List[str] = list(values or [])
+        self._ids: Dict[str, int] = {value: i for i, value in enumerate(self._values)}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> str:
+        return self._values[index]
+
+    def intern(self, value: str) -> int:
+        """Returns the id of the value, assigning the next free id if it is not yet known."""
+        if value not in self._ids:
+            self._ids[value] = len(self._values)
+            self._values.append(value)
+        return self._ids[value]
+
+    def get_id(self, value: str) -> Optional[int]:
+        return self._ids.get(value)
+
+
+class _MappedInternTable:
+    """
+    A read-only intern table stored as flat arrays, e.g. inside a memory-mapped file.
+
+    The UTF-8 encoded strings are concatenated in `data`, where the string with id `i`
+    occupies `offsets[i]:offsets[i + 1]`. `sorted_ids` lists the ids in the order of their
+    encoded strings, so that ids are looked up by binary search without building a dict.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, sorted_ids: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+        self.sorted_ids = sorted_ids
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self._get_bytes(index).decode("utf-8")
+
+    def get_id(self, value: str) -> Optional[int]:
+        key = value.encode("utf-8")
+        low, high = 0, len(self.sorted_ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_bytes(self.sorted_ids[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.sorted_ids) and self._get_bytes(self.sorted_ids[low]) == key:
+            return int(self.sorted_ids[low])
+        return None
+
+    @staticmethod
+    def encode(table: "_StringTable") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Encodes the strings of a table into the arrays of a `_MappedInternTable`."""
+        encoded = [table[i].encode("utf-8") for i in range(len(table))]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        sorted_ids = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int32)
+        return data, offsets, sorted_ids
+
+    def _get_bytes(self, index: int) -> bytes:
+        return self.data[self.offsets[index] : self.offsets[index + 1]].tobytes()
+
+
+_StringTable = Union[_InternTable, _MappedInternTable]
+
+
+class _CSRAdjacency:
+    """
+    Compressed sparse row adjacency over the edges of a single label.
+
+    The edges leaving `source` occupy `indptr[source]:indptr[source + 1]`, where `indices`
+    holds their targets and `edge_ids` their position in the column arrays of the label.
+    Edges which share a source are kept in insertion order, unless sort keys are given.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, edge_ids: np.ndarray) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+
+    @classmethod
+    def from_edges(
+        cls,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        num_sources: int,
+        sort_keys: Sequence[np.ndarray] = (),
+    ) -> "_CSRAdjacency":
+        """Builds the index, ordering the edges of each source by `sort_keys`, most significant first."""
+        if sort_keys:
+            # lexsort is stable and treats its last key as the most significant
+            order = np.lexsort(tuple(reversed(sort_keys)) + (sources,))
+        else:
+            order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_sources + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_sources), out=indptr[1:])
+        return cls(indptr, targets[order].astype(np.int32), order.astype(np.int64))
+
+    def neighbors(self, source: int) -> np.ndarray:
+        return self.indices[self.indptr[source] : self.indptr[source + 1]]
+
+    def edges(self, source: int) -> np.ndarray:
+        return self.edge_ids[self.indptr[source] : self.indptr[source + 1]]
+
+
+class CompactSymbolGraph:
+    """
+    An integer-indexed storage engine for the nodes and labeled edges of a `SymbolGraph`.
+
+    Symbol URIs and file paths are interned to integer ids, and the edges of each label
+    are stored as flat NumPy column arrays (see `EDGE_COLUMNS`), which are navigated
+    through the CSR indexes listed in `ADJACENCIES`. `Symbol` and `SymbolReference`
+    objects are only materialized when they are returned to the caller. The SCIP
+    occurrences of each file are kept serialized, and are only parsed when requested.
+    """
+
+    # The layout of the files written by `save_mapped`, a fixed size prefix of
+    # (magic, format version, header length) is followed by a JSON header which
+    # locates each array within the aligned data section
+    MAPPED_MAGIC = b"ACSG"
+    MAPPED_FORMAT_VERSION = 3
+    _MAPPED_PREFIX = struct.Struct("<4sIQ")
+    _MAPPED_ALIGNMENT = 64
+
+    def __init__(
+        self, symbols: _StringTable, files: _StringTable, arrays: Dict[str, np.ndarray]
+    ) -> None:
+        self.symbols = symbols
+        self.files = files
+        self.arrays = arrays
+        self.adjacency = {
+            name: _CSRAdjacency(
+                arrays[f"{name}_indptr"], arrays[f"{name}_indices"], arrays[f"{name}_edge_ids"]
+            )
+            for name in ADJACENCIES
+        }
+
+    @classmethod
+    def from_edges(
+        cls,
+        symbols: _InternTable,
+        files: _InternTable,
+        defined_symbols: np.ndarray,
+        edges: Dict[str, Dict[str, np.ndarray]],
+        file_occurrences: Sequence[bytes],
+    ) -> "CompactSymbolGraph":
+        """
+        Creates the graph from the column arrays of each label, building the CSR indexes.
+
+        `file_occurrences` holds the occurrences of each file as a serialized SCIP `Document`.
+        """
+        arrays: Dict[str, np.ndarray] = {"defined_symbols": defined_symbols}
+        arrays["file_occurrences_offsets"] = np.zeros(len(file_occurrences) + 1, dtype=np.int64)
+        np.cumsum(
+            [len(occurrences) for occurrences in file_occurrences],
+            out=arrays["file_occurrences_offsets"][1:],
+        )
+        arrays["file_occurrences_data"] = np.frombuffer(b"".join(file_occurrences), dtype=np.uint8)
+        for label, columns in EDGE_COLUMNS.items():
+            for column in columns:
+                arrays[f"{label}_{column}"] = edges[label][column]
+
+        for name, (label, source_column, target_column, by_file) in ADJACENCIES.items():
+            adjacency = _CSRAdjacency.from_edges(
+                arrays[f"{label}_{source_column}"],
+                arrays[f"{label}_{target_column}"],
+                len(files) if by_file else len(symbols),
+                [arrays[f"{label}_{column}"] for column in ADJACENCY_SORT_COLUMNS.get(name, [])],
+            )
+            arrays[f"{name}_indptr"] = adjacency.indptr
+            arrays[f"{name}_indices"] = adjacency.indices
+            arrays[f"{name}_edge_ids"] = adjacency.edge_ids
+        # The line of each reference in file order, so that scopes are found by bisection
+        arrays["references_by_file_lines"] = arrays["reference_line"][
+            arrays["references_by_file_edge_ids"]
+        ]
+        return cls(symbols, files, arrays)
+
+    def column(self, label: str, column: str) -> np.ndarray:
+        return self.arrays[f"{label}_{column}"]
+
+    def get_file_occurrences(self, file_id: int) -> Any:
+        """Parses the SCIP occurrences of a file."""
+        offsets = self.arrays["file_occurrences_offsets"]
+        data = self.arrays["file_occurrences_data"][offsets[file_id] : offsets[file_id + 1]]
+        return Document.FromString(data.tobytes()).occurrences
+
+    def save_mapped(self, path: str) -> None:
+        """
+        Writes the graph to a flat binary file which can be opened with `open_mapped`.
+
+        The file holds the interned string tables and every edge and index array,
+        each stored contiguously so that it can be read in place from a memory map.
+        """
+        arrays = dict(self.arrays)
+        for name, table in (("symbols", self.symbols), ("files", self.files)):
+            data, offsets, sorted_ids = _MappedInternTable.encode(table)
+            arrays[f"{name}_data"] = data
+            arrays[f"{name}_offsets"] = offsets
+            arrays[f"{name}_sorted_ids"] = sorted_ids
+
+        header: Dict[str, Tuple[str, int, int]] = {}
+        offset = 0
+        for name, values in arrays.items():
+            header[name] = (values.dtype.str, len(values), offset)
+            offset = self._align(offset + values.nbytes)
+        encoded_header = json.dumps(header).encode("utf-8")
+        prefix = self._MAPPED_PREFIX.pack(
+            self.MAPPED_MAGIC, self.MAPPED_FORMAT_VERSION, len(encoded_header)
+        )
+        data_start = self._align(len(prefix) + len(encoded_header))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(prefix + encoded_header)
+            for name, values in arrays.items():
+                f.seek(data_start + header[name][2])
+                f.write(np.ascontiguousarray(values).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open_mapped(cls, path: str) -> "CompactSymbolGraph":
+        """
+        Opens a graph written by `save_mapped` without copying its arrays.
+
+        The file is mapped read-only, so every process which opens the same file
+        shares a single physical copy of the graph through the page cache.
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = cls._MAPPED_PREFIX.unpack_from(buffer, 0)
+        if magic != cls.MAPPED_MAGIC:
+            raise ValueError(f"{path} is not a compact symbol graph")
+        if version != cls.MAPPED_FORMAT_VERSION:
+            raise ValueError(
+                f"{path} is a compact symbol graph of version {version}, "
+                f"but version {cls.MAPPED_FORMAT_VERSION} was expected"
+            )
+        header_start = cls._MAPPED_PREFIX.size
+        header = json.loads(buffer[header_start : header_start + header_length])
+        data_start = cls._align(header_start + header_length)
+
+        # The arrays hold a reference to the map, which keeps it open for their lifetime
+        arrays = {
+            name: np.frombuffer(
+                buffer, dtype=np.dtype(dtype), count=length, offset=data_start + offset
+            )
+            for name, (dtype, length, offset) in header.items()
+        }
+        symbols, files = (
+            _MappedInternTable(
+                arrays.pop(f"{name}_data"),
+                arrays.pop(f"{name}_offsets"),
+                arrays.pop(f"{name}_sorted_ids"),
+            )
+            for name in ("symbols", "files")
+        )
+        return cls(symbols, files, arrays)
+
+    @classmethod
+    def _align(cls, offset: int) -> int:
+        return -(-offset // cls._MAPPED_ALIGNMENT) * cls._MAPPED_ALIGNMENT
+
+
+class _CompactSymbolGraphNavigator(GraphNavigator):
+    """Handles navigation within a symbol graph stored as a `CompactSymbolGraph`."""
+
+    def __init__(self, graph: CompactSymbolGraph) -> None:
+        super().__init__()
+        self._graph = graph
+
+    def get_all_files(self) -> List[SymbolFile]:
+        return [
+            SymbolFile(self._graph.files[i], occurrences=self._graph.get_file_occurrences(i))
+            for i in range(len(self._graph.files))
+        ]
+
+    def get_all_available_symbols(self) -> List[Symbol]:
+        return parse_symbols(
+            self._graph.symbols[symbol_id]
+            for symbol_id in np.flatnonzero(self._graph.arrays["defined_symbols"])
+        )
+
+    def get_symbol_relationships(self, symbol: Symbol) -> Set[Symbol]:
+        symbol_id = self._graph.symbols.get_id(symbol.uri)
+        if symbol_id is None:
+            return set()
+        return {
+            self._get_symbol(target)
+            for target in self._graph.adjacency["relationships_by_source"].neighbors(symbol_id)
+        }
+
+    def get_references_to_symbol(self, symbol: Symbol) -> Dict[str, List[SymbolReference]]:
+        """Gets all references to a `Symbol`, grouped by the file in which they occur."""
+        symbol_id = self._graph.symbols.get_id(symbol.uri)
+        if symbol_id is None:
+            return {}
+        reference_files = self._graph.column("reference", "file")
+
+        result_dict: Dict[str, List[SymbolReference]] = {}
+        for edge in self._graph.adjacency["references_by_symbol"].edges(symbol_id):
+            file_path = self._graph.files[reference_files[edge]]
+            result_dict.setdefault(file_path, []).append(self._get_reference(edge))
+        return result_dict
+
+    def get_potential_symbol_callers(self, symbol: Symbol) -> Dict[SymbolReference, Symbol]:
+        """Gets all callers of a `Symbol`, keyed by a reference to the caller."""
+        symbol_id = self._graph.symbols.get_id(symbol.uri)
+        if symbol_id is None:
+            return {}
+        callee = self._get_symbol(symbol_id)
+        callers = self._graph.column("call", "caller")
+        return {
+            self._get_call_reference(edge, self._get_symbol(callers[edge])): callee
+            for edge in self._graph.adjacency["calls_by_callee"].edges(symbol_id)
+        }
+
+    def get_potential_symbol_callees(self, symbol: Symbol) -> Dict[Symbol, SymbolReference]:
+        """Gets all callees of a `Symbol`, mapped to a reference to the calling symbol."""
+        symbol_id = self._graph.symbols.get_id(symbol.uri)
+        if symbol_id is None:
+            return {}
+        caller = self._get_symbol(symbol_id)
+        callees = self._graph.column("call", "callee")
+        return {
+            self._get_symbol(callees[edge]): self._get_call_reference(edge, caller)
+            for edge in self._graph.adjacency["calls_by_caller"].edges(symbol_id)
+        }
+
+    def _get_symbol_containing_file(self, symbol: Symbol) -> str:
+        symbol_id = self._graph.symbols.get_id(symbol.uri)
+        parent_file_ids = (
+            np.array([], dtype=np.int32)
+            if symbol_id is None
+            else self._graph.adjacency["contains_by_symbol"].neighbors(symbol_id)
+        )
+        assert (
+            len(parent_file_ids) == 1
+        ), f"{symbol.uri} should have exactly one parent file, but has {len(parent_file_ids)}"
+        return self._graph.files[parent_file_ids[0]]
+
+    def _get_references_to_module(self, module_name: str) -> List[SymbolReference]:
+        """Gets all references to a module in the graph, ordered by their position."""
+        file_id = self._graph.files.get_id(module_name)
+        if file_id is None:
+            return []
+        return [
+            self._get_reference(edge)
+            for edge in self._graph.adjacency["references_by_file"].edges(file_id)
+        ]
+
+    def _get_references_to_module_in_lines(
+        self, module_name: str, start_line: int, end_line: int
+    ) -> List[SymbolReference]:
+        return [
+            self._get_reference(edge)
+            for edge in self._get_reference_edges_in_lines(module_name, start_line, end_line)
+        ]
+
+    def get_symbol_dependencies(self, symbol: Symbol) -> Set[Symbol]:
+        """
+        Gets the symbols referenced in the scope of a symbol, selecting the reference
+        edges with array operations instead of materializing each `SymbolReference`.
+        """
+        file_name, start_line, start_column, end_line = self._get_symbol_scope(symbol)
+        edges = self._get_reference_edges_in_lines(file_name, start_line, end_line)
+        edges = edges[self._graph.column("reference", "column")[edges] >= start_column]
+        return {
+            self._get_symbol(symbol_id)
+            for symbol_id in np.unique(self._graph.column("reference", "symbol")[edges])
+        }
+
+    def _get_reference_edges_in_lines(
+        self, module_name: str, start_line: int, end_line: int
+    ) -> np.ndarray:
+        """Gets the ids of the reference edges to a module in `[start_line, end_line)`, in order."""
+        file_id = self._graph.files.get_id(module_name)
+        if file_id is None:
+            return np.array([], dtype=np.int32)
+        adjacency = self._graph.adjacency["references_by_file"]
+        row_start, row_end = adjacency.indptr[file_id], adjacency.indptr[file_id + 1]
+        lines = self._graph.arrays["references_by_file_lines"][row_start:row_end]
+        start, end = np.searchsorted(lines, [start_line, end_line], side="left")
+        return adjacency.edge_ids[row_start + start : row_start + end]
+
+    def _get_symbol(self, symbol_id: int) -> Symbol:
+        return parse_symbol(self._graph.symbols[symbol_id])
+
+    def _get_reference(self, edge: int) -> SymbolReference:
+        return SymbolReference(
+            symbol=self._get_symbol(self._graph.column("reference", "symbol")[edge]),
+            line_number=int(self._graph.column("reference", "line")[edge]),
+            column_number=int(self._graph.column("reference", "column")[edge]),
+            roles=_ReferenceProcessor._process_symbol_roles(
+                int(self._graph.column("reference", "roles")[edge])
+            ),
+        )
+
+    def _get_call_reference(self, edge: int, symbol: Symbol) -> SymbolReference:
+        return SymbolReference(
+            symbol=symbol,
+            line_number=int(self._graph.column("call", "line")[edge]),
+            column_number=int(self._graph.column("call", "column")[edge]),
+            roles=_ReferenceProcessor._process_symbol_roles(
+                int(self._graph.column("call", "roles")[edge])
+            ),
+        )
+
+
+class _CompactShard(NamedTuple):
+    """
+    The nodes and edges which a `CompactGraphBuilder` accumulated from a shard of documents.
+
+    Ids index into the `symbols` and `files` of the shard, and the pairs of declared and
+    defined symbols are listed in the order they were encountered.
+    """
+
+    symbols: List[str]
+    files: List[str]
+    defined_symbols: np.ndarray
+    declaring_symbols: np.ndarray
+    declaring_files: np.ndarray
+    defining_symbols: np.ndarray
+    defining_files: np.ndarray
+    occurrence_files: np.ndarray
+    file_occurrences: List[bytes]
+    edges: Dict[str, Dict[str, np.ndarray]]
+
+
+def build_compact_shard(index_path: str, spans: List[Tuple[int, int]]) -> _CompactShard:
+    """Accumulates the nodes and edges of the documents at `spans`, in a parallel build."""
+    builder = CompactGraphBuilder(ScipIndexReader(index_path))
+    for document in builder.index.read_documents(spans):
+        builder._add_document(document)
+    return builder._get_shard()
+
+
+class CompactGraphBuilder:
+    """
+    Builds a `CompactSymbolGraph` from a corresponding Index.
+
+    The same nodes and edges as `GraphBuilder` are produced, but they are accumulated
+    into typed arrays keyed by interned ids instead of networkx attribute dictionaries.
+    Caller-callee edges are resolved once every document has been added to the graph.
+
+    In parallel mode, contiguous shards of the documents are parsed in a process pool of
+    up to `MAX_WORKERS` workers, which read them from the index file themselves. Each
+    worker returns the string tables and integer edge arrays of its shard, which are
+    merged in document order by remapping their ids, so the graph is identical to a serial
+    build. Only the strings of each shard are interned by the parent, so the merge is far
+    cheaper than parsing the occurrences. Caller-callee edges are still resolved serially.
+    """
+
+    # The number of shards assigned to each worker of a parallel build, to balance load
+    SHARDS_PER_WORKER = 4
+
+    def __init__(
+        self,
+        index: Union[Index, ScipIndexReader],
+        build_caller_relationships: bool = False,
+        parallel: bool = False,
+    ) -> None:
+        """
+        Raises:
+            ValueError: If a parallel build is requested for an index which is not read from a file
+        """
+        if parallel and not isinstance(index, ScipIndexReader):
+            raise ValueError("Parallel builds read the documents from a ScipIndexReader")
+        self.index = index
+        self.build_caller_relationships = build_caller_relationships
+        self.parallel = parallel
+        self._symbols = _InternTable()
+        self._files = _InternTable()
+        self._defined_symbols: Set[int] = set()
+        self._declaring_files: Dict[int, List[int]] = {}
+        self._defining_files: Dict[int, int] = {}
+        self._file_occurrences: Dict[int, bytes] = {}
+        self._edges: Dict[str, Dict[str, array]] = {
+            label: {column: array("i") for column in columns}
+            for label, columns in EDGE_COLUMNS.items()
+        }
+
+    def build_graph(self) -> CompactSymbolGraph:
+        """
+        Loop over all the `Documents` in the index of the graph
+        and add the corresponding files, symbols and edges to the graph.
+        """
+        if self.parallel:
+            self._build_parallel()
+        else:
+            for document in self.index.documents:
+                self._add_document(document)
+
+        graph = self._create_graph()
+        if self.build_caller_relationships:
+            self._process_caller_callee_relationships(graph)
+            graph = self._create_graph()
+        return graph
+
+    def _add_document(self, document: Any) -> None:
+        file_id = self._files.intern(document.relative_path)
+        self._file_occurrences[file_id] = Document(
+            occurrences=document.occurrences
+        ).SerializeToString()
+        self._add_symbol_vertices(document, file_id)
+        self._process_relationships(document)
+        self._process_references(document, file_id)
+
+    def _build_parallel(self) -> None:
+        index = cast(ScipIndexReader, self.index)
+        shards = self._partition_documents(index)
+        if not shards:
+            return
+        # The shards are merged in document order, while the later shards are still parsed
+        with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(shards))) as executor:
+            for shard in executor.map(build_compact_shard, repeat(index.path), shards):
+                self._merge_shard(shard)
+
+    @staticmethod
+    def _partition_documents(index: ScipIndexReader) -> List[List[Tuple[int, int]]]:
+        """Splits the spans of the documents into contiguous shards of roughly equal size."""
+        spans = list(index.iter_document_spans())
+        num_shards = min(len(spans), MAX_WORKERS * CompactGraphBuilder.SHARDS_PER_WORKER)
+        shards: List[List[Tuple[int, int]]] = [[] for _ in range(num_shards)]
+        total_length = sum(length for _, length in spans) or 1
+        seen_length = 0
+        for span in spans:
+            shards[min(num_shards - 1, seen_length * num_shards // total_length)].append(span)
+            seen_length += span[1]
+        return [shard for shard in shards if shard]
+
+    def _get_shard(self) -> _CompactShard:
+        declared_pairs = [
+            (symbol_id, file_id)
+            for symbol_id, file_ids in self._declaring_files.items()
+            for file_id in file_ids
+        ]
+        return _CompactShard(
+            symbols=[self._symbols[i] for i in range(len(self._symbols))],
+            files=[self._files[i] for i in range(len(self._files))],
+            defined_symbols=np.array(sorted(self._defined_symbols), dtype=np.int32),
+            declaring_symbols=np.array([pair[0] for pair in declared_pairs], dtype=np.int32),
+            declaring_files=np.array([pair[1] for pair in declared_pairs], dtype=np.int32),
+            defining_symbols=np.array(list(self._defining_files), dtype=np.int32),
+            defining_files=np.array(list(self._defining_files.values()), dtype=np.int32),
+            occurrence_files=np.array(list(self._file_occurrences), dtype=np.int32),
+            file_occurrences=list(self._file_occurrences.values()),
+            edges={
+                label: {
+                    column: np.frombuffer(values, dtype=np.int32)
+                    for column, values in columns.items()
+                }
+                for label, columns in self._edges.items()
+            },
+        )
+
+    def _merge_shard(self, shard: _CompactShard) -> None:
+        """Adds the nodes and edges of a shard, mapping its ids to the ids of this builder."""
+        symbol_ids = np.array([self._symbols.intern(s) for s in shard.symbols], dtype=np.int32)
+        file_ids = np.array([self._files.intern(f) for f in shard.files], dtype=np.int32)
+
+        self._defined_symbols.update(symbol_ids[shard.defined_symbols].tolist())
+        for symbol_id, file_id in zip(
+            symbol_ids[shard.declaring_symbols].tolist(), file_ids[shard.declaring_files].tolist()
+        ):
+            self._declaring_files.setdefault(symbol_id, []).append(file_id)
+        self._defining_files.update(
+            zip(
+                symbol_ids[shard.defining_symbols].tolist(),
+                file_ids[shard.defining_files].tolist(),
+            )
+        )
+        self._file_occurrences.update(
+            zip(file_ids[shard.occurrence_files].tolist(), shard.file_occurrences)
+        )
+        for label, columns in shard.edges.items():
+            for column, values in columns.items():
+                if column in EDGE_FILE_COLUMNS:
+                    values = file_ids[values]
+                elif column not in EDGE_VALUE_COLUMNS:
+                    values = symbol_ids[values]
+                self._edges[label][column].frombytes(values.astype(np.int32).tobytes())
+
+    def _add_symbol_vertices(self, document: Any, file_id: int) -> None:
+        for symbol_information in document.symbols:
+            try:
+                parse_symbol(symbol_information.symbol)
+            except Exception as e:
+                logger.error(f"Parsing symbol {symbol_information.symbol} failed with error {e}")
+                continue
+
+            symbol_id = self._symbols.intern(symbol_information.symbol)
+            self._defined_symbols.add(symbol_id)
+            self._declaring_files.setdefault(symbol_id, []).append(file_id)
+
+    def _process_relationships(self, document: Any) -> None:
+        for symbol_information in document.symbols:
+            source_id = self._symbols.intern(symbol_information.symbol)
+            for relationship in symbol_information.relationships:
+                related_symbol = parse_symbol(relationship.symbol)
+                self._add_edge("relationship", source_id, self._symbols.intern(related_symbol.uri))
+
+    def _process_references(self, document: Any, file_id: int) -> None:
+        for occurrence in document.occurrences:
+            try:
+                parse_symbol(occurrence.symbol)
+            except Exception as e:
+                logger.error(f"Parsing symbol {occurrence.symbol} failed with error {e}")
+                continue
+
+            symbol_id = self._symbols.intern(occurrence.symbol)
+            self._add_edge(
+                "reference",
+                symbol_id,
+                file_id,
+                occurrence.range[0],
+                occurrence.range[1],
+                occurrence.symbol_roles,
+            )
+            if occurrence.symbol_roles & SymbolRole.Definition:
+                # A definition determines the file which contains the symbol
+                self._defining_files[symbol_id] = file_id
+
+    def _process_caller_callee_relationships(self, graph: CompactSymbolGraph) -> None:
+        """
+        Adds the caller-callee edges of every method, see `_CallerCalleeProcessor`.
+
+        Note - Construction is an expensive operation and should be used sparingly.
+        """
+        navigator = _CompactSymbolGraphNavigator(graph)
+        for document in self.index.documents:
+            for symbol_information in document.symbols:
+                try:
+                    symbol = parse_symbol(symbol_information.symbol)
+                except Exception as e:
+                    logger.error(
+                        f"Parsing symbol {symbol_information.symbol} failed with error {e}"
+                    )
+                    continue
+
+                if symbol.symbol_kind_by_suffix() != SymbolDescriptor.PyKind.Method:
+                    continue
+
+                try:
+                    references_in_scope = navigator._get_symbol_references_in_scope(symbol)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to get references in scope for symbol {symbol} with error {e}"
+                    )
+                    continue
+
+                caller_id = self._symbols.intern(symbol.uri)
+                for ref in references_in_scope:
+                    if ref.symbol == symbol or ref.symbol.symbol_kind_by_suffix() not in [
+                        SymbolDescriptor.PyKind.Method,
+                        SymbolDescriptor.PyKind.Class,
+                    ]:
+                        continue
+                    self._add_edge(
+                        "call",
+                        caller_id,
+                        self._symbols.intern(ref.symbol.uri),
+                        ref.line_number,
+                        ref.column_number,
+                        sum(SymbolRole.Value(role) for role, value in ref.roles.items() if value),
+                    )
+
+    def _add_edge(self, label: str, *values: int) -> None:
+        for column, value in zip(EDGE_COLUMNS[label], values):
+            self._edges[label][column].append(value)
+
+    def _create_graph(self) -> CompactSymbolGraph:
+        defined_symbols = np.zeros(len(self._symbols), dtype=bool)
+        defined_symbols[list(self._defined_symbols)] = True
+
+        edges = {
+            label: {column: np.array(values, dtype=np.int32) for column, values in columns.items()}
+            for label, columns in self._edges.items()
+        }
+        # As in `GraphBuilder`, symbols without a definition are contained by each declaring file
+        contains_edges = [
+            (file_id, symbol_id)
+            for symbol_id, file_ids in self._declaring_files.items()
+            if symbol_id not in self._defining_files
+            for file_id in file_ids
+        ] + [(file_id, symbol_id) for symbol_id, file_id in self._defining_files.items()]
+        edges["contains"] = {
+            "file": np.array([file_id for file_id, _ in contains_edges], dtype=np.int32),
+            "symbol": np.array([symbol_id for _, symbol_id in contains_edges], dtype=np.int32),
+        }
+        file_occurrences = [self._file_occurrences.get(i, b"") for i in range(len(self._files))]
+        return CompactSymbolGraph.from_edges(
+            self._symbols, self._files, defined_symbols, edges, file_occurrences
+        )
@@ -1,18 +1,34 @@
+import atexit
 import logging
+import sqlite3
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from enum import Enum
 from time import time
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import networkx as nx
+import numpy as np
 from google.protobuf.json_format import MessageToDict  # type: ignore
+from scipy import sparse
 from tqdm import tqdm
 
-from automata.config import MAX_WORKERS
+from automata.config import MAX_WORKERS, SYMBOL_BOUNDING_BOX_SOURCE
 from automata.core.coding.py.module_loader import py_module_loader
+from automata.core.symbol.bounding_box import (
+    BoundingBoxCache,
+    BoundingBoxSource,
+    compute_ast_bounding_boxes,
+    get_module_content_hash,
+)
+from automata.core.symbol.graph_snapshot import SubgraphSnapshot, SymbolGraphSnapshot
 from automata.core.symbol.parser import parse_symbol
 from automata.core.symbol.scip_pb2 import Index, SymbolRole  # type: ignore
+from automata.core.symbol.scip_reader import ScipIndexReader
 from automata.core.symbol.symbol_types import (
     Symbol,
     SymbolDescriptor,
@@ -26,6 +42,9 @@ from automata.core.symbol.symbol_utils import (
 
 logger = logging.getLogger(__name__)
 
+# The directions in which rank can flow along the edges of a rankable subgraph
+FLOW_RANKS = ("to_dependents", "from_dependents", "bidirectional")
+
 
 class GraphProcessor(ABC):
     """Abstract base class for processing edges in the `MultiDiGraph`."""
@@ -92,9 +111,12 @@ class _RelationshipProcessor(GraphProcessor):
 class _ReferenceProcessor(GraphProcessor):
     """Adds edges to the `MultiDiGraph` for references between `Symbol` nodes."""
 
-    def __init__(self, graph: nx.MultiDiGraph, document: Any) -> None:
+    def __init__(
+        self, graph: nx.MultiDiGraph, document: Any, defining_files: Dict[Symbol, str]
+    ) -> None:
         self._graph = graph
         self.document = document
+        self.defining_files = defining_files
 
     def process(self) -> None:
         """
@@ -104,6 +126,9 @@ class _ReferenceProcessor(GraphProcessor):
 
         For example, a reference can be a function call, a variable usage,
         or a class instantiation.
+
+        The file of each definition is recorded in `defining_files`, from which
+        the `GraphBuilder` adds the "contains" edges once all documents are processed.
         """
         for occurrence in self.document.occurrences:
             try:
@@ -127,20 +152,7 @@ class _ReferenceProcessor(GraphProcessor):
                 label="reference",
             )
             if occurrence_roles.get(SymbolRole.Name(SymbolRole.Definition)):
-                # TODO this is gross
-                incorrect_contains_edges = [
-                    (source, target)
-                    for source, target, data in self._graph.in_edges(occurrence_symbol, data=True)
-                    if data.get("label") == "contains"
-                ]
-                for source, target in incorrect_contains_edges:
-                    self._graph.remove_edge(source, target)
-
-                self._graph.add_edge(
-                    self.document.relative_path,
-                    occurrence_symbol,
-                    label="contains",
-                )
+                self.defining_files[occurrence_symbol] = self.document.relative_path
 
     @staticmethod
     def _process_symbol_roles(role: int) -> Dict[str, bool]:
@@ -154,9 +166,12 @@ class _ReferenceProcessor(GraphProcessor):
 class _CallerCalleeProcessor(GraphProcessor):
     """Adds edges to the `MultiDiGraph` for caller-callee relationships between `Symbol` nodes."""
 
-    def __init__(self, graph: nx.MultiDiGraph, document: Any) -> None:
+    def __init__(
+        self, graph: nx.MultiDiGraph, edge_index: "_LabeledEdgeIndex", document: Any
+    ) -> None:
         self._graph = graph
-        self.navigator = _SymbolGraphNavigator(graph)
+        self._edge_index = edge_index
+        self.navigator = _SymbolGraphNavigator(graph, edge_index)
         self.document = document
 
     def process(self) -> None:
@@ -199,34 +214,165 @@ class _CallerCalleeProcessor(GraphProcessor):
                         # e.g. omitting classes appears to remove constructor calls for X, like X()
                         # For, we filtering is done downstream with the ASTNavigator
                         # with current understanding, it seems handling will require AST awareness
-                        self._graph.add_edge(
-                            symbol_object,
-                            ref.symbol,
-                            line_number=ref.line_number,
-                            column_number=ref.column_number,
-                            roles=ref.roles,
-                            label="caller",
-                        )
-                        self._graph.add_edge(
-                            ref.symbol,
-                            symbol_object,
-                            line_number=ref.line_number,
-                            column_number=ref.column_number,
-                            roles=ref.roles,
-                            label="callee",
-                        )
+                        self._add_edge(symbol_object, ref, label="caller")
+                        self._add_edge(symbol_object, ref, label="callee")
                 except Exception as e:
                     logger.error(f"Failed to add caller-callee edge for {symbol} with error {e} ")
                     continue
 
+    def _add_edge(self, caller: Symbol, ref: SymbolReference, label: str) -> None:
+        source, target = (caller, ref.symbol) if label == "caller" else (ref.symbol, caller)
+        data = {
+            "line_number": ref.line_number,
+            "column_number": ref.column_number,
+            "roles": ref.roles,
+            "label": label,
+        }
+        self._graph.add_edge(source, target, **data)
+        self._edge_index.add_edge(source, target, data)
+
+
+class _LabeledEdgeIndex:
+    """
+    Label-partitioned adjacency indexes over the edges of a symbol `MultiDiGraph`.
+
+    Navigating the raw graph requires scanning every edge of a node and filtering on
+    its label, which is slow for hub symbols with many references. The index is built
+    in a single pass over the edges, after which each lookup costs O(result).
+    """
+
+    def __init__(self) -> None:
+        self.containing_files: Dict[Symbol, List[str]] = {}
+        self.references_to_symbol: Dict[Symbol, List[Tuple[str, SymbolReference]]] = {}
+        self.references_in_file: Dict[str, List[SymbolReference]] = {}
+        # The (line, column) of each entry of `references_in_file`, used to bisect on scopes
+        self.reference_positions_in_file: Dict[str, List[Tuple[int, int]]] = {}
+        self.relationships: Dict[Symbol, Set[Symbol]] = {}
+        self.callers: Dict[Symbol, Dict[SymbolReference, Symbol]] = {}
+        self.callees: Dict[Symbol, Dict[Symbol, SymbolReference]] = {}
+
+    @classmethod
+    def from_graph(cls, graph: nx.MultiDiGraph) -> "_LabeledEdgeIndex":
+        edge_index = cls()
+        for source, target, data in graph.edges(data=True):
+            edge_index.add_edge(source, target, data)
+        return edge_index
+
+    def add_edge(self, source: Any, target: Any, data: Dict[str, Any]) -> None:
+        """Adds a single edge of the graph to the index of its label."""
+        label = data.get("label")
+        if label == "contains":
+            self.containing_files.setdefault(target, []).append(source)
+        elif label == "reference":
+            symbol_reference = data["symbol_reference"]
+            self.references_to_symbol.setdefault(source, []).append((target, symbol_reference))
+            # References are kept sorted by position, SCIP emits them mostly in order
+            # so that the insertion point is almost always at the end of the file's list
+            position = (symbol_reference.line_number, symbol_reference.column_number)
+            positions = self.reference_positions_in_file.setdefault(target, [])
+            insertion_point = bisect_right(positions, position)
+            positions.insert(insertion_point, position)
+            self.references_in_file.setdefault(target, []).insert(
+                insertion_point, symbol_reference
+            )
+        elif label == "relationship":
+            self.relationships.setdefault(source, set()).add(target)
+        elif label == "caller":
+            self.callees.setdefault(source, {})[target] = self._get_call_reference(source, data)
+        elif label == "callee":
+            self.callers.setdefault(source, {})[self._get_call_reference(target, data)] = source
+
+    def remove_edges(self, edges: Iterable[Tuple[Any, Any, Dict[str, Any]]]) -> None:
+        """
+        Removes edges of the graph from the index of their label, before they are removed
+        from the graph. The references in files dropped with `remove_file` are skipped.
+        """
+        removed_references: Dict[Any, Set[int]] = {}
+        for source, target, data in edges:
+            label = data.get("label")
+            if label == "contains":
+                files = self.containing_files.get(target, [])
+                if source in files:
+                    files.remove(source)
+                if not files:
+                    self.containing_files.pop(target, None)
+            elif label == "reference":
+                symbol_reference = data["symbol_reference"]
+                removed_references.setdefault(source, set()).add(id(symbol_reference))
+                self._remove_reference_in_file(target, symbol_reference)
+            elif label == "relationship":
+                related_symbols = self.relationships.get(source, set())
+                related_symbols.discard(target)
+                if not related_symbols:
+                    self.relationships.pop(source, None)
+            elif label == "caller":
+                callees = self.callees.get(source, {})
+                callees.pop(target, None)
+                if not callees:
+                    self.callees.pop(source, None)
+            elif label == "callee":
+                callers = self.callers.get(source, {})
+                callers.pop(self._get_call_reference(target, data), None)
+                if not callers:
+                    self.callers.pop(source, None)
+
+        # The references of a symbol are filtered in one pass, since hub symbols have many
+        for symbol, reference_ids in removed_references.items():
+            references = [
+                entry
+                for entry in self.references_to_symbol.get(symbol, [])
+                if id(entry[1]) not in reference_ids
+            ]
+            if references:
+                self.references_to_symbol[symbol] = references
+            else:
+                self.references_to_symbol.pop(symbol, None)
+
+    def remove_file(self, relative_path: str) -> None:
+        """Drops the references in a file, whose edges are then removed with `remove_edges`."""
+        self.references_in_file.pop(relative_path, None)
+        self.reference_positions_in_file.pop(relative_path, None)
+
+    def _remove_reference_in_file(self, relative_path: str, symbol_reference: Any) -> None:
+        positions = self.reference_positions_in_file.get(relative_path)
+        if positions is None:
+            return
+        references = self.references_in_file[relative_path]
+        position = (symbol_reference.line_number, symbol_reference.column_number)
+        i = bisect_left(positions, position)
+        while i < len(positions) and positions[i] == position:
+            if references[i] is symbol_reference:
+                del positions[i]
+                del references[i]
+                return
+            i += 1
+
+    @staticmethod
+    def _get_call_reference(caller: Symbol, data: Dict[str, Any]) -> SymbolReference:
+        return SymbolReference(
+            symbol=caller,
+            line_number=data.get("line_number"),  # type: ignore
+            column_number=data.get("column_number"),  # type: ignore
+            roles=data.get("roles"),  # type: ignore
+        )
+
 
 class GraphBuilder:
     """Builds a `SymbolGraph` from a corresponding Index."""
 
-    def __init__(self, index: Index, build_caller_relationships: bool = False) -> None:
+    def __init__(
+        self,
+        index: Union[Index, ScipIndexReader],
+        build_caller_relationships: bool = False,
+    ) -> None:
         self.index = index
         self.build_caller_relationships = build_caller_relationships
         self._graph = nx.MultiDiGraph()
+        self.edge_index = _LabeledEdgeIndex()
+        self.stale_symbols: Set[Symbol] = set()
+        # The files which declare and define each symbol, from which "contains" edges are added
+        self._declaring_files: Dict[Symbol, List[str]] = {}
+        self._defining_files: Dict[Symbol, str] = {}
 
     def build_graph(self) -> nx.MultiDiGraph:
         """
@@ -234,19 +380,179 @@ class GraphBuilder:
         and add corresponding `Symbol` nodes to the graph.
 
         The `Document` type, along with others, is defined in the scip_pb2.py file.
+        The index may be a `ScipIndexReader`, which streams one `Document` at a time.
 
         Edges are added for relationships, references, and calls between `Symbol` nodes.
+        The "contains" edges are added in a second pass, once the defining file of every
+        symbol is known. Once the structural edges are in place, they are partitioned
+        by label into `self.edge_index`, which the caller-callee pass and the navigator query.
         """
         for document in self.index.documents:
             self._add_file_vertices(document)
             self._add_symbol_vertices(document)
             self._process_relationships(document)
             self._process_references(document)
-            if self.build_caller_relationships:
+        self._add_contains_edges()
+
+        self.edge_index = _LabeledEdgeIndex.from_graph(self._graph)
+        if self.build_caller_relationships:
+            for document in self.index.documents:
                 self._process_caller_callee_relationships(document)
 
         return self._graph
 
+    def update_graph(
+        self,
+        graph: nx.MultiDiGraph,
+        removed_files: Optional[List[str]] = None,
+        edge_index: Optional[_LabeledEdgeIndex] = None,
+    ) -> nx.MultiDiGraph:
+        """
+        Applies the documents of a partial index to a graph built by a `GraphBuilder`.
+
+        Every vertex and edge contributed by a file which appears in the index, or in
+        `removed_files`, is removed from the graph, after which the documents of the index
+        are added as in `build_graph`. The "contains" edges of the affected symbols are then
+        re-resolved, and if caller relationships are built, those of the updated files are
+        recomputed. Symbols which are left without edges, and are not declared by any file,
+        are removed. The symbols whose vertices or edges changed are left in `self.stale_symbols`.
+
+        The `edge_index` of the graph is updated in place with the edges which are removed
+        and added, rather than rebuilt, and is built from the graph if it is not given.
+        """
+        self._graph = graph
+        self.edge_index = (
+            edge_index if edge_index is not None else _LabeledEdgeIndex.from_graph(graph)
+        )
+        documents = list(self.index.documents)
+        stale_files = {document.relative_path for document in documents}.union(removed_files or [])
+        # The endpoints of the removed edges, which may be left without any edge
+        orphan_candidates: Set[Any] = set()
+        for relative_path in stale_files:
+            orphan_candidates.update(self._remove_file(relative_path))
+
+        for document in documents:
+            self._add_file_vertices(document)
+            self._add_symbol_vertices(document)
+            self._process_relationships(document)
+            self._process_references(document)
+        # Every reference to a file is added by its own document
+        for relative_path in {document.relative_path for document in documents}:
+            for source, target, data in self._graph.in_edges(relative_path, data=True):
+                self.edge_index.add_edge(source, target, data)
+        self.stale_symbols.update(self._declaring_files, self._defining_files)
+
+        # Relationships are indexed as sets, and a relationship declared by several files
+        # may have lost its entry above, so the edges of each affected symbol are re-added
+        for symbol in self.stale_symbols:
+            if symbol in self._graph:
+                for source, target, data in self._graph.out_edges(symbol, data=True):
+                    if data.get("label") == "relationship":
+                        self.edge_index.add_edge(source, target, data)
+
+        self._resolve_contains_edges(self.stale_symbols)
+        self._remove_orphaned_symbols(orphan_candidates.union(self.stale_symbols))
+        if self.build_caller_relationships:
+            for document in documents:
+                self._process_caller_callee_relationships(document)
+        return self._graph
+
+    def _remove_file(self, relative_path: str) -> Set[Any]:
+        """
+        Removes a file vertex, along with the edges contributed by its document.
+
+        Returns:
+            The vertices at the other end of the removed edges.
+        """
+        if relative_path not in self._graph:
+            return set()
+
+        declared_symbols = self._graph.nodes[relative_path].get("declared_symbols", [])
+        stale_edges: List[Tuple[Any, Any, int, Dict[str, Any]]] = []
+        for symbol in declared_symbols:
+            # Relationship and caller edges originate from the symbols declared in the document
+            stale_edges.extend(
+                (source, target, key, data)
+                for source, target, key, data in self._graph.out_edges(
+                    symbol, keys=True, data=True
+                )
+                if data.get("label") in ("relationship", "caller")
+            )
+            stale_edges.extend(
+                (source, target, key, data)
+                for source, target, key, data in self._graph.in_edges(symbol, keys=True, data=True)
+                if data.get("label") == "callee"
+            )
+            declaring_files = self._graph.nodes[symbol].get("declaring_files", [])
+            if relative_path in declaring_files:
+                declaring_files.remove(relative_path)
+        # The edges of the file vertex are removed along with it
+        file_edges = list(self._graph.out_edges(relative_path, data=True)) + list(
+            self._graph.in_edges(relative_path, data=True)
+        )
+        self.edge_index.remove_file(relative_path)
+        self.edge_index.remove_edges(
+            [(source, target, data) for source, target, _, data in stale_edges] + file_edges
+        )
+        self._graph.remove_edges_from([edge[:3] for edge in stale_edges])
+
+        self.stale_symbols.update(declared_symbols)
+        self.stale_symbols.update(
+            target for _, target, data in file_edges if data.get("label") == "contains"
+        )
+        self._graph.remove_node(relative_path)
+        return {
+            node
+            for source, target, *_ in stale_edges + file_edges
+            for node in (source, target)
+            if node != relative_path
+        }
+
+    def _resolve_contains_edges(self, symbols: Set[Symbol]) -> None:
+        """
+        Re-resolves the "contains" edges of the given symbols.
+
+        A symbol is contained by the last file holding its definition, and otherwise by
+        every file which declares it, as recorded on its vertex. Symbols which are no
+        longer declared by any file lose their "symbol" label.
+        """
+        for symbol in symbols:
+            if symbol not in self._graph:
+                continue
+            contains_edges = [
+                (source, target, key, data)
+                for source, target, key, data in self._graph.in_edges(symbol, keys=True, data=True)
+                if data.get("label") == "contains"
+            ]
+            self.edge_index.remove_edges(
+                [(source, target, data) for source, target, _, data in contains_edges]
+            )
+            self._graph.remove_edges_from([edge[:3] for edge in contains_edges])
+
+            defining_files = [
+                file_path
+                for _, file_path, data in self._graph.out_edges(symbol, data=True)
+                if data.get("label") == "reference"
+                and data["symbol_reference"].roles.get(SymbolRole.Name(SymbolRole.Definition))
+            ]
+            declaring_files = self._graph.nodes[symbol].get("declaring_files", [])
+            for file_path in defining_files[-1:] or declaring_files:
+                self._graph.add_edge(file_path, symbol, label="contains")
+                self.edge_index.add_edge(file_path, symbol, {"label": "contains"})
+
+            if not declaring_files:
+                self._graph.nodes[symbol].pop("label", None)
+
+    def _remove_orphaned_symbols(self, symbols: Set[Any]) -> None:
+        """Removes the symbols which are neither declared by a file nor part of any edge."""
+        for symbol in symbols:
+            if (
+                symbol in self._graph
+                and "label" not in self._graph.nodes[symbol]
+                and self._graph.degree(symbol) == 0
+            ):
+                self._graph.remove_node(symbol)
+
     def _add_file_vertices(self, document: Any) -> None:
         self._graph.add_node(
             document.relative_path,
@@ -263,7 +569,29 @@ class GraphBuilder:
                 continue
 
             self._graph.add_node(symbol, label="symbol")
-            self._graph.add_edge(document.relative_path, symbol, label="contains")
+            self._declaring_files.setdefault(symbol, []).append(document.relative_path)
+            # The symbols of each file and the files of each symbol are recorded on their
+            # vertices, to repair the "contains" edges of the affected symbols in `update_graph`
+            self._graph.nodes[document.relative_path].setdefault("declared_symbols", []).append(
+                symbol
+            )
+            self._graph.nodes[symbol].setdefault("declaring_files", []).append(
+                document.relative_path
+            )
+
+    def _add_contains_edges(self) -> None:
+        """
+        Adds the "contains" edges of every symbol seen in the processed documents.
+
+        A symbol is contained by the last file holding its definition, and otherwise
+        by every file which declares it, as in `_resolve_contains_edges`.
+        """
+        for symbol, declaring_files in self._declaring_files.items():
+            if symbol not in self._defining_files:
+                for file_path in declaring_files:
+                    self._graph.add_edge(file_path, symbol, label="contains")
+        for symbol, file_path in self._defining_files.items():
+            self._graph.add_edge(file_path, symbol, label="contains")
 
     def _process_relationships(self, document: Any) -> None:
         for symbol_information in document.symbols:
@@ -271,128 +599,150 @@ class GraphBuilder:
             relationship_manager.process()
 
     def _process_references(self, document: Any) -> None:
-        occurrence_manager = _ReferenceProcessor(self._graph, document)
+        occurrence_manager = _ReferenceProcessor(self._graph, document, self._defining_files)
         occurrence_manager.process()
 
     def _process_caller_callee_relationships(self, document: Any) -> None:
-        caller_callee_manager = _CallerCalleeProcessor(self._graph, document)
+        caller_callee_manager = _CallerCalleeProcessor(self._graph, self.edge_index, document)
         caller_callee_manager.process()
 
 
-def process_symbol_bounds(
-    loader_args: Tuple[str, str], symbol: Symbol
-) -> Optional[Tuple[Symbol, Any]]:
-    """Uses RedBaron FST to compute the bounding box of a `Symbol`."""
-    if not py_module_loader._dotpath_map:
+def process_module_bounds(
+    symbols: List[Symbol],
+) -> Tuple[List[Tuple[Symbol, Any]], float, float]:
+    """
+    Uses RedBaron FST to compute the bounding boxes of `Symbols` which share a module.
+
+    The module is parsed once, and dropped from the worker's loader afterwards unless it
+    was already loaded, so that a persistent worker does not hold on to stale FSTs.
+
+    Returns:
+        The symbols and their bounding boxes, the seconds spent parsing the module,
+        and the seconds spent locating the symbols within it.
+    """
+    module_name = symbols[0].module_name
+    was_loaded = module_name in py_module_loader._loaded_modules
+    start = time()
+    py_module_loader.fetch_module(module_name)
+    parse_time = time() - start
+
+    results = []
+    for symbol in symbols:
+        try:
+            fst_object = convert_to_fst_object(symbol)
+            results.append((symbol, fst_object.absolute_bounding_box))
+        except Exception as e:
+            logger.error(f"Error computing bounding box for {symbol.uri}: {e}")
+    if not was_loaded:
+        py_module_loader._loaded_modules.pop(module_name, None)
+    return results, parse_time, time() - start - parse_time
+
+
+def _initialize_bounding_box_worker(loader_args: Tuple[str, str]) -> None:
+    if not py_module_loader.initialized:
         py_module_loader.initialize(*loader_args)
-    try:
-        fst_object = convert_to_fst_object(symbol)
-        bounding_box = fst_object.absolute_bounding_box
-        return symbol, bounding_box
-    except Exception as e:
-        logger.error(f"Error computing bounding box for {symbol.uri}: {e}")
-        return None
 
 
-class _SymbolGraphNavigator:
-    """Handles navigation within a symbol graph."""
+class _BoundingBoxWorkerPool:
+    """
+    A process pool for computing RedBaron bounding boxes, kept alive across calls.
 
-    def __init__(self, graph: nx.MultiDiGraph) -> None:
-        self._graph = graph
+    Each worker initializes the `py_module_loader` once, when it starts. The pool is
+    replaced if the loader has since been initialized with different paths.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _loader_args: Optional[Tuple[str, str]] = None
+
+    @classmethod
+    def get(cls, loader_args: Tuple[str, str]) -> ProcessPoolExecutor:
+        if cls._executor is None or cls._loader_args != loader_args:
+            cls.shutdown()
+            cls._executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                initializer=_initialize_bounding_box_worker,
+                initargs=(loader_args,),
+            )
+            cls._loader_args = loader_args
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown()
+        cls._executor = None
+        cls._loader_args = None
+
+
+atexit.register(_BoundingBoxWorkerPool.shutdown)
+
+
+class GraphNavigator(ABC):
+    """
+    Abstract base class for navigating the symbols, files and labeled edges of a `SymbolGraph`.
+
+    Concrete navigators are provided for each storage backend, while the logic which
+    relies on bounding boxes is shared between them.
+    """
+
+    def __init__(self) -> None:
         # TODO - Find the correct way to define a bounding box
         self.bounding_box: Dict[Symbol, Any] = {}  # Default to empty bounding boxes
+        # The rankable symbols whose definition could not be located when pre-computing
+        self._missing_bounding_boxes: Set[Symbol] = set()
+        self.bounding_box_source = BoundingBoxSource(SYMBOL_BOUNDING_BOX_SOURCE)
+        # The content hashes of the modules that the bounding boxes were computed from
+        self.bounding_box_module_hashes: Dict[str, Optional[str]] = {}
 
+    @abstractmethod
     def get_all_files(self) -> List[SymbolFile]:
-        return [
-            data.get("file")
-            for _, data in self._graph.nodes(data=True)
-            if data.get("label") == "file"
-        ]
+        pass
 
+    @abstractmethod
     def get_all_available_symbols(self) -> List[Symbol]:
-        return [
-            node for node, data in self._graph.nodes(data=True) if data.get("label") == "symbol"
-        ]
-
-    def get_symbol_dependencies(self, symbol: Symbol) -> Set[Symbol]:
-        references_in_range = self._get_symbol_references_in_scope(symbol)
-        return {ref.symbol for ref in references_in_range}
+        pass
 
+    @abstractmethod
     def get_symbol_relationships(self, symbol: Symbol) -> Set[Symbol]:
-        return {
-            target
-            for _, target, data in self._graph.out_edges(symbol, data=True)
-            if data.get("label") == "relationship"
-        }
+        pass
 
+    @abstractmethod
     def get_references_to_symbol(self, symbol: Symbol) -> Dict[str, List[SymbolReference]]:
-        """
-        Gets all references to a `Symbol`, calculated by finding out edges
-        with the label "reference" and the target node being the symbol.
-        """
-        search_results = [
-            (file_path, data.get("symbol_reference"))
-            for _, file_path, data in self._graph.out_edges(symbol, data=True)
-            if data.get("label") == "reference"
-        ]
-        result_dict: Dict[str, List[SymbolReference]] = {}
-
-        for file_path, symbol_reference in search_results:
-            if file_path in result_dict:
-                result_dict[file_path].append(symbol_reference)
-            else:
-                result_dict[file_path] = [symbol_reference]
-
-        return result_dict
+        pass
 
+    @abstractmethod
     def get_potential_symbol_callers(self, symbol: Symbol) -> Dict[SymbolReference, Symbol]:
-        """
-        Gets all references to a `Symbol`, calculated by finding out edges
-        with the label "callee" and the target node being the symbol caller.
-        """
-        return {
-            SymbolReference(
-                symbol=caller,
-                line_number=data.get("line_number"),
-                column_number=data.get("column_number"),
-                roles=data.get("roles"),
-            ): callee
-            for callee, caller, data in self._graph.out_edges(symbol, data=True)
-            if data.get("label") == "callee"
-        }
+        pass
 
+    @abstractmethod
     def get_potential_symbol_callees(self, symbol: Symbol) -> Dict[Symbol, SymbolReference]:
-        """
-        Gets all references to a `Symbol`, calculated by finding out edges
-        with the label "caller" and the target node being the symbol callee.
-        """
-        return {
-            callee: SymbolReference(
-                symbol=caller,
-                line_number=data.get("line_number"),
-                column_number=data.get("column_number"),
-                roles=data.get("roles"),
-            )
-            for caller, callee, data in self._graph.out_edges(symbol, data=True)
-            if data.get("label") == "caller"
-        }
+        pass
 
+    @abstractmethod
     def _get_symbol_containing_file(self, symbol: Symbol) -> str:
-        parent_file_list = [
-            source
-            for source, _, data in self._graph.in_edges(symbol, data=True)
-            if data.get("label") == "contains"
-        ]
-        assert (
-            len(parent_file_list) == 1
-        ), f"{symbol.uri} should have exactly one parent file, but has {len(parent_file_list)}"
-        return parent_file_list.pop()
+        pass
+
+    @abstractmethod
+    def _get_references_to_module(self, module_name: str) -> List[SymbolReference]:
+        """Gets all references to a module in the graph."""
+        pass
+
+    @abstractmethod
+    def _get_references_to_module_in_lines(
+        self, module_name: str, start_line: int, end_line: int
+    ) -> List[SymbolReference]:
+        """Gets the references to a module which lie in `[start_line, end_line)`, in order."""
+        pass
+
+    def get_symbol_dependencies(self, symbol: Symbol) -> Set[Symbol]:
+        references_in_range = self._get_symbol_references_in_scope(symbol)
+        return {ref.symbol for ref in references_in_range}
 
     def _get_symbol_references_in_scope(self, symbol: Symbol) -> List[SymbolReference]:
         """
         Gets all symbol references in the scope of a symbol.
-        This is done by finding the bounding box of the symbol,
-        and then finding all references in the parent module.
+        This is done by finding the bounding box of the symbol, and then
+        looking up the references to the parent module which lie on its lines.
 
         Notes:
             To cache the bounding boxes before calling this function, call
@@ -400,50 +750,136 @@ class _SymbolGraphNavigator:
             This is recommended for scenarios where this function is called
             across the entire
         """
+        file_name, start_line, start_column, end_line = self._get_symbol_scope(symbol)
+        references_in_lines = self._get_references_to_module_in_lines(
+            file_name, start_line, end_line
+        )
+        return [ref for ref in references_in_lines if ref.column_number >= start_column]
+
+    def _get_symbol_scope(self, symbol: Symbol) -> Tuple[str, int, int, int]:
+        """
+        Gets the file which contains a symbol, along with the start line, start column
+        and end line of its bounding box, in the 0-indexed positions used by SCIP.
+        """
         # bounding boxes are cached
-        if len(self.bounding_box) > 0:
+        if symbol in self.bounding_box:
             bounding_box = self.bounding_box[symbol]
+        elif symbol in self._missing_bounding_boxes:
+            raise ValueError(f"Symbol {symbol} not found")
         else:
-            fst_object = convert_to_fst_object(symbol)
-            bounding_box = fst_object.absolute_bounding_box
+            bounding_box = self._compute_bounding_box(symbol)
 
         # RedBaron POSITIONS ARE 1 INDEXED AND SCIP ARE 0!!!!
-        parent_symbol_start_line, parent_symbol_start_col, parent_symbol_end_line = (
+        file_name = self._get_symbol_containing_file(symbol)
+        return (
+            file_name,
             bounding_box.top_left.line - 1,
             bounding_box.top_left.column - 1,
             bounding_box.bottom_right.line - 1,
         )
 
-        file_name = self._get_symbol_containing_file(symbol)
-        references_in_parent_module = self._get_references_to_module(file_name)
-        return [
-            ref
-            for ref in references_in_parent_module
-            if parent_symbol_start_line <= ref.line_number < parent_symbol_end_line
-            and ref.column_number >= parent_symbol_start_col
-        ]
+    def _compute_bounding_box(self, symbol: Symbol) -> Any:
+        """Computes the bounding box of a single symbol, falling back to RedBaron."""
+        if self.bounding_box_source == BoundingBoxSource.AST:
+            bounding_boxes, unparsed_symbols = compute_ast_bounding_boxes([symbol])
+            if symbol in bounding_boxes:
+                return bounding_boxes[symbol]
+            if not unparsed_symbols:
+                raise ValueError(f"Symbol {symbol} not found")
+        return convert_to_fst_object(symbol).absolute_bounding_box
+
+    def _pre_compute_rankable_bounding_boxes(
+        self,
+        cache: Optional[BoundingBoxCache] = None,
+        module_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        Pre-computes and caches the bounding boxes for all symbols in the graph.
 
-    def _get_references_to_module(self, module_name: str) -> List[SymbolReference]:
-        """Gets all references to a module in the graph."""
-        reference_edges_in_module = self._graph.in_edges(module_name, data=True)
-        return [
-            data.get("symbol_reference")
-            for _, __, data in reference_edges_in_module
-            if data["label"] == "reference"
-        ]
+        Bounding boxes which are already loaded, e.g. from a snapshot, are kept while the
+        modules of the rankable symbols are unchanged. If a `BoundingBoxCache` is given,
+        only the symbols of modules which changed since their bounding boxes were stored
+        are computed, and the results are stored in turn. Symbols which cannot be located
+        are remembered, so that they are not searched for again.
 
-    def _pre_compute_rankable_bounding_boxes(self) -> None:
-        """Pre-computes and caches the bounding boxes for all symbols in the graph."""
+        Args:
+            module_hashes: The result of `get_rankable_module_hashes`, if the caller
+                already computed it
+        """
         now = time()
+        filtered_symbols = get_rankable_symbols(self.get_all_available_symbols())
+        if module_hashes is None:
+            module_hashes = self._get_module_hashes(filtered_symbols)
         # Bounding boxes are already loaded
-        if len(self.bounding_box) > 0:
+        if len(self.bounding_box) > 0 and self.bounding_box_module_hashes == module_hashes:
             return
 
-        logger.info("Pre-computing bounding boxes for all rankable symbols")
-        filtered_symbols = get_rankable_symbols(self.get_all_available_symbols())
-        from functools import partial
+        logger.info(
+            f"Pre-computing bounding boxes for all rankable symbols with {self.bounding_box_source.value}"
+        )
+        bounding_boxes: Dict[Symbol, Any] = {}
+        missing_bounding_boxes: Set[Symbol] = set()
+        if cache is not None:
+            cached_boxes, filtered_symbols = cache.get_bounding_boxes(
+                filtered_symbols, self.bounding_box_source, module_hashes
+            )
+            for symbol, bounding_box in cached_boxes.items():
+                if bounding_box is None:
+                    missing_bounding_boxes.add(symbol)
+                else:
+                    bounding_boxes[symbol] = bounding_box
+            logger.info(
+                f"Loaded {len(cached_boxes)} bounding boxes from the cache, "
+                f"computing {len(filtered_symbols)} in {time() - now} seconds"
+            )
+
+        computed_boxes = self._compute_bounding_boxes(filtered_symbols)
+        bounding_boxes.update(computed_boxes)
+        missing_bounding_boxes.update(
+            symbol for symbol in filtered_symbols if symbol not in computed_boxes
+        )
+        if cache is not None:
+            cache.put_bounding_boxes(
+                filtered_symbols, computed_boxes, self.bounding_box_source, module_hashes
+            )
+
+        logger.info(
+            f"Finished pre-computing bounding boxes for all rankable symbols in {time() - now} seconds"
+        )
+        self.bounding_box = bounding_boxes
+        self._missing_bounding_boxes = missing_bounding_boxes
+        self.bounding_box_module_hashes = module_hashes
 
-        # prepare loader_args here (replace this comment with actual code)
+    def get_rankable_module_hashes(self) -> Dict[str, Optional[str]]:
+        """Gets the content hash of each module which defines a rankable symbol."""
+        return self._get_module_hashes(get_rankable_symbols(self.get_all_available_symbols()))
+
+    @staticmethod
+    def _get_module_hashes(symbols: List[Symbol]) -> Dict[str, Optional[str]]:
+        return {
+            module_name: get_module_content_hash(module_name)
+            for module_name in sorted({symbol.module_name for symbol in symbols})
+        }
+
+    def _compute_bounding_boxes(self, symbols: List[Symbol]) -> Dict[Symbol, Any]:
+        """Computes the bounding boxes of symbols with the configured source."""
+        bounding_boxes: Dict[Symbol, Any] = {}
+        if self.bounding_box_source == BoundingBoxSource.AST:
+            bounding_boxes, symbols = compute_ast_bounding_boxes(symbols)
+            logger.info(f"Falling back to RedBaron for {len(symbols)} symbols")
+
+        if symbols:
+            bounding_boxes.update(self._compute_redbaron_bounding_boxes(symbols))
+        return bounding_boxes
+
+    @staticmethod
+    def _compute_redbaron_bounding_boxes(symbols: List[Symbol]) -> Dict[Symbol, Any]:
+        """
+        Computes bounding boxes from the RedBaron FST of each symbol in a process pool.
+
+        Symbols are partitioned by module, so each module is parsed exactly once, by a
+        single worker, which returns the bounding boxes of the whole module in one batch.
+        """
         if not py_module_loader.initialized:
             raise ValueError(
                 "Module loader must be initialized before pre-computing bounding boxes"
@@ -452,19 +888,120 @@ class _SymbolGraphNavigator:
             py_module_loader.root_fpath or "",
             py_module_loader.py_fpath or "",
         )
-        bounding_boxes = {}
-        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            func = partial(process_symbol_bounds, loader_args)
-            results = executor.map(func, filtered_symbols)
-            for result in results:
-                if result is not None:
-                    symbol, bounding_box = result
-                    bounding_boxes[symbol] = bounding_box
 
+        start = time()
+        symbols_by_module: Dict[str, List[Symbol]] = {}
+        for symbol in symbols:
+            symbols_by_module.setdefault(symbol.module_name, []).append(symbol)
+        # Scheduling the largest modules first keeps the workers evenly loaded
+        partitions = sorted(symbols_by_module.values(), key=len, reverse=True)
         logger.info(
-            f"Finished pre-computing bounding boxes for all rankable symbols in {time() - now} seconds"
+            f"Partitioned {len(symbols)} symbols into {len(partitions)} modules in {time() - start} seconds"
         )
-        self.bounding_box = bounding_boxes
+
+        start = time()
+        bounding_boxes: Dict[Symbol, Any] = {}
+        parse_time, locate_time = 0.0, 0.0
+        executor = _BoundingBoxWorkerPool.get(loader_args)
+        try:
+            for results, module_parse_time, module_locate_time in executor.map(
+                process_module_bounds, partitions
+            ):
+                bounding_boxes.update(results)
+                parse_time += module_parse_time
+                locate_time += module_locate_time
+        except BrokenProcessPool:
+            _BoundingBoxWorkerPool.shutdown()
+            raise
+        logger.info(
+            f"Computed {len(bounding_boxes)} bounding boxes in {time() - start} seconds, "
+            f"workers spent {parse_time} seconds parsing modules and "
+            f"{locate_time} seconds locating symbols"
+        )
+        return bounding_boxes
+
+
+class _SymbolGraphNavigator(GraphNavigator):
+    """Handles navigation within a symbol graph stored as a networkx `MultiDiGraph`."""
+
+    def __init__(
+        self, graph: nx.MultiDiGraph, edge_index: Optional[_LabeledEdgeIndex] = None
+    ) -> None:
+        super().__init__()
+        self._graph = graph
+        self._edge_index = edge_index or _LabeledEdgeIndex.from_graph(graph)
+
+    def get_all_files(self) -> List[SymbolFile]:
+        return [
+            data.get("file")
+            for _, data in self._graph.nodes(data=True)
+            if data.get("label") == "file"
+        ]
+
+    def get_all_available_symbols(self) -> List[Symbol]:
+        return [
+            node for node, data in self._graph.nodes(data=True) if data.get("label") == "symbol"
+        ]
+
+    def get_symbol_relationships(self, symbol: Symbol) -> Set[Symbol]:
+        return set(self._edge_index.relationships.get(symbol, set()))
+
+    def get_references_to_symbol(self, symbol: Symbol) -> Dict[str, List[SymbolReference]]:
+        """
+        Gets all references to a `Symbol`, calculated by finding out edges
+        with the label "reference" and the target node being the symbol.
+        """
+        result_dict: Dict[str, List[SymbolReference]] = {}
+        for file_path, symbol_reference in self._edge_index.references_to_symbol.get(symbol, []):
+            result_dict.setdefault(file_path, []).append(symbol_reference)
+        return result_dict
+
+    def get_potential_symbol_callers(self, symbol: Symbol) -> Dict[SymbolReference, Symbol]:
+        """
+        Gets all references to a `Symbol`, calculated by finding out edges
+        with the label "callee" and the target node being the symbol caller.
+        """
+        return dict(self._edge_index.callers.get(symbol, {}))
+
+    def get_potential_symbol_callees(self, symbol: Symbol) -> Dict[Symbol, SymbolReference]:
+        """
+        Gets all references to a `Symbol`, calculated by finding out edges
+        with the label "caller" and the target node being the symbol callee.
+        """
+        return dict(self._edge_index.callees.get(symbol, {}))
+
+    def _get_symbol_containing_file(self, symbol: Symbol) -> str:
+        parent_file_list = list(self._edge_index.containing_files.get(symbol, []))
+        assert (
+            len(parent_file_list) == 1
+        ), f"{symbol.uri} should have exactly one parent file, but has {len(parent_file_list)}"
+        return parent_file_list.pop()
+
+    def _get_references_to_module(self, module_name: str) -> List[SymbolReference]:
+        """Gets all references to a module in the graph, ordered by their position."""
+        return list(self._edge_index.references_in_file.get(module_name, []))
+
+    def _get_references_to_module_in_lines(
+        self, module_name: str, start_line: int, end_line: int
+    ) -> List[SymbolReference]:
+        positions = self._edge_index.reference_positions_in_file.get(module_name, [])
+        # Positions are (line, column), so (line, -1) sorts before every column on the line
+        start = bisect_left(positions, (start_line, -1))
+        end = bisect_left(positions, (end_line, -1), lo=start)
+        return self._edge_index.references_in_file[module_name][start:end] if positions else []
+
+
+class SymbolGraphBackend(Enum):
+    """
+    The storage engines available to a `SymbolGraph`.
+
+    NETWORKX stores every file, symbol and reference as nodes and attributed edges
+    of a `MultiDiGraph`, while COMPACT interns symbols and files to integer ids and
+    stores each edge label as CSR arrays, see `automata.core.symbol.compact_graph`.
+    """
+
+    NETWORKX = "networkx"
+    COMPACT = "compact"
 
 
 class SymbolGraph:
@@ -476,14 +1013,122 @@ class SymbolGraph:
 
     @dataclass
     class SubGraph:
+        """
+        A subgraph of a `SymbolGraph`. Subgraphs are cached and shared by their parent,
+        so their graph is frozen, and consumers should filter it through a view.
+        """
+
         parent: "SymbolGraph"
         graph: nx.DiGraph
 
-    def __init__(self, index_path: str, build_caller_relationships: bool = False) -> None:
-        index = self._load_index_protobuf(index_path)
-        builder = GraphBuilder(index, build_caller_relationships)
-        self._graph = builder.build_graph()
-        self.navigator = _SymbolGraphNavigator(self._graph)
+    def __init__(
+        self,
+        index_path: str,
+        build_caller_relationships: bool = False,
+        backend: SymbolGraphBackend = SymbolGraphBackend.NETWORKX,
+        snapshot_dir: Optional[str] = None,
+        bounding_box_source: Optional[BoundingBoxSource] = None,
+        bounding_box_cache_path: Optional[str] = None,
+        build_in_parallel: bool = False,
+    ) -> None:
+        """
+        Args:
+            index_path: The path to the SCIP index to build the graph from.
+            build_caller_relationships: Whether to add the caller and callee edges.
+            backend: The storage engine of the graph.
+            snapshot_dir: If given, the built graph is persisted to this directory
+                and loaded from it while the content of the index is unchanged.
+            bounding_box_source: How the bounding boxes of symbols are computed,
+                defaults to the SYMBOL_BOUNDING_BOX_SOURCE setting.
+            bounding_box_cache_path: If given, computed bounding boxes are persisted to
+                this database and reused while the source of their module is unchanged.
+            build_in_parallel: Whether to parse shards of the index in a process pool,
+                see `CompactGraphBuilder`.
+
+        Raises:
+            NotImplementedError: If a parallel build is requested for the networkx backend
+        """
+        if build_in_parallel and backend != SymbolGraphBackend.COMPACT:
+            raise NotImplementedError(
+                f"Parallel builds are not supported by the {backend.value} backend"
+            )
+        self.backend = backend
+        self.build_caller_relationships = build_caller_relationships
+        self._bounding_box_cache: Optional[BoundingBoxCache] = None
+        if bounding_box_cache_path is not None:
+            try:
+                self._bounding_box_cache = BoundingBoxCache(bounding_box_cache_path)
+            except sqlite3.Error as e:
+                logger.warning(
+                    f"Failed to open the bounding box cache {bounding_box_cache_path}: {e}"
+                )
+        bounding_box_source = bounding_box_source or BoundingBoxSource(SYMBOL_BOUNDING_BOX_SOURCE)
+        # The rankable subgraphs and their edges, keyed by their flow rank and path filter
+        self._subgraphs: Dict[Tuple[str, Optional[str]], SymbolGraph.SubGraph] = {}
+        self._subgraph_edges: Dict[Tuple[str, Optional[str]], Tuple[List[Symbol], np.ndarray]] = {}
+        self._snapshot: Optional[SymbolGraphSnapshot] = None
+        if snapshot_dir is not None:
+            self._snapshot = SymbolGraphSnapshot(
+                snapshot_dir, index_path, backend.value, build_caller_relationships
+            )
+            navigator = self._snapshot.load()
+            if navigator is not None:
+                self.navigator = navigator
+                if navigator.bounding_box_source != bounding_box_source:
+                    # The stored bounding boxes were computed from another source
+                    navigator.bounding_box = {}
+                    navigator._missing_bounding_boxes = set()
+                    navigator.bounding_box_source = bounding_box_source
+                return
+
+        self.navigator = self._build_navigator(
+            index_path, build_caller_relationships, backend, build_in_parallel
+        )
+        self.navigator.bounding_box_source = bounding_box_source
+        if self._snapshot is not None:
+            self._snapshot.save(self.navigator)
+
+    @property
+    def _graph(self) -> nx.MultiDiGraph:
+        """
+        The networkx graph of the navigator, which `SymbolGraph` used to hold itself.
+
+        Raises:
+            NotImplementedError: If the graph is not stored with the networkx backend
+        """
+        if not isinstance(self.navigator, _SymbolGraphNavigator):
+            raise NotImplementedError(
+                f"The {self.backend.value} backend does not store a networkx graph"
+            )
+        return self.navigator._graph
+
+    def apply_index_delta(
+        self, index_path: str, removed_files: Optional[List[str]] = None
+    ) -> None:
+        """
+        Updates the graph in place from a partial SCIP index, e.g. one generated for the
+        files changed by an edit, instead of rebuilding it from a full index.
+
+        Every file which appears in the partial index, or in `removed_files`, has its
+        contributions replaced, see `GraphBuilder.update_graph`.
+
+        Raises:
+            NotImplementedError: If the graph is not stored with the networkx backend
+        """
+        if not isinstance(self.navigator, _SymbolGraphNavigator):
+            raise NotImplementedError(
+                f"Incremental updates are not supported by the {self.backend.value} backend"
+            )
+
+        builder = GraphBuilder(ScipIndexReader(index_path), self.build_caller_relationships)
+        builder.update_graph(self.navigator._graph, removed_files, self.navigator._edge_index)
+        for symbol in builder.stale_symbols:
+            self.navigator.bounding_box.pop(symbol, None)
+            self.navigator._missing_bounding_boxes.discard(symbol)
+        # The snapshot is keyed by the original index, which no longer matches the graph
+        self._snapshot = None
+        self._subgraphs.clear()
+        self._subgraph_edges.clear()
 
     def get_all_files(self) -> List[SymbolFile]:
         return self.navigator.get_all_files()
@@ -526,9 +1171,101 @@ class SymbolGraph:
         contains only rankable symbols. The nodes in the subgraph
         are rankable symbols, and the edges are the dependencies
         between them.
+
+        The subgraph is cached for each flow_rank and path_filter, and persisted
+        alongside the snapshot of the graph when there is one. The returned graph
+        is frozen, since it is shared by every caller.
+
+        Raises:
+            ValueError: If flow_rank is not one of 'to_dependents', 'from_dependents',
+                or 'bidirectional'
+        """
+        key = (flow_rank, path_filter)
+        if key not in self._subgraphs:
+            symbols, edges = self._get_cached_rankable_dependency_edges(flow_rank, path_filter)
+            G = nx.DiGraph()
+            G.add_edges_from(
+                zip(map(symbols.__getitem__, edges[0]), map(symbols.__getitem__, edges[1]))
+            )
+            self._subgraphs[key] = SymbolGraph.SubGraph(graph=nx.freeze(G), parent=self)
+        return self._subgraphs[key]
+
+    def get_rankable_symbol_dependency_matrix(
+        self, flow_rank="bidirectional", path_filter: Optional[str] = None
+    ) -> Tuple[List[Symbol], sparse.csr_matrix]:
+        """
+        Computes the edges of the rankable symbol subgraph as a sparse adjacency matrix,
+        for consumers which work on arrays rather than on a networkx graph.
+
+        Returns:
+            The symbols of the subgraph, and a matrix whose entry (i, j) is 1
+            if there is an edge from the i-th symbol to the j-th symbol.
+
+        Raises:
+            ValueError: If flow_rank is not one of 'to_dependents', 'from_dependents',
+                or 'bidirectional'
+        """
+        symbols, edges = self._get_cached_rankable_dependency_edges(flow_rank, path_filter)
+        matrix = sparse.csr_matrix(
+            (np.ones(edges.shape[1], dtype=np.float64), (edges[0], edges[1])),
+            shape=(len(symbols), len(symbols)),
+        )
+        return list(symbols), matrix
+
+    def _get_cached_rankable_dependency_edges(
+        self, flow_rank: str, path_filter: Optional[str]
+    ) -> Tuple[List[Symbol], np.ndarray]:
+        """
+        Gets the edges of a rankable subgraph from memory, or from its snapshot,
+        and otherwise computes them and stores them in both.
+        """
+        if flow_rank not in FLOW_RANKS:
+            raise ValueError(
+                "flow_rank must be one of 'to_dependents', 'from_dependents', or 'bidirectional'"
+            )
+
+        key = (flow_rank, path_filter)
+        if key in self._subgraph_edges:
+            return self._subgraph_edges[key]
+
+        module_hashes = self.navigator.get_rankable_module_hashes()
+        subgraph_snapshot: Optional[SubgraphSnapshot] = None
+        result: Optional[Tuple[List[Symbol], np.ndarray]] = None
+        if self._snapshot is not None:
+            subgraph_snapshot = SubgraphSnapshot(
+                self._snapshot,
+                flow_rank,
+                path_filter,
+                self.navigator.bounding_box_source.value,
+                module_hashes,
+            )
+            result = subgraph_snapshot.load()
+        if result is None:
+            result = self._get_rankable_dependency_edges(flow_rank, path_filter, module_hashes)
+            if subgraph_snapshot is not None:
+                subgraph_snapshot.save(*result)
+
+        result[1].flags.writeable = False
+        self._subgraph_edges[key] = result
+        return result
+
+    def _get_rankable_dependency_edges(
+        self,
+        flow_rank: str,
+        path_filter: Optional[str],
+        module_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Tuple[List[Symbol], np.ndarray]:
         """
-        G = nx.DiGraph()
+        Computes the edges between rankable symbols and their dependencies in one pass.
 
+        The dependencies and relationships of every rankable symbol are gathered as
+        integer ids, the rankable filter is applied once to the distinct related symbols,
+        and the edges are then oriented and deduplicated with array operations.
+
+        Returns:
+            The symbols which have at least one edge, and a (2, n_edges) array of the
+            source and target positions of each distinct edge in that list.
+        """
         filtered_symbols = get_rankable_symbols(self.get_all_available_symbols())
 
         if path_filter is not None:
@@ -536,39 +1273,71 @@ class SymbolGraph:
                 sym for sym in filtered_symbols if sym.dotpath.startswith(path_filter)  # type: ignore
             ]
 
-        self.navigator._pre_compute_rankable_bounding_boxes()
+        bounding_boxes = self.navigator.bounding_box
+        self.navigator._pre_compute_rankable_bounding_boxes(
+            self._bounding_box_cache, module_hashes
+        )
+        if self._snapshot is not None and self.navigator.bounding_box is not bounding_boxes:
+            # Persist the freshly computed bounding boxes along with the graph
+            self._snapshot.save(self.navigator)
 
         logger.info("Building the rankable symbol subgraph...")
+        symbol_ids: Dict[Symbol, int] = {}
+        source_ids, target_ids = array("i"), array("i")
         for symbol in tqdm(filtered_symbols):
             try:
-                dependencies = self.get_symbol_dependencies(symbol)
-                relationships = self.get_symbol_relationships(symbol)
-                filtered_related_symbols = get_rankable_symbols(
-                    list(dependencies.union(relationships))
+                related_symbols = self.get_symbol_dependencies(symbol).union(
+                    self.get_symbol_relationships(symbol)
                 )
-                for dependency in filtered_related_symbols:
-                    if flow_rank == "to_dependents":
-                        G.add_edge(symbol, dependency)
-                    elif flow_rank == "from_dependents":
-                        G.add_edge(dependency, symbol)
-                    elif flow_rank == "bidirectional":
-                        G.add_edge(symbol, dependency)
-                        G.add_edge(dependency, symbol)
-                    else:
-                        raise ValueError(
-                            "flow_rank must be one of 'to_dependents', 'from_dependents', or 'bidirectional'"
-                        )
-
             except Exception as e:
                 logger.error(f"Error processing {symbol.uri}: {e}")
+                continue
+            source_id = symbol_ids.setdefault(symbol, len(symbol_ids))
+            for related_symbol in related_symbols:
+                source_ids.append(source_id)
+                target_ids.append(symbol_ids.setdefault(related_symbol, len(symbol_ids)))
+
+        symbols = list(symbol_ids)
+        is_rankable = np.zeros(len(symbols), dtype=bool)
+        is_rankable[[symbol_ids[symbol] for symbol in get_rankable_symbols(symbols)]] = True
+
+        sources = np.frombuffer(source_ids, dtype=np.int32)
+        targets = np.frombuffer(target_ids, dtype=np.int32)
+        # The sources are rankable, so only the related symbols need to be filtered
+        sources, targets = sources[is_rankable[targets]], targets[is_rankable[targets]]
+        if flow_rank == "to_dependents":
+            edges = np.stack([sources, targets])
+        elif flow_rank == "from_dependents":
+            edges = np.stack([targets, sources])
+        else:
+            edges = np.concatenate([np.stack([sources, targets]), np.stack([targets, sources])], 1)
+        edges = np.unique(edges, axis=1)
 
+        # Renumber the symbols which are part of an edge, so that the ids are contiguous
+        node_ids, edges = np.unique(edges, return_inverse=True)
+        edges = edges.reshape(2, -1)
         logger.info("Built the rankable symbol subgraph")
-
-        return SymbolGraph.SubGraph(graph=G, parent=self)
+        return [symbols[node_id] for node_id in node_ids], edges
 
     @staticmethod
-    def _load_index_protobuf(path: str) -> Index:
-        index = Index()
-        with open(path, "rb") as f:
-            index.ParseFromString(f.read())
-        return index
+    def _build_navigator(
+        index_path: str,
+        build_caller_relationships: bool,
+        backend: SymbolGraphBackend,
+        build_in_parallel: bool = False,
+    ) -> GraphNavigator:
+        index = ScipIndexReader(index_path)
+        if backend == SymbolGraphBackend.COMPACT:
+            from automata.core.symbol.compact_graph import (
+                CompactGraphBuilder,
+                _CompactSymbolGraphNavigator,
+            )
+
+            compact_graph = CompactGraphBuilder(
+                index, build_caller_relationships, build_in_parallel
+            ).build_graph()
+            return _CompactSymbolGraphNavigator(compact_graph)
+
+        builder = GraphBuilder(index, build_caller_relationships)
+        graph = builder.build_graph()
+        return _SymbolGraphNavigator(graph, builder.edge_index)
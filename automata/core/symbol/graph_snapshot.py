@@ -0,0 +1,206 @@
+"""
+Persists built `SymbolGraph` navigators to disk, so that later processes can skip
+parsing the SCIP index and rebuilding the graph.
+
+Compact graphs are written alongside the pickled navigator in the flat format of
+`CompactSymbolGraph.save_mapped`, and are memory-mapped rather than unpickled on load,
+so that every process which loads the snapshot shares one physical copy of the graph.
+
+Snapshots are keyed by the content hash of the index file together with the library
+and snapshot format versions, the storage backend and whether caller relationships
+were built. Any change to these produces a new key, so stale snapshots are never loaded.
+
+The rankable dependency subgraphs computed from a graph are stored next to its snapshot,
+keyed by the snapshot key, the arguments of the subgraph and the content hashes of the
+modules which its bounding boxes were computed from, see `SubgraphSnapshot`.
+"""
+import hashlib
+import io
+import logging
+import os
+import pickle
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from automata import __version__
+from automata.core.symbol.parser import parse_symbol
+from automata.core.symbol.scip_pb2 import Document  # type: ignore
+from automata.core.symbol.symbol_types import Symbol, SymbolFile
+
+if TYPE_CHECKING:
+    from automata.core.symbol.graph import GraphNavigator
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the pickled layout of the navigators changes
+SNAPSHOT_FORMAT_VERSION = 8
+# Bump whenever the stored layout or the construction of the rankable subgraphs changes
+SUBGRAPH_FORMAT_VERSION = 2
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickles a navigator, storing each `Symbol` by its uri and each `SymbolFile`
+    by its serialized SCIP occurrences, since protobuf containers cannot be pickled.
+    A `CompactSymbolGraph` is stored by reference to its mapped file at `graph_path`.
+    """
+
+    def __init__(self, file: Any, graph_path: str) -> None:
+        from automata.core.symbol.compact_graph import CompactSymbolGraph
+
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._compact_graph_type = CompactSymbolGraph
+        self._graph_path = graph_path
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[str, ...]]:
+        if isinstance(obj, self._compact_graph_type):
+            # The mapped file is addressed by the snapshot key, so an existing one is current
+            if not os.path.exists(self._graph_path):
+                obj.save_mapped(self._graph_path)
+            return ("compact_graph", os.path.basename(self._graph_path))
+        if isinstance(obj, Symbol):
+            return ("symbol", obj.uri)
+        if isinstance(obj, SymbolFile) and not isinstance(obj.occurrences, str):
+            document = Document(relative_path=obj.path, occurrences=obj.occurrences)
+            return ("file", obj.path, document.SerializeToString())
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Restores the objects stored by `_SnapshotPickler`, parsing each symbol uri once."""
+
+    def __init__(self, file: Any, snapshot_dir: str) -> None:
+        super().__init__(file)
+        self._snapshot_dir = snapshot_dir
+        self._symbols: Dict[str, Symbol] = {}
+
+    def persistent_load(self, pid: Tuple[str, ...]) -> Any:
+        if pid[0] == "symbol":
+            uri = pid[1]
+            if uri not in self._symbols:
+                self._symbols[uri] = parse_symbol(uri)
+            return self._symbols[uri]
+        if pid[0] == "file":
+            _, path, data = pid
+            return SymbolFile(path, Document.FromString(data).occurrences)
+        if pid[0] == "compact_graph":
+            from automata.core.symbol.compact_graph import CompactSymbolGraph
+
+            return CompactSymbolGraph.open_mapped(os.path.join(self._snapshot_dir, pid[1]))
+        raise pickle.UnpicklingError(f"Unsupported persistent id {pid[0]}")
+
+
+class SymbolGraphSnapshot:
+    """A versioned on-disk snapshot of the navigator built for a SCIP index."""
+
+    def __init__(
+        self,
+        snapshot_dir: str,
+        index_path: str,
+        backend: str,
+        build_caller_relationships: bool = False,
+    ) -> None:
+        self.snapshot_dir = snapshot_dir
+        self.key = self.compute_key(index_path, backend, build_caller_relationships)
+        self.path = os.path.join(snapshot_dir, f"symbol_graph_{self.key}.pkl")
+        self.graph_path = os.path.join(snapshot_dir, f"symbol_graph_{self.key}.csg")
+
+    @staticmethod
+    def compute_key(index_path: str, backend: str, build_caller_relationships: bool) -> str:
+        """Computes the key of a snapshot from the content of the index and the build settings."""
+        digest = hashlib.sha256()
+        with open(index_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(
+            f"{__version__}:{SNAPSHOT_FORMAT_VERSION}:{backend}:{build_caller_relationships}".encode()
+        )
+        return digest.hexdigest()
+
+    def load(self) -> Optional["GraphNavigator"]:
+        """Loads the navigator stored in the snapshot, or returns None if it is unavailable."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                navigator = _SnapshotUnpickler(f, self.snapshot_dir).load()
+        except Exception as e:
+            logger.warning(f"Failed to load the symbol graph snapshot at {self.path}: {e}")
+            return None
+        logger.info(f"Loaded the symbol graph snapshot at {self.path}")
+        return navigator
+
+    def save(self, navigator: "GraphNavigator") -> None:
+        """Atomically writes the navigator to the snapshot, logging rather than raising on failure."""
+        buffer = io.BytesIO()
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            _SnapshotPickler(buffer, self.graph_path).dump(navigator)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save the symbol graph snapshot at {self.path}: {e}")
+            return
+        logger.info(f"Saved the symbol graph snapshot at {self.path}")
+
+
+class SubgraphSnapshot:
+    """
+    An on-disk cache of a rankable dependency subgraph of a snapshotted `SymbolGraph`.
+
+    The subgraph is stored as the uris of its symbols along with an array of its edges,
+    so that later processes can skip computing bounding boxes and dependencies.
+
+    The edges depend on the bounding boxes of the rankable symbols, which are computed
+    from the source of their modules rather than from the index, so the content hash of
+    each of these modules is part of the key. Editing any of them selects another key.
+    """
+
+    def __init__(
+        self,
+        graph_snapshot: SymbolGraphSnapshot,
+        flow_rank: str,
+        path_filter: Optional[str],
+        bounding_box_source: str,
+        module_hashes: Dict[str, Optional[str]],
+    ) -> None:
+        digest = hashlib.sha256(
+            f"{graph_snapshot.key}:{SUBGRAPH_FORMAT_VERSION}:{flow_rank}:{path_filter!r}:"
+            f"{bounding_box_source}".encode()
+        )
+        for module_name, content_hash in sorted(module_hashes.items()):
+            digest.update(f"\n{module_name}:{content_hash}".encode())
+        self.key = digest.hexdigest()
+        self.path = os.path.join(graph_snapshot.snapshot_dir, f"rankable_subgraph_{self.key}.pkl")
+
+    def load(self) -> Optional[Tuple[List[Symbol], np.ndarray]]:
+        """Loads the symbols and edges of the stored subgraph, or returns None if unavailable."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            symbols = [parse_symbol(uri) for uri in data["symbols"]]
+            edges = np.asarray(data["edges"], dtype=np.int64).reshape(2, -1)
+        except Exception as e:
+            logger.warning(f"Failed to load the subgraph snapshot at {self.path}: {e}")
+            return None
+        logger.info(f"Loaded the subgraph snapshot at {self.path}")
+        return symbols, edges
+
+    def save(self, symbols: List[Symbol], edges: np.ndarray) -> None:
+        """Atomically writes the subgraph to the snapshot, logging rather than raising on failure."""
+        data = {"symbols": [symbol.uri for symbol in symbols], "edges": edges}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save the subgraph snapshot at {self.path}: {e}")
+            return
+        logger.info(f"Saved the subgraph snapshot at {self.path}")
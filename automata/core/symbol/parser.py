@@ -1,5 +1,6 @@
 import re
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
 
 from automata.core.symbol.symbol_types import Symbol, SymbolDescriptor, SymbolPackage
 
@@ -139,11 +140,118 @@ class _SymbolParser:
         return c.isalpha() or c.isdigit() or c in ["-", "+", "$", "_"]
 
 
+class _FastSymbolParser:
+    """
+    Parses the common shape of the URIs produced by scip-python with compiled regexes,
+    e.g. "scip-python python automata <version> `automata.core.base.tool`/Tool#run().".
+
+    Only URIs whose scheme and package contain no escaped spaces, and whose identifiers
+    are ASCII or backtick escaped without inner backticks, are accepted. For any other
+    URI `parse` returns None, and the general `_SymbolParser` must be used instead.
+    """
+
+    _HEADER = re.compile(
+        r"(?P<scheme>[^ ]+) (?P<manager>[^ ]+) (?P<name>[^ ]+) (?P<version>[^ ]+) "
+    )
+    _IDENTIFIER = r"(?:[A-Za-z0-9$+_-]+|`[^`]+`)"
+    _DESCRIPTOR = re.compile(
+        rf"\((?P<parameter>{_IDENTIFIER})\)"
+        rf"|\[(?P<type_parameter>{_IDENTIFIER})\]"
+        rf"|(?P<name>{_IDENTIFIER})"
+        rf"(?:\((?P<disambiguator>{_IDENTIFIER})?\)(?P<method>\.)|(?P<suffix>[/.#:!]))"
+    )
+    _SUFFIXES = {
+        "/": SymbolDescriptor.ScipSuffix.Namespace,
+        ".": SymbolDescriptor.ScipSuffix.Term,
+        "#": SymbolDescriptor.ScipSuffix.Type,
+        ":": SymbolDescriptor.ScipSuffix.Meta,
+        "!": SymbolDescriptor.ScipSuffix.Macro,
+    }
+
+    @staticmethod
+    def parse(symbol_uri: str) -> Optional[Symbol]:
+        header = _FastSymbolParser._HEADER.match(symbol_uri)
+        if header is None or header.group("scheme") == "local":
+            return None
+
+        descriptors = []
+        index = header.end()
+        while index < len(symbol_uri):
+            match = _FastSymbolParser._DESCRIPTOR.match(symbol_uri, index)
+            if match is None:
+                return None
+            descriptors.append(_FastSymbolParser._to_descriptor(match))
+            index = match.end()
+        if not descriptors or "  " in symbol_uri[: header.end()]:
+            return None
+
+        manager, package_name, package_version = (
+            "" if value == "." else value for value in header.group("manager", "name", "version")
+        )
+        return Symbol(
+            symbol_uri,
+            header.group("scheme"),
+            SymbolPackage(manager, package_name, package_version),
+            tuple(descriptors),
+        )
+
+    @staticmethod
+    def _to_descriptor(match: re.Match) -> SymbolDescriptor:
+        if match.group("parameter") is not None:
+            return SymbolDescriptor(
+                _FastSymbolParser._unescape(match.group("parameter")),
+                SymbolDescriptor.ScipSuffix.Parameter,
+            )
+        if match.group("type_parameter") is not None:
+            return SymbolDescriptor(
+                _FastSymbolParser._unescape(match.group("type_parameter")),
+                SymbolDescriptor.ScipSuffix.TypeParameter,
+            )
+        name = _FastSymbolParser._unescape(match.group("name"))
+        if match.group("method") is not None:
+            return SymbolDescriptor(
+                name,
+                SymbolDescriptor.ScipSuffix.Method,
+                _FastSymbolParser._unescape(match.group("disambiguator") or ""),
+            )
+        return SymbolDescriptor(name, _FastSymbolParser._SUFFIXES[match.group("suffix")])
+
+    @staticmethod
+    def _unescape(identifier: str) -> str:
+        return identifier[1:-1] if identifier.startswith("`") else identifier
+
+
+# The maximum number of distinct URIs whose parsed `Symbol` is retained by `parse_symbol`
+PARSE_SYMBOL_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=PARSE_SYMBOL_CACHE_SIZE)
 def parse_symbol(symbol_uri: str) -> Symbol:
     """
     Parses a `Symbol` given a `Symbol` URI.
     Visit `Symbol` for more information on URI specification.
+
+    Parsed symbols are interned, so repeated calls with the same URI return the same
+    immutable `Symbol` object. See `get_parse_symbol_cache_info` for cache statistics.
+    """
+    return _FastSymbolParser.parse(symbol_uri) or _parse_symbol_general(symbol_uri)
+
+
+def parse_symbols(symbol_uris: Iterable[str]) -> List[Symbol]:
+    """
+    Parses a batch of `Symbol` URIs, in order.
+
+    Each distinct URI in the batch is parsed once, and repeated URIs share its `Symbol`.
     """
+    symbols: Dict[str, Symbol] = {}
+    return [
+        symbols[uri] if uri in symbols else symbols.setdefault(uri, parse_symbol(uri))
+        for uri in symbol_uris
+    ]
+
+
+def _parse_symbol_general(symbol_uri: str) -> Symbol:
+    """Parses any valid `Symbol` URI with the character by character `_SymbolParser`."""
     s = _SymbolParser(symbol_uri)
     scheme = s.accept_space_escaped_identifier("scheme")
 
@@ -167,6 +275,25 @@ def parse_symbol(symbol_uri: str) -> Symbol:
     )
 
 
+class ParseSymbolCacheInfo(NamedTuple):
+    """The statistics of the `parse_symbol` cache, as reported by `functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+def get_parse_symbol_cache_info() -> ParseSymbolCacheInfo:
+    """Gets the hits, misses, maximum size and current size of the `parse_symbol` cache."""
+    return ParseSymbolCacheInfo(*parse_symbol.cache_info())
+
+
+def clear_parse_symbol_cache() -> None:
+    """Clears the interned symbols and the statistics of the `parse_symbol` cache."""
+    parse_symbol.cache_clear()
+
+
 def new_local_symbol(symbol: str, id: str) -> Symbol:
     # TODO: Do we need this method?
     return Symbol(
@@ -0,0 +1,129 @@
+import logging
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+from automata.core.symbol.scip_pb2 import (  # type: ignore
+    Document,
+    Metadata,
+    SymbolInformation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ScipIndexReader:
+    """
+    Streams the fields of a SCIP `Index` from disk, decoding a single message at a time.
+
+    Parsing an `Index` with `ParseFromString` holds the raw bytes of the file and the
+    fully decoded message tree in memory at once. Instead, this reader walks the
+    protobuf wire format of the top level `Index` message, and decodes each `Document`
+    only when it is reached, so that peak memory is bounded by the largest document.
+
+    The `documents` property re-reads the file on every access, so the reader can be
+    passed in place of an `Index` to the graph builders, which iterate over it repeatedly.
+    The spans of the documents can also be listed without decoding them, so that separate
+    processes can each read a shard of the documents, see `CompactGraphBuilder`.
+    """
+
+    # The field numbers of the `Index` message, see scip.proto
+    METADATA_FIELD = 1
+    DOCUMENTS_FIELD = 2
+    EXTERNAL_SYMBOLS_FIELD = 3
+
+    # The protobuf wire types, see https://protobuf.dev/programming-guides/encoding
+    _VARINT = 0
+    _FIXED64 = 1
+    _LENGTH_DELIMITED = 2
+    _FIXED32 = 5
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @property
+    def documents(self) -> Iterator[Document]:
+        return self.iter_documents()
+
+    def iter_documents(self) -> Iterator[Document]:
+        """Yields the `Documents` of the index one at a time, in the order they are stored."""
+        for data in self._iter_field(ScipIndexReader.DOCUMENTS_FIELD):
+            yield Document.FromString(data)
+
+    def iter_document_spans(self) -> Iterator[Tuple[int, int]]:
+        """Yields the offset and length of each serialized `Document` in the file, in order."""
+        with open(self.path, "rb") as f:
+            yield from self._iter_field_spans(f, ScipIndexReader.DOCUMENTS_FIELD)
+
+    def read_documents(self, spans: Iterable[Tuple[int, int]]) -> Iterator[Document]:
+        """Yields the `Documents` at the spans listed by `iter_document_spans`."""
+        with open(self.path, "rb") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                yield Document.FromString(self._read_value(f, length))
+
+    def iter_external_symbols(self) -> Iterator[SymbolInformation]:
+        """Yields the `SymbolInformation` of the symbols defined outside of the index."""
+        for data in self._iter_field(ScipIndexReader.EXTERNAL_SYMBOLS_FIELD):
+            yield SymbolInformation.FromString(data)
+
+    def read_metadata(self) -> Metadata:
+        """Reads the `Metadata` of the index, merging repeated occurrences like protobuf does."""
+        metadata = Metadata()
+        for data in self._iter_field(ScipIndexReader.METADATA_FIELD):
+            metadata.MergeFromString(data)
+        return metadata
+
+    def _iter_field(self, field_number: int) -> Iterator[bytes]:
+        """Yields the serialized value of each occurrence of a message field of the `Index`."""
+        with open(self.path, "rb") as f:
+            for _, length in self._iter_field_spans(f, field_number):
+                yield self._read_value(f, length)
+
+    def _iter_field_spans(self, f: IO[bytes], field_number: int) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the offset and length of each occurrence of a message field of the `Index`,
+        with the file positioned at the start of the value, which may be read before resuming.
+        """
+        while True:
+            tag = self._read_varint(f)
+            if tag is None:
+                return
+            field, wire_type = tag >> 3, tag & 0x7
+            if wire_type == ScipIndexReader._LENGTH_DELIMITED:
+                length = self._read_varint(f)
+                if length is None:
+                    raise ValueError(f"Unexpected end of file in the SCIP index {self.path}")
+                offset = f.tell()
+                if field == field_number:
+                    yield offset, length
+                f.seek(offset + length)
+            elif wire_type == ScipIndexReader._VARINT:
+                self._read_varint(f)
+            elif wire_type == ScipIndexReader._FIXED64:
+                f.seek(8, 1)
+            elif wire_type == ScipIndexReader._FIXED32:
+                f.seek(4, 1)
+            else:
+                raise ValueError(
+                    f"Unsupported wire type {wire_type} in the SCIP index {self.path}"
+                )
+
+    def _read_value(self, f: IO[bytes], length: int) -> bytes:
+        data = f.read(length)
+        if len(data) != length:
+            raise ValueError(f"Unexpected end of file in the SCIP index {self.path}")
+        return data
+
+    @staticmethod
+    def _read_varint(f: IO[bytes]) -> Optional[int]:
+        """Reads a base 128 varint, returning None at the end of the file."""
+        result, shift = 0, 0
+        while True:
+            byte = f.read(1)
+            if not byte:
+                if shift == 0:
+                    return None
+                raise ValueError("Unexpected end of file while reading a varint")
+            result |= (byte[0] & 0x7F) << shift
+            if not byte[0] & 0x80:
+                return result
+            shift += 7
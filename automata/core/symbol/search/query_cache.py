@@ -0,0 +1,184 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Tuple
+
+from automata.core.base.database.relational import SQLDatabase
+from automata.core.symbol.parser import parse_symbol
+from automata.core.symbol.symbol_types import Symbol
+
+logger = logging.getLogger(__name__)
+
+QueryCacheResult = List[Tuple[Symbol, float]]
+
+
+@dataclass
+class QueryCacheMetrics:
+    """The counters of a `SymbolSearchQueryCache` since it was created."""
+
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups which were answered from the cache, memory or disk."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _QueryCacheEntry(NamedTuple):
+    created_at: float
+    results: QueryCacheResult
+
+
+class _QueryCacheStore(SQLDatabase):
+    """
+    The disk tier of a `SymbolSearchQueryCache`, which keeps its most recently stored entries.
+
+    Results are stored as JSON lists of symbol URIs and scores, and the symbols are parsed
+    again when they are loaded, so that reading the database never runs pickled code.
+    """
+
+    TABLE_NAME = "symbol_search_query_cache"
+    TABLE_FIELDS = {
+        "key": "TEXT PRIMARY KEY",
+        "created_at": "REAL",
+        "results": "TEXT",
+    }
+
+    def __init__(self, db_path: str) -> None:
+        self.connect(db_path)
+        self.create_table(self.TABLE_NAME, self.TABLE_FIELDS)
+
+    def get(self, key: str) -> Optional[_QueryCacheEntry]:
+        rows = self.select(self.TABLE_NAME, ["created_at", "results"], {"key": key})
+        if not rows:
+            return None
+        try:
+            return _QueryCacheEntry(
+                rows[0][0],
+                [(parse_symbol(uri), float(score)) for uri, score in json.loads(rows[0][1])],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load the cached results of {key}: {e}")
+            self.delete(self.TABLE_NAME, {"key": key})
+            return None
+
+    def put(self, key: str, entry: _QueryCacheEntry, max_size: int) -> None:
+        """Stores an entry, then drops the oldest entries beyond `max_size`."""
+        self.cursor.execute(
+            f"INSERT OR REPLACE INTO {self.TABLE_NAME} (key, created_at, results) VALUES (?, ?, ?)",
+            (
+                key,
+                entry.created_at,
+                json.dumps([[symbol.uri, score] for symbol, score in entry.results]),
+            ),
+        )
+        self.cursor.execute(
+            f"DELETE FROM {self.TABLE_NAME} WHERE key NOT IN "
+            f"(SELECT key FROM {self.TABLE_NAME} ORDER BY created_at DESC LIMIT ?)",
+            (max_size,),
+        )
+        self.conn.commit()
+
+    def discard(self, key: str) -> None:
+        self.delete(self.TABLE_NAME, {"key": key})
+
+    def clear(self) -> None:
+        self.cursor.execute(f"DELETE FROM {self.TABLE_NAME}")
+        self.conn.commit()
+
+
+class SymbolSearchQueryCache:
+    """
+    A cache of the ranked results of `SymbolSearch` queries.
+
+    Entries are evicted from memory in least recently used order once there are more than
+    `max_size` of them, and expire `ttl` seconds after they were computed. If a `db_path`
+    is given, entries are also stored in a SQLite database, so that they survive restarts.
+    The disk tier keeps the `max_size` most recently stored entries, and serves the entries
+    which are no longer in memory.
+
+    The cache does not know what its keys depend on, so `SymbolSearch` includes a digest of
+    its graph and embeddings in each key, and invalidates the cache when they change.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        db_path: Optional[str] = None,
+    ) -> None:
+        """
+        Raises:
+            ValueError: If max_size is not positive, or ttl is not positive
+        """
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, but got {max_size}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, but got {ttl}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.metrics = QueryCacheMetrics()
+        self._entries: "OrderedDict[str, _QueryCacheEntry]" = OrderedDict()
+        self._store = _QueryCacheStore(db_path) if db_path else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[QueryCacheResult]:
+        """Gets the results cached for a key, or None if they are missing or expired."""
+        entry = self._entries.get(key)
+        from_disk = False
+        if entry is None and self._store is not None:
+            entry = self._store.get(key)
+            from_disk = entry is not None
+
+        if entry is not None and self._is_expired(entry):
+            self.metrics.expirations += 1
+            self._discard(key)
+            entry = None
+        if entry is None:
+            self.metrics.misses += 1
+            return None
+
+        self.metrics.hits += 1
+        if from_disk:
+            self.metrics.disk_hits += 1
+            self._put_in_memory(key, entry)
+        else:
+            self._entries.move_to_end(key)
+        return list(entry.results)
+
+    def put(self, key: str, results: QueryCacheResult) -> None:
+        """Caches the results of a key, evicting the least recently used entries if full."""
+        entry = _QueryCacheEntry(time.time(), list(results))
+        self._put_in_memory(key, entry)
+        if self._store is not None:
+            self._store.put(key, entry, self.max_size)
+
+    def invalidate(self) -> None:
+        """Discards every cached entry, in memory and on disk."""
+        self._entries.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def _put_in_memory(self, key: str, entry: _QueryCacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._store is not None:
+            self._store.discard(key)
+
+    def _is_expired(self, entry: _QueryCacheEntry) -> bool:
+        return self.ttl is not None and time.time() - entry.created_at > self.ttl
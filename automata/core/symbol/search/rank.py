@@ -1,11 +1,43 @@
-from typing import Dict, Hashable, List, Optional, Tuple
+import hashlib
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import networkx as nx
+import numpy as np
 from networkx.exception import NetworkXError
 from pydantic import BaseModel
+from scipy import sparse
 
 from automata.core.symbol.symbol_types import Symbol
 
+# The number of power iterations between two Aitken extrapolations of a query
+AITKEN_EXTRAPOLATION_INTERVAL = 10
+
+
+class SymbolRankEngine(Enum):
+    """
+    The algorithms which can compute SymbolRank.
+
+    POWER_ITERATION iterates on the ranks of every symbol until they converge. PUSH computes
+    approximate ranks by pushing the residual similarity mass of each symbol along its out
+    edges, and only touches the symbols which still hold a significant residual, which is
+    cheaper on large graphs when the similarity is concentrated on a few symbols.
+    """
+
+    POWER_ITERATION = "power_iteration"
+    PUSH = "push"
+
 
 class SymbolRankConfig(BaseModel):
     """A configuration class for SymbolRank"""
@@ -14,12 +46,20 @@ class SymbolRankConfig(BaseModel):
     max_iterations: int = 100
     tolerance: float = 1.0e-6
     weight_key: str = "weight"
+    # Start each query from the query independent rank of the graph, rather than a uniform rank
+    warm_start: bool = False
+    # Periodically apply Aitken's delta-squared extrapolation to the iterates of each query
+    aitken_extrapolation: bool = False
+    engine: SymbolRankEngine = SymbolRankEngine.POWER_ITERATION
+    # The bound on the L1 error of the ranks computed by the PUSH engine
+    push_tolerance: float = 1.0e-4
 
     @staticmethod
     def validate_config(config) -> None:
         """
         Raises:
-            ValueError: If alpha is not in (0, 1), or tolerance is not in (1e-4, 1e-8).
+            ValueError: If alpha is not in (0, 1), tolerance is not in (1e-4, 1e-8),
+                or push_tolerance is not in (0, 1).
         """
         if not 0 < config.alpha < 1:
             raise ValueError(f"alpha must be in (0,1), but got {config.alpha}")
@@ -27,22 +67,102 @@ class SymbolRankConfig(BaseModel):
         if not 1.0e-8 < config.tolerance < 1.0e-4:
             raise ValueError(f"tolerance must be in (1e-4,1e-8), but got {config.tolerance}")
 
+        if not 0 < config.push_tolerance < 1:
+            raise ValueError(f"push_tolerance must be in (0,1), but got {config.push_tolerance}")
+
+
+@dataclass
+class SymbolRankStats:
+    """
+    The convergence telemetry of the ranks of a single query.
+
+    The elapsed time is the wall time of the whole call, which is shared by all the queries
+    of a batch.
+    """
+
+    iterations: int
+    residual: float
+    elapsed_time: float
+    converged: bool
+    warm_started: bool
+    extrapolations: int
+
+
+class _PreparedGraph(NamedTuple):
+    """The state of a graph which SymbolRank reuses across queries."""
+
+    nodes: List[Symbol]
+    transition_matrix: sparse.csr_matrix
+    # The transpose of the transition matrix, whose rows are the out edges of each node
+    source_transition_matrix: sparse.csr_matrix
+    dangling_mask: np.ndarray
+    # The node and edge counts of a mutable graph when it was prepared, or None if frozen
+    signature: Optional[Tuple[int, int]]
+
 
 class SymbolRank:
-    """Computes the PageRank algorithm on symbols in a graph"""
+    """
+    Computes the PageRank algorithm on symbols in a graph
+
+    The transition matrix of the graph is prepared once, so that each query only pays for
+    the personalized power iteration. Frozen graphs, such as the cached subgraphs of a
+    `SymbolGraph` and views of them, cannot change. The prepared state of a mutable graph
+    is rebuilt when its node or edge count changes, and `invalidate` must be called after
+    edits which preserve both.
+    """
 
-    def __init__(self, graph: nx.DiGraph, config: SymbolRankConfig) -> None:
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        config: SymbolRankConfig,
+        stats_callback: Optional[Callable[[SymbolRankStats], None]] = None,
+    ) -> None:
+        """
+        Args:
+            stats_callback: Called with the convergence telemetry of each ranked query,
+                which is also kept in `last_stats`
+        """
         if not config:
             config = SymbolRankConfig()
         self.graph = graph
         self.config = config
         self.config.validate_config(self.config)
+        self.stats_callback = stats_callback
+        self.last_stats: List[SymbolRankStats] = []
+        self._prepared: Optional[_PreparedGraph] = self._prepare_graph()
+        self._global_rank: Optional[Tuple[_PreparedGraph, np.ndarray]] = None
+        self._fingerprint: Optional[Tuple[_PreparedGraph, str]] = None
+
+    def invalidate(self) -> None:
+        """Discards the prepared state of the graph, which is rebuilt by the next query."""
+        self._prepared = None
+        self._global_rank = None
+        self._fingerprint = None
+
+    def get_fingerprint(self) -> str:
+        """
+        Gets a digest of the prepared graph and the config, which changes whenever the ranks
+        of a query could change, e.g. to key cached results.
+        """
+        prepared = self._get_prepared_graph()
+        if self._fingerprint is None or self._fingerprint[0] is not prepared:
+            digest = hashlib.sha256(self.config.json(sort_keys=True).encode())
+            digest.update("\n".join(map(repr, prepared.nodes)).encode())
+            for array in (
+                prepared.transition_matrix.indptr,
+                prepared.transition_matrix.indices,
+                prepared.transition_matrix.data,
+            ):
+                digest.update(array.tobytes())
+            self._fingerprint = (prepared, digest.hexdigest())
+        return self._fingerprint[1]
 
     def get_ranks(
         self,
         query_to_symbol_similarity: Optional[Dict[Symbol, float]] = None,
         initial_weights: Optional[Dict[Symbol, float]] = None,
         dangling: Optional[Dict[Symbol, float]] = None,
+        top_k: Optional[int] = None,
     ) -> List[Tuple[Symbol, float]]:
         # sourcery skip: inline-immediately-returned-variable, use-dict-items
         """
@@ -69,59 +189,345 @@ class SymbolRank:
         their  connectivity within the graph. This amalgamation of natural language processing,
         information retrieval, and graph theory methods results in a ranking of code symbols,
         significantly aiding tasks like code understanding, navigation, recommendation, and search.
+
+        If `top_k` is given, only the `top_k` highest ranked symbols are returned, which are
+        selected without sorting the ranks of every symbol.
+        """
+        return self.get_ranks_batch(
+            [query_to_symbol_similarity], initial_weights, dangling, top_k
+        )[0]
+
+    def get_ranks_batch(
+        self,
+        queries_to_symbol_similarity: Sequence[Optional[Dict[Symbol, float]]],
+        initial_weights: Optional[Dict[Symbol, float]] = None,
+        dangling: Optional[Dict[Symbol, float]] = None,
+        top_k: Optional[int] = None,
+    ) -> List[List[Tuple[Symbol, float]]]:
+        """
+        Calculate the SymbolRanks of each node in the graph for many queries at once.
+
+        The personalization vectors of the queries are stacked into the columns of a matrix,
+        so that each iteration is a single sparse matrix-dense matrix product. Each column
+        stops iterating once it has converged, so the results are those of `get_ranks`.
+
+        The PUSH engine approximates the ranks of each query separately, and does not use
+        initial weights. Its ranks sum to at least one minus the push tolerance.
+
+        Raises:
+            ValueError: If top_k is negative
+            NetworkXError: If a query does not converge, or its weights are missing nodes
+        """
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"top_k must be non-negative, but got {top_k}")
+        start_time = time.perf_counter()
+        prepared = self._get_prepared_graph()
+        node_count = len(prepared.nodes)
+        query_count = len(queries_to_symbol_similarity)
+        similarity_matrix = np.empty((node_count, query_count))
+        for column, query_to_symbol_similarity in enumerate(queries_to_symbol_similarity):
+            similarity_matrix[:, column] = self._prepare_query_to_symbol_similarity(
+                prepared, query_to_symbol_similarity
+            )
+        dangling_weights = self._prepare_dangling_weights(prepared, dangling)
+
+        if self.config.engine == SymbolRankEngine.PUSH:
+            warm_started = False
+            rank_matrix, iterations, residuals = self._push(
+                prepared, similarity_matrix, dangling_weights
+            )
+            extrapolations = np.zeros(query_count, dtype=np.int64)
+            converged = residuals <= self.config.push_tolerance
+        else:
+            warm_started = self.config.warm_start and initial_weights is None
+            initial_rank_vec = (
+                self._get_global_rank_vector(prepared)
+                if warm_started
+                else self._to_vector(
+                    prepared, self._prepare_initial_ranks(prepared.nodes, initial_weights)
+                )
+            )
+            rank_matrix, iterations, residuals, extrapolations = self._power_iterate(
+                prepared,
+                np.repeat(initial_rank_vec[:, np.newaxis], query_count, axis=1),
+                similarity_matrix,
+                dangling_weights,
+            )
+            converged = residuals < node_count * self.config.tolerance
+        elapsed_time = time.perf_counter() - start_time
+        self.last_stats = [
+            SymbolRankStats(
+                iterations=int(iterations[column]),
+                residual=float(residuals[column]),
+                elapsed_time=elapsed_time,
+                converged=bool(converged[column]),
+                warm_started=warm_started,
+                extrapolations=int(extrapolations[column]),
+            )
+            for column in range(query_count)
+        ]
+        if self.stats_callback is not None:
+            for stats in self.last_stats:
+                self.stats_callback(stats)
+        if not converged.all():
+            raise NetworkXError(
+                "SymbolRank: %s failed to converge in %d iterations."
+                % (self.config.engine.value.replace("_", " "), self.config.max_iterations)
+            )
+
+        results = []
+        for column in range(query_count):
+            order = self._get_rank_order(rank_matrix[:, column], top_k)
+            ranks = rank_matrix[order, column].tolist()
+            results.append(list(zip(map(prepared.nodes.__getitem__, order.tolist()), ranks)))
+        return results
+
+    @staticmethod
+    def _get_rank_order(ranks: np.ndarray, top_k: Optional[int]) -> np.ndarray:
         """
-        stochastic_graph = self._prepare_graph()
-        node_count = stochastic_graph.number_of_nodes()
+        Gets the indices of the `top_k` highest ranks, or of all the ranks, in descending order.
 
-        rank_vec = self._prepare_initial_ranks(stochastic_graph, initial_weights)
-        prepared_similarity = self._prepare_query_to_symbol_similarity(
-            node_count, stochastic_graph, query_to_symbol_similarity
+        A stable sort keeps tied nodes in the order of the graph. When only the top ranks are
+        needed, the candidates are first selected by a partition, and the ties at the k-th rank
+        are taken in the order of the graph, so the result is a prefix of the full order.
+        """
+        if top_k is None or top_k >= len(ranks):
+            return np.argsort(-ranks, kind="stable")
+        if top_k == 0:
+            return np.empty(0, dtype=np.intp)
+        kth_rank = -np.partition(-ranks, top_k - 1)[top_k - 1]
+        higher = np.flatnonzero(ranks > kth_rank)
+        tied = np.flatnonzero(ranks == kth_rank)[: top_k - len(higher)]
+        candidates = np.sort(np.concatenate((higher, tied)))
+        return candidates[np.argsort(-ranks[candidates], kind="stable")]
+
+    def _power_iterate(
+        self,
+        prepared: _PreparedGraph,
+        rank_matrix: np.ndarray,
+        similarity_matrix: np.ndarray,
+        dangling_weights: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Runs the power iteration on each column of the rank matrix in place, until it
+        converges or the maximum number of iterations is reached.
+
+        Returns:
+            The rank matrix, and the number of iterations, the final residual, and the number
+            of extrapolations of each column
+        """
+        node_count, query_count = rank_matrix.shape
+        # Without dangling weights, the rank of dangling nodes is spread like the similarity
+        dangling_matrix = (
+            similarity_matrix
+            if dangling_weights is None
+            else np.broadcast_to(dangling_weights[:, np.newaxis], similarity_matrix.shape)
         )
-        dangling_weights = self._prepare_dangling_weights(dangling, prepared_similarity)
-        dangling_nodes = self._get_dangling_nodes(stochastic_graph)
-
-        for _ in range(self.config.max_iterations):
-            last_rank_vec = rank_vec
-            rank_vec = {k: 0.0 for k in last_rank_vec.keys()}
-            danglesum = self.config.alpha * sum(last_rank_vec[node] for node in dangling_nodes)  # type: ignore
-            for node in rank_vec:
-                for nbr in stochastic_graph[node]:
-                    rank_vec[nbr] += (
-                        self.config.alpha
-                        * last_rank_vec[node]
-                        * stochastic_graph[node][nbr][self.config.weight_key]
+        iterations = np.zeros(query_count, dtype=np.int64)
+        residuals = np.full(query_count, np.inf)
+        extrapolations = np.zeros(query_count, dtype=np.int64)
+        # The queries which have not converged yet, as columns of the matrices
+        active = np.arange(query_count)
+        # The iterates of the active columns since their last extrapolation, oldest first
+        history: List[np.ndarray] = []
+        alpha = self.config.alpha
+        for iteration in range(1, self.config.max_iterations + 1):
+            if len(active) == 0:
+                break
+            last_rank_matrix = rank_matrix[:, active]
+            danglesum = alpha * last_rank_matrix[prepared.dangling_mask].sum(axis=0)
+            active_rank_matrix = (
+                alpha * (prepared.transition_matrix @ last_rank_matrix)
+                + danglesum * dangling_matrix[:, active]
+                + (1.0 - alpha) * similarity_matrix[:, active]
+            )
+            err = np.abs(active_rank_matrix - last_rank_matrix).sum(axis=0)
+            iterations[active] = iteration
+            residuals[active] = err
+            not_converged = err >= node_count * self.config.tolerance
+
+            if self.config.aitken_extrapolation:
+                if not history:
+                    history.append(last_rank_matrix)
+                if len(history) == AITKEN_EXTRAPOLATION_INTERVAL:
+                    extrapolated = self._aitken_extrapolate(
+                        history[-2], history[-1], active_rank_matrix
                     )
-                rank_vec[node] += (
-                    danglesum * dangling_weights[node]
-                    + (1.0 - self.config.alpha) * prepared_similarity[node]
-                )
+                    # Converged columns keep the result of the plain power iteration
+                    active_rank_matrix[:, not_converged] = extrapolated[:, not_converged]
+                    extrapolations[active[not_converged]] += 1
+                    history = []
+                else:
+                    history.append(active_rank_matrix)
+                history = [iterate[:, not_converged] for iterate in history]
 
-            err = sum(abs(rank_vec[node] - last_rank_vec[node]) for node in rank_vec)
-            if err < node_count * self.config.tolerance:
-                sorted_dict = sorted(rank_vec.items(), key=lambda x: x[1], reverse=True)
-                return sorted_dict
+            rank_matrix[:, active] = active_rank_matrix
+            active = active[not_converged]
+        return rank_matrix, iterations, residuals, extrapolations
+
+    def _push(
+        self,
+        prepared: _PreparedGraph,
+        similarity_matrix: np.ndarray,
+        dangling_weights: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Approximates the ranks of each column of the similarity matrix by forward push.
 
-        raise NetworkXError(
-            "SymbolRank: power iteration failed to converge in %d iterations."
-            % self.config.max_iterations
+        Each query starts with its similarity as the residual mass of the symbols. Pushing a
+        symbol settles a share of 1 - alpha of its residual into its rank, and moves the rest
+        along its out edges, or to the dangling weights if it has none. The true ranks are the
+        settled ranks plus the ranks of the remaining residual, whose total mass bounds the
+        L1 error, so each round pushes every symbol holding more than its share of the push
+        tolerance until the remaining mass is within it.
+
+        Returns:
+            The rank matrix, and the number of push rounds and the remaining residual mass
+            of each column
+        """
+        node_count, query_count = similarity_matrix.shape
+        rank_matrix = np.zeros_like(similarity_matrix)
+        iterations = np.zeros(query_count, dtype=np.int64)
+        residuals = np.zeros(query_count)
+        threshold = self.config.push_tolerance / max(node_count, 1)
+        alpha = self.config.alpha
+        for column in range(query_count):
+            similarity = similarity_matrix[:, column]
+            dangling_vec = similarity if dangling_weights is None else dangling_weights
+            rank_vec = rank_matrix[:, column]
+            residual = similarity.copy()
+            for _ in range(self.config.max_iterations):
+                if residual.sum() <= self.config.push_tolerance:
+                    break
+                iterations[column] += 1
+                frontier = np.flatnonzero(residual > threshold)
+                pushed = residual[frontier]
+                residual[frontier] = 0.0
+                rank_vec[frontier] += (1.0 - alpha) * pushed
+                residual += alpha * (prepared.source_transition_matrix[frontier].T @ pushed)
+                dangling_mass = alpha * pushed[prepared.dangling_mask[frontier]].sum()
+                if dangling_mass > 0.0:
+                    residual += dangling_mass * dangling_vec
+            residuals[column] = residual.sum()
+        return rank_matrix, iterations, residuals
+
+    @staticmethod
+    def _aitken_extrapolate(
+        first: np.ndarray, second: np.ndarray, third: np.ndarray
+    ) -> np.ndarray:
+        """
+        Applies the vector form of Aitken's delta-squared process to three consecutive
+        iterates of each column. The ratio of successive differences estimates how fast the
+        error contracts, and the remaining geometric series of differences is added at once.
+
+        Applying the process to each entry separately is unstable when the differences of
+        an entry change sign, so a single ratio is estimated for each column. Columns whose
+        ratio is not in (0, 1) are not contracting geometrically, and keep their latest value.
+        """
+        first_difference = second - first
+        second_difference = third - second
+        ratio = np.divide(
+            (second_difference * first_difference).sum(axis=0),
+            (first_difference * first_difference).sum(axis=0),
+            out=np.zeros(third.shape[1]),
+            where=(first_difference != 0.0).any(axis=0),
         )
+        ratio[(ratio <= 0.0) | (ratio >= 1.0)] = 0.0
+        extrapolated = third + second_difference * (ratio / (1.0 - ratio))
+        np.clip(extrapolated, 0.0, None, out=extrapolated)
+        # The ranks of each query sum to one, which extrapolation preserves up to the clipping
+        return extrapolated / extrapolated.sum(axis=0)
+
+    def _get_global_rank_vector(self, prepared: _PreparedGraph) -> np.ndarray:
+        """
+        Gets the query independent SymbolRank of the graph, with a uniform similarity,
+        which is computed once for each prepared state of the graph.
+        """
+        if self._global_rank is None or self._global_rank[0] is not prepared:
+            node_count = len(prepared.nodes)
+            rank_matrix, _, residuals, _ = self._power_iterate(
+                prepared,
+                np.full((node_count, 1), 1.0 / max(node_count, 1)),
+                self._prepare_query_to_symbol_similarity(prepared, None)[:, np.newaxis],
+                None,
+            )
+            if residuals[0] >= node_count * self.config.tolerance:
+                raise NetworkXError(
+                    "SymbolRank: power iteration failed to converge in %d iterations."
+                    % self.config.max_iterations
+                )
+            self._global_rank = (prepared, rank_matrix[:, 0])
+        return self._global_rank[1]
+
+    def _get_prepared_graph(self) -> _PreparedGraph:
+        """Gets the prepared state of the graph, preparing it again if the graph has changed."""
+        if self._prepared is None or (
+            self._prepared.signature is not None
+            and self._prepared.signature != self._get_graph_signature()
+        ):
+            self._prepared = self._prepare_graph()
+        return self._prepared
+
+    def _get_graph_signature(self) -> Optional[Tuple[int, int]]:
+        """
+        Gets the node and edge counts of the graph, or None if it can never change.
+
+        Views, e.g. from `graph.subgraph`, are always frozen, but they follow the edits of
+        the graph they view, so they are only unchanging if that graph is frozen too.
+        """
+        graph = self.graph
+        while nx.is_frozen(graph) and isinstance(getattr(graph, "_graph", None), nx.Graph):
+            graph = graph._graph
+        if nx.is_frozen(graph):
+            return None
+        return self.graph.number_of_nodes(), self.graph.number_of_edges()
 
-    def _prepare_graph(self) -> nx.DiGraph:
+    def _prepare_graph(self) -> _PreparedGraph:
         """
         Prepare the graph for the SymbolRank algorithm. If the graph is not directed,
-        convert it to a directed graph, then create a stochastic graph from the directed graph.
+        it is converted to a directed graph. The entry (i, j) of the matrix is the weight of the
+        edge from node j to node i, divided by the out degree of node j, so that each iteration is
+        a single sparse matrix-vector product. Nodes without out edges are marked as dangling.
         """
         if not self.graph.is_directed():
             directed_graph = self.graph.to_directed()
         else:
             directed_graph = self.graph
 
-        stochastic_graph = nx.stochastic_graph(directed_graph, weight=self.config.weight_key)
-        return stochastic_graph
+        nodes = list(directed_graph)
+        node_ids = {node: i for i, node in enumerate(nodes)}
+        sources, targets, weights = [], [], []
+        for source, target, weight in directed_graph.edges(
+            data=self.config.weight_key, default=1.0
+        ):
+            sources.append(node_ids[source])
+            targets.append(node_ids[target])
+            weights.append(weight)
+
+        adjacency = sparse.csr_matrix(
+            (np.array(weights, dtype=np.float64), (sources, targets)),
+            shape=(len(nodes), len(nodes)),
+        )
+        out_degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+        dangling_mask = out_degrees == 0.0
+        scale = np.divide(1.0, out_degrees, out=np.zeros_like(out_degrees), where=~dangling_mask)
+        source_transition_matrix = (sparse.diags(scale) @ adjacency).tocsr()
+        return _PreparedGraph(
+            nodes,
+            source_transition_matrix.T.tocsr(),
+            source_transition_matrix,
+            dangling_mask,
+            self._get_graph_signature(),
+        )
+
+    @staticmethod
+    def _to_vector(prepared: _PreparedGraph, weights: Dict[Symbol, float]) -> np.ndarray:
+        """Converts a dictionary of weights to a vector in the order of the prepared nodes."""
+        return np.array([weights.get(node, 0.0) for node in prepared.nodes], dtype=np.float64)
 
     def _prepare_initial_ranks(
         self,
-        stochastic_graph: nx.DiGraph,
+        nodes: Collection[Symbol],
         initial_weights: Optional[Dict[Symbol, float]],
     ) -> Dict[Symbol, float]:
         """
@@ -129,20 +535,19 @@ class SymbolRank:
         If initial weights are not provided, set the initial rank value for each node to 1/n.
         """
 
-        node_count = stochastic_graph.number_of_nodes()
+        node_count = len(nodes)
         if initial_weights is None:
-            return {k: 1.0 / node_count for k in stochastic_graph}
+            return {k: 1.0 / node_count for k in nodes}
         s = sum(initial_weights.values())
         return {k: v / s for k, v in initial_weights.items()}
 
     def _prepare_query_to_symbol_similarity(
         self,
-        node_count: int,
-        stochastic_graph: nx.DiGraph,
+        prepared: _PreparedGraph,
         query_to_symbol_similarity: Optional[Dict[Symbol, float]],
-    ) -> Dict[Symbol, float]:
+    ) -> np.ndarray:
         """
-        Prepare the similarity input dictionary for the SymbolRank algorithm.
+        Prepare the similarity input vector for the SymbolRank algorithm.
 
         Raises:
             NetworkXError: If the query_to_symbol_similarity dictionary does not have a value for every node
@@ -154,34 +559,38 @@ class SymbolRank:
             the modification of the rank computation based on symbol source-code similarity
 
         """
+        node_count = len(prepared.nodes)
         if query_to_symbol_similarity is None:
-            return {k: 1.0 / node_count for k in stochastic_graph}
-        missing = set(self.graph) - set(query_to_symbol_similarity)
-        if missing:
-            raise NetworkXError(
-                f"query_to_symbol_similarity dictionary must have a value for every node. Missing nodes {missing}"
-            )
-        s = sum(query_to_symbol_similarity.values())
-        return {k: v / s for k, v in query_to_symbol_similarity.items()}
+            return np.full(node_count, 1.0 / max(node_count, 1))
+        return self._to_normalized_vector(
+            prepared, query_to_symbol_similarity, "query_to_symbol_similarity dictionary"
+        )
 
     def _prepare_dangling_weights(
         self,
+        prepared: _PreparedGraph,
         dangling: Optional[Dict[Symbol, float]],
-        query_to_symbol_similarity: Dict[Symbol, float],
-    ) -> Dict[Symbol, float]:
+    ) -> Optional[np.ndarray]:
         if dangling is None:
-            return query_to_symbol_similarity
-        missing = set(self.graph) - set(dangling)
-        if missing:
+            return None
+        return self._to_normalized_vector(prepared, dangling, "Dangling node dictionary")
+
+    @staticmethod
+    def _to_normalized_vector(
+        prepared: _PreparedGraph, weights: Dict[Symbol, float], name: str
+    ) -> np.ndarray:
+        """
+        Converts a dictionary of weights to a vector in the order of the prepared nodes,
+        normalized by the sum of the weights.
+
+        Raises:
+            NetworkXError: If the dictionary does not have a value for every node
+        """
+        try:
+            values = np.array([weights[node] for node in prepared.nodes], dtype=np.float64)
+        except KeyError:
+            missing = set(prepared.nodes) - set(weights)
             raise NetworkXError(
-                f"Dangling node dictionary must have a value for every node. Missing nodes {missing}"
+                f"{name} must have a value for every node. Missing nodes {missing}"
             )
-        s = sum(dangling.values())
-        return {k: v / s for k, v in dangling.items()}
-
-    def _get_dangling_nodes(self, stochastic_graph: nx.DiGraph) -> List[Hashable]:
-        return [
-            node
-            for node in stochastic_graph
-            if stochastic_graph.out_degree(node, weight=self.config.weight_key) == 0.0
-        ]
+        return values / sum(weights.values())
@@ -1,5 +1,7 @@
+import hashlib
+import os
 from copy import deepcopy
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, cast
 
 import networkx as nx
 import numpy as np
@@ -8,6 +10,7 @@ from automata.core.coding.py.module_loader import py_module_loader
 from automata.core.embedding.symbol_similarity import SymbolSimilarityCalculator
 from automata.core.symbol.graph import SymbolGraph
 from automata.core.symbol.parser import parse_symbol
+from automata.core.symbol.search.query_cache import SymbolSearchQueryCache
 from automata.core.symbol.search.rank import SymbolRank, SymbolRankConfig
 from automata.core.symbol.symbol_types import Symbol, SymbolReference
 from automata.core.symbol.symbol_utils import convert_to_fst_object
@@ -27,8 +30,15 @@ class SymbolSearch:
         symbol_code_similarity: SymbolSimilarityCalculator,
         symbol_rank_config: SymbolRankConfig,
         code_subgraph: SymbolGraph.SubGraph,
+        query_cache: Optional[SymbolSearchQueryCache] = None,
     ) -> None:
         """
+        Args:
+            query_cache: Caches the results of SymbolRank searches, which are keyed by a digest
+                of the ranked graph and the code embeddings. Changes to the graph, and to the
+                file of the embedding database, are detected, but `invalidate_query_cache` must
+                be called after embeddings which are not backed by a file change.
+
         Raises:
             ValueError: If the code_subgraph is not a subgraph of the symbol_graph
         TODO - We should modify SymbolSearch to receive a completed instance of SymbolRank.
@@ -40,21 +50,58 @@ class SymbolSearch:
         graph_symbols = symbol_graph.get_all_available_symbols()
         embedding_symbols = symbol_code_similarity.embedding_handler.get_all_supported_symbols()
         available_symbols = set(graph_symbols).intersection(set(embedding_symbols))
-        SymbolSearch.filter_graph(code_subgraph.graph, available_symbols)
+        # The subgraph is shared with other consumers, so it is filtered through a view
+        filtered_graph = code_subgraph.graph.subgraph(available_symbols)
 
         # TODO - Do we need to filter the SymbolGraph as well?
         self.symbol_graph = symbol_graph
         self.symbol_code_similarity = symbol_code_similarity
         symbol_code_similarity.set_available_symbols(available_symbols)
-        self.symbol_rank = SymbolRank(code_subgraph.graph, config=symbol_rank_config)
+        self.symbol_rank = SymbolRank(filtered_graph, config=symbol_rank_config)
+        self.query_cache = query_cache
+        self._embedding_fingerprint: Optional[str] = None
+        self._query_cache_fingerprint: Optional[str] = None
 
-    def symbol_rank_search(self, query: str) -> SymbolRankResult:
-        """Fetches the list of the SymbolRank similar symbols ordered by rank."""
-        query_vec = self.symbol_code_similarity.calculate_query_similarity_dict(query)
-        transformed_query_vec = SymbolSearch.transform_dict_values(
-            query_vec, SymbolSearch.shifted_z_score_powered
+    def symbol_rank_search(self, query: str, top_k: Optional[int] = None) -> SymbolRankResult:
+        """
+        Fetches the list of the SymbolRank similar symbols ordered by rank,
+        which is limited to the `top_k` highest ranked symbols if given.
+        """
+        return self.symbol_rank_search_batch([query], top_k=top_k)[0]
+
+    def symbol_rank_search_batch(
+        self, queries: List[str], top_k: Optional[int] = None
+    ) -> List[SymbolRankResult]:
+        """
+        Fetches the SymbolRank similar symbols of many queries, which are ranked together.
+
+        Each query is still embedded separately, but the power iterations of all the queries
+        are computed as one batch, which is far cheaper than ranking them one at a time.
+        Queries whose results are in the query cache are neither embedded nor ranked.
+        """
+        if self.query_cache is None:
+            return self.symbol_rank.get_ranks_batch(
+                [self._get_transformed_query_vec(query) for query in queries], top_k=top_k
+            )
+
+        fingerprint = self._get_query_cache_fingerprint(self.query_cache)
+        cache_keys = [f"{fingerprint}:{top_k}:{query}" for query in queries]
+        results = [self.query_cache.get(cache_key) for cache_key in cache_keys]
+        missing_indices = [i for i, result in enumerate(results) if result is None]
+        ranked_results = self.symbol_rank.get_ranks_batch(
+            [self._get_transformed_query_vec(queries[i]) for i in missing_indices], top_k=top_k
         )
-        return self.symbol_rank.get_ranks(query_to_symbol_similarity=transformed_query_vec)
+        for i, result in zip(missing_indices, ranked_results):
+            self.query_cache.put(cache_keys[i], result)
+            results[i] = result
+        return cast(List[SymbolRankResult], results)
+
+    def invalidate_query_cache(self) -> None:
+        """Discards the cached search results, e.g. after the code embeddings have changed."""
+        self._embedding_fingerprint = None
+        self._query_cache_fingerprint = None
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
 
     def symbol_references(self, symbol_uri: str) -> SymbolReferencesResult:
         """
@@ -102,6 +149,59 @@ class SymbolSearch:
         else:
             raise ValueError(f"Unknown search type: {search_type}")
 
+    def _get_transformed_query_vec(self, query: str) -> Dict[Symbol, float]:
+        query_vec = self.symbol_code_similarity.calculate_query_similarity_dict(query)
+        return SymbolSearch.transform_dict_values(query_vec, SymbolSearch.shifted_z_score_powered)
+
+    def _get_query_cache_fingerprint(self, query_cache: SymbolSearchQueryCache) -> str:
+        """
+        Gets a digest of the ranked graph and the code embeddings, which prefixes the keys of
+        the query cache. The cache is invalidated when the digest changes.
+        """
+        fingerprint = hashlib.sha256(
+            f"{self.symbol_rank.get_fingerprint()}:{self._get_embedding_fingerprint()}".encode()
+        ).hexdigest()
+        if self._query_cache_fingerprint not in (None, fingerprint):
+            query_cache.invalidate()
+        self._query_cache_fingerprint = fingerprint
+        return fingerprint
+
+    def _get_embedding_fingerprint(self) -> str:
+        """
+        Gets a digest of the code embeddings and how queries are compared to them.
+
+        If the embeddings are stored in a file, its modification time and size stand in for
+        the embeddings, so that a database rebuilt by another process is detected on every
+        lookup. Otherwise the embeddings are hashed once, until `invalidate_query_cache`.
+        """
+        similarity = self.symbol_code_similarity
+        provider = similarity.embedding_provider
+        digest = hashlib.sha256(
+            f"{type(provider).__name__}:{getattr(provider, 'engine', '')}:{similarity.norm_type}".encode()
+        )
+        embedding_db = getattr(similarity.embedding_handler, "embedding_db", None)
+        db_path = getattr(embedding_db, "file_path", None)
+        if isinstance(db_path, str):
+            try:
+                stat = os.stat(db_path)
+            except OSError:
+                pass
+            else:
+                digest.update(
+                    f"{os.path.abspath(db_path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+                )
+                return digest.hexdigest()
+
+        if self._embedding_fingerprint is None:
+            digest.update(
+                "\n".join(symbol.uri for symbol in similarity.index_to_symbol.values()).encode()
+            )
+            digest.update(
+                np.ascontiguousarray(similarity.ordered_embeddings, dtype=np.float64).tobytes()
+            )
+            self._embedding_fingerprint = digest.hexdigest()
+        return self._embedding_fingerprint
+
     def _find_pattern_in_modules(self, pattern: str) -> Dict[str, List[int]]:
         """Finds exact line matches for a given pattern string in all modules."""
         matches = {}
@@ -115,7 +215,11 @@ class SymbolSearch:
 
     @staticmethod
     def filter_graph(graph: nx.DiGraph, available_symbols: Set[Symbol]) -> None:
-        """Filters a graph to only contain nodes that are in the available_symbols set."""
+        """
+        Filters a graph in place to only contain nodes that are in the available_symbols set.
+
+        Note - Cached subgraphs are frozen, use `graph.subgraph(available_symbols)` to filter them.
+        """
         graph_nodes = deepcopy(graph.nodes())
         for symbol in graph_nodes:
             if symbol not in available_symbols:
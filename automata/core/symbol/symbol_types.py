@@ -1,17 +1,56 @@
 import abc
 import re
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError, dataclass
 from enum import Enum
-from typing import Any, Dict, Optional, Tuple
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 import numpy as np
 
 from automata.core.symbol.scip_pb2 import Descriptor as DescriptorProto  # type: ignore
 
+T = TypeVar("T")
 
-class SymbolDescriptor:
+
+class _ImmutableSlots:
+    """
+    A base for the slotted, immutable symbol types.
+
+    The public slots of a subclass hold its state, while its private slots lazily
+    cache values derived from that state and are left out when it is pickled.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+def _cached_slot(method: Callable[[Any], T]) -> Callable[[Any], T]:
+    """Caches the result of a method of an `_ImmutableSlots` in the slot `_<method name>`."""
+    slot = f"_{method.__name__}"
+
+    @wraps(method)
+    def wrapper(self: Any) -> T:
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            value = method(self)
+            object.__setattr__(self, slot, value)
+            return value
+
+    return wrapper
+
+
+class SymbolDescriptor(_ImmutableSlots):
     """A class to represent the description component of a Symbol URI."""
 
+    __slots__ = ("name", "suffix", "disambiguator")
+
     ScipSuffix = DescriptorProto
 
     class PyKind(Enum):
@@ -25,12 +64,19 @@ class SymbolDescriptor:
         Parameter = "parameter"
         TypeParameter = "type_parameter"
 
+    name: str
+    suffix: DescriptorProto
+    disambiguator: Optional[str]
+
     def __init__(
         self, name: str, suffix: DescriptorProto, disambiguator: Optional[str] = None
     ) -> None:
-        self.name = name
-        self.suffix = suffix
-        self.disambiguator = disambiguator
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "suffix", suffix)
+        object.__setattr__(self, "disambiguator", disambiguator)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
 
     def __repr__(self) -> str:
         return f"Descriptor({self.name}, {self.suffix}" + (
@@ -100,10 +146,12 @@ class SymbolDescriptor:
             return SymbolDescriptor.PyKind.Meta
 
 
-@dataclass
-class SymbolPackage:
+@dataclass(frozen=True)
+class SymbolPackage(_ImmutableSlots):
     """A class to represent the package component of a Symbol URI."""
 
+    __slots__ = ("manager", "name", "version")
+
     manager: str
     name: str
     version: str
@@ -116,8 +164,8 @@ class SymbolPackage:
         return f"{self.manager} {self.name} {self.version}"
 
 
-@dataclass
-class Symbol:
+@dataclass(frozen=True)
+class Symbol(_ImmutableSlots):
     """
     A class which contains associated logic for a Symbol.
 
@@ -160,6 +208,16 @@ class Symbol:
     )
     """
 
+    __slots__ = (
+        "uri",
+        "scheme",
+        "package",
+        "descriptors",
+        "_dotpath",
+        "_module_name",
+        "_symbol_kind_by_suffix",
+    )
+
     uri: str
     scheme: str
     package: SymbolPackage
@@ -178,6 +236,7 @@ class Symbol:
             return self.uri == other
         return False
 
+    @_cached_slot
     def symbol_kind_by_suffix(self) -> SymbolDescriptor.PyKind:
         """Converts the suffix of the URI into a PyKind."""
         return SymbolDescriptor.convert_scip_to_python_suffix(self.symbol_raw_kind_by_suffix())
@@ -209,11 +268,13 @@ class Symbol:
         return Symbol(self.uri, self.scheme, self.package, tuple(parent_descriptors))
 
     @property
+    @_cached_slot
     def dotpath(self) -> str:
         """Returns the dotpath of the symbol."""
         return ".".join([ele.name for ele in self.descriptors])
 
     @property
+    @_cached_slot
     def module_name(self) -> str:
         """Returns the module name of the symbol."""
         return self.descriptors[0].name
@@ -253,10 +314,12 @@ class Symbol:
         return parse_symbol(uri)
 
 
-@dataclass
-class SymbolReference:
+@dataclass(frozen=True)
+class SymbolReference(_ImmutableSlots):
     """Represents a reference to a symbol in a file"""
 
+    __slots__ = ("symbol", "line_number", "column_number", "roles", "_hash")
+
     symbol: Symbol
     line_number: int
     column_number: int
@@ -264,21 +327,28 @@ class SymbolReference:
 
     def __hash__(self) -> int:
         # This could cause collisions if the same symbol is referenced in different files at the same location
-        return hash(f"{self.symbol.uri}-{self.line_number}-{self.column_number}")
+        hash_value = getattr(self, "_hash", None)
+        if hash_value is None:
+            hash_value = hash((self.symbol.uri, self.line_number, self.column_number))
+            object.__setattr__(self, "_hash", hash_value)
+        return hash_value
 
     def __eq__(self, other) -> bool:
         if isinstance(other, SymbolReference):
             return (
-                f"{self.symbol.uri}-{self.line_number}-{self.column_number}"
-                == f"{other.symbol.uri}-{other.line_number}-{other.column_number}"
+                self.line_number == other.line_number
+                and self.column_number == other.column_number
+                and self.symbol.uri == other.symbol.uri
             )
         return False
 
 
-@dataclass
-class SymbolFile:
+@dataclass(frozen=True)
+class SymbolFile(_ImmutableSlots):
     """Represents a file that contains a symbol"""
 
+    __slots__ = ("path", "occurrences")
+
     path: str
     occurrences: str
 
@@ -0,0 +1,15 @@
+import pytest
+
+from automata.core.coding.py.module_loader import py_module_loader
+from automata.core.utils import get_root_fpath, get_root_py_fpath
+
+
+@pytest.fixture
+def module_loader():
+    py_module_loader.initialize(get_root_fpath(), get_root_py_fpath())
+    yield py_module_loader
+    py_module_loader._dotpath_map = None
+    py_module_loader._loaded_modules.clear()
+    py_module_loader.initialized = False
+    py_module_loader.py_fpath = None
+    py_module_loader.root_fpath = None
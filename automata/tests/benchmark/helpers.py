@@ -0,0 +1,13 @@
+import os
+import timeit
+from typing import Any, Callable
+
+from automata.config.base import ConfigCategory
+from automata.core.utils import get_config_fpath
+
+INDEX_PATH = os.path.join(get_config_fpath(), ConfigCategory.SYMBOL.value, "index.scip")
+
+
+def best_of(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Returns the fastest of `repeat` timed calls of func, in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
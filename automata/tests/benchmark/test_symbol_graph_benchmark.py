@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from automata.core.symbol.compact_graph import CompactGraphBuilder, build_compact_shard
+from automata.core.symbol.graph import GraphBuilder, SymbolGraph, SymbolGraphBackend
+from automata.core.symbol.parser import clear_parse_symbol_cache
+from automata.core.symbol.scip_reader import ScipIndexReader
+from automata.tests.benchmark.helpers import INDEX_PATH, best_of
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("builder_class", [GraphBuilder, CompactGraphBuilder])
+def test_graph_build_benchmark(builder_class):
+    index = ScipIndexReader(INDEX_PATH)
+
+    def build():
+        clear_parse_symbol_cache()
+        return builder_class(index).build_graph()
+
+    build_time = best_of(build)
+    print(f"\n{builder_class.__name__} built the bundled index in {build_time:.3f}s")
+
+
+@pytest.mark.benchmark
+def test_parallel_compact_graph_build_benchmark():
+    index = ScipIndexReader(INDEX_PATH)
+
+    def build(parallel):
+        clear_parse_symbol_cache()
+        return CompactGraphBuilder(index, parallel=parallel).build_graph()
+
+    serial_time = best_of(lambda: build(False))
+    parallel_time = best_of(lambda: build(True))
+
+    # The parent only merges the shards, which bounds the speedup of a parallel build
+    shards = CompactGraphBuilder._partition_documents(index)
+    shard_results = [build_compact_shard(INDEX_PATH, shard) for shard in shards]
+
+    def merge():
+        builder = CompactGraphBuilder(index)
+        for shard_result in shard_results:
+            builder._merge_shard(shard_result)
+        return builder._create_graph()
+
+    merge_time = best_of(merge)
+    print(
+        f"\nCompactGraphBuilder built the bundled index in {serial_time:.3f}s serially, and in "
+        f"{parallel_time:.3f}s with {len(shards)} shards on {os.cpu_count()} cpus, of which "
+        f"merging in the parent takes {merge_time:.3f}s"
+    )
+    assert merge_time < 0.25 * serial_time
+    if (os.cpu_count() or 1) >= 4:
+        assert parallel_time < serial_time
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("backend", list(SymbolGraphBackend))
+def test_rankable_subgraph_benchmark(module_loader, backend):
+    graph = SymbolGraph(INDEX_PATH, backend=backend)
+    # The bounding boxes are computed once and reused by every build
+    graph.navigator._pre_compute_rankable_bounding_boxes()
+
+    subgraph_time = best_of(graph.get_rankable_symbol_dependency_subgraph)
+    matrix_time = best_of(graph.get_rankable_symbol_dependency_matrix)
+    print(
+        f"\nBuilt the rankable subgraph of the {backend.value} graph in {subgraph_time:.3f}s, "
+        f"and its adjacency matrix in {matrix_time:.3f}s"
+    )
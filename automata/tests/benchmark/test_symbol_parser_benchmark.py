@@ -0,0 +1,45 @@
+import pytest
+
+from automata.core.symbol.parser import (
+    _FastSymbolParser,
+    _parse_symbol_general,
+    clear_parse_symbol_cache,
+    parse_symbols,
+)
+from automata.core.symbol.scip_reader import ScipIndexReader
+from automata.tests.benchmark.helpers import INDEX_PATH, best_of
+
+
+@pytest.fixture(scope="module")
+def index_uris():
+    """Every symbol URI which occurs in the bundled index, with repetitions."""
+    return [
+        occurrence.symbol
+        for document in ScipIndexReader(INDEX_PATH).documents
+        for occurrence in document.occurrences
+    ]
+
+
+@pytest.mark.benchmark
+def test_fast_parser_benchmark(index_uris):
+    distinct_uris = sorted(set(index_uris))
+
+    general_time = best_of(lambda: [_parse_symbol_general(uri) for uri in distinct_uris])
+    fast_time = best_of(
+        lambda: [
+            _FastSymbolParser.parse(uri) or _parse_symbol_general(uri) for uri in distinct_uris
+        ]
+    )
+
+    def parse_batch():
+        clear_parse_symbol_cache()
+        return parse_symbols(index_uris)
+
+    batch_time = best_of(parse_batch)
+
+    print(
+        f"\nParsed {len(distinct_uris)} distinct URIs ({len(index_uris)} occurrences): "
+        f"general parser {general_time:.3f}s, fast parser {fast_time:.3f}s, "
+        f"parse_symbols over all occurrences {batch_time:.3f}s"
+    )
+    assert fast_time < general_time
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from automata.core.symbol.graph import SymbolGraph
+from automata.core.symbol.search.rank import SymbolRank, SymbolRankConfig
+from automata.tests.benchmark.helpers import INDEX_PATH, best_of
+
+
+@pytest.mark.benchmark
+def test_symbol_rank_benchmark(module_loader):
+    graph = SymbolGraph(INDEX_PATH).get_rankable_symbol_dependency_subgraph().graph
+    random.seed(0)
+    similarity = {node: random.random() for node in graph}
+
+    construction_time = best_of(lambda: SymbolRank(graph, SymbolRankConfig()))
+    symbol_rank = SymbolRank(graph, SymbolRankConfig())
+    rank_time = best_of(lambda: symbol_rank.get_ranks(query_to_symbol_similarity=similarity))
+    print(
+        f"\nPrepared SymbolRank for {graph.number_of_nodes()} symbols in {construction_time:.4f}s, "
+        f"and ranked them in {rank_time:.4f}s"
+    )
+
+
+@pytest.mark.benchmark
+def test_symbol_rank_batch_benchmark(module_loader):
+    graph = SymbolGraph(INDEX_PATH).get_rankable_symbol_dependency_subgraph().graph
+    random.seed(0)
+    similarities = [{node: random.random() for node in graph} for _ in range(200)]
+
+    symbol_rank = SymbolRank(graph, SymbolRankConfig())
+    serial_time = best_of(
+        lambda: [symbol_rank.get_ranks(query_to_symbol_similarity=s) for s in similarities],
+        repeat=3,
+    )
+    batch_time = best_of(lambda: symbol_rank.get_ranks_batch(similarities), repeat=3)
+    print(
+        f"\nRanked {len(similarities)} queries one at a time in {serial_time:.4f}s, "
+        f"and as a batch in {batch_time:.4f}s"
+    )
@@ -119,7 +119,8 @@ def symbol_search(mocker, symbol_graph_mock):
     """Creates a SymbolSearch object with Mock dependencies for testing"""
     symbol_similarity_mock = mocker.MagicMock(spec=SymbolSimilarityCalculator)
     symbol_similarity_mock.embedding_handler = mocker.MagicMock(spec=SymbolCodeEmbeddingHandler)
-    symbol_rank_config_mock = mocker.MagicMock(spec=SymbolRankConfig)
+    # SymbolRank prepares its transition matrix on construction, which reads the config
+    symbol_rank_config = SymbolRankConfig()
     code_subgraph_mock = mocker.MagicMock(spec=SymbolGraph.SubGraph)
     code_subgraph_mock.parent = symbol_graph_mock
     code_subgraph_mock.graph = mocker.MagicMock()
@@ -127,7 +128,7 @@ def symbol_search(mocker, symbol_graph_mock):
     return SymbolSearch(
         symbol_graph_mock,
         symbol_similarity_mock,
-        symbol_rank_config_mock,
+        symbol_rank_config,
         code_subgraph_mock,
     )
 
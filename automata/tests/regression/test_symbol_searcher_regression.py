@@ -1,5 +1,10 @@
 import pytest
 
+from automata.core.symbol.search.rank import (
+    SymbolRank,
+    SymbolRankConfig,
+    SymbolRankEngine,
+)
 from automata.tests.utils.factories import symbol_search_live  # noqa
 
 
@@ -80,6 +85,19 @@ def test_symbol_rank_search_on_symbol(symbol_search_live):  # noqa
         check_hits(expected_in_top_hits, found_top_hits)
 
 
+@pytest.mark.regression
+def test_symbol_rank_search_on_symbol_with_push_engine(symbol_search_live):  # noqa : F811
+    symbol_search_live.symbol_rank = SymbolRank(
+        symbol_search_live.symbol_rank.graph, SymbolRankConfig(engine=SymbolRankEngine.PUSH)
+    )
+    for search in SR_SEARCHES_TO_HITS:
+        results = symbol_search_live.symbol_rank_search(search)
+        filtered_results = [result for result in results if ".tests." not in result[0].dotpath]
+        expected_in_top_hits = SR_SEARCHES_TO_HITS[search]
+        found_top_hits = get_top_n_results_desc_name(filtered_results, 10)
+        check_hits(expected_in_top_hits, found_top_hits)
+
+
 EXACT_CALLS_TO_HITS = {
     "AutomataAgent": [
         "automata.core.agent.coordinator",
@@ -43,3 +43,43 @@ def test_context_generator(context_oracle_tool_builder):
     for tool in tools:
         if tool.name == "context-oracle":
             assert tool.function(("query", 5)) == "zy"  # TODO - Investigate why this is the result
+    # The query is ranked once, however many related symbols are skipped
+    context_oracle_tool_builder.symbol_search.symbol_rank_search.assert_called_once_with(
+        ("query", 5)
+    )
+
+
+def test_context_generator_skips_symbols_without_embeddings(context_oracle_tool_builder):
+    ranked_symbols = [(MagicMock(dotpath=f"symbol{i}"), 1.0 / (i + 1)) for i in range(40)]
+    # Only the lower ranked symbols have a documentation embedding
+    documented_symbols = {symbol for symbol, _ in ranked_symbols[25:]}
+
+    def get_embedding(symbol):
+        if symbol == "doc1":
+            return SymbolDocEmbedding(symbol="x", document="y", source_code="z", vector=[0, 1])
+        if symbol not in documented_symbols:
+            raise ValueError(f"{symbol} has no embedding")
+        return SymbolDocEmbedding(
+            symbol=symbol, document="", vector=[0, 1], summary=f"{symbol.dotpath} summary\n"
+        )
+
+    context_oracle_tool_builder.symbol_doc_similarity.calculate_query_similarity_dict = MagicMock(
+        return_value={"doc1": 0.9}
+    )
+    context_oracle_tool_builder.symbol_doc_similarity.embedding_handler.get_embedding = (
+        get_embedding
+    )
+    context_oracle_tool_builder.symbol_search.symbol_rank_search = MagicMock(
+        return_value=ranked_symbols
+    )
+
+    context = context_oracle_tool_builder._get_context("query", max_related_symbols=5)
+    for i in range(25, 30):
+        assert f"symbol{i} summary" in context
+    assert "symbol30 summary" not in context
+    # The ranking is computed once and walked until enough documented symbols are found
+    context_oracle_tool_builder.symbol_search.symbol_rank_search.assert_called_once_with("query")
+
+    # The walk stops once the ranking is exhausted
+    context = context_oracle_tool_builder._get_context("query", max_related_symbols=20)
+    assert context.count(" summary") == 15
@@ -0,0 +1,66 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from automata.core.llm.embedding import EmbeddingProvider
+from automata.core.llm.embedding_cache import CachedEmbeddingProvider
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """Embeds text by the counts of its vowels, recording each call."""
+
+    def __init__(self, engine: str = "fake-engine") -> None:
+        self.engine = engine
+        self.calls: List[str] = []
+
+    def build_embedding_array(self, symbol_source: str) -> np.ndarray:
+        self.calls.append(symbol_source)
+        return np.array([symbol_source.count(vowel) for vowel in "aeiou"], dtype=np.float64)
+
+
+def test_cached_embedding_provider_memory_tier():
+    fake_provider = FakeEmbeddingProvider()
+    provider = CachedEmbeddingProvider(fake_provider, db_path=None, max_memory_entries=2)
+
+    embedding = provider.build_embedding_array("a query")
+    assert np.array_equal(embedding, fake_provider.build_embedding_array("a query"))
+    assert provider.build_embedding_array("a query") is embedding
+    with pytest.raises(ValueError):
+        embedding[0] = 1.0
+
+    provider.build_embedding_array("another query")
+    provider.build_embedding_array("a third query")
+    # "a query" was the least recently used embedding, so it is embedded again
+    provider.build_embedding_array("a query")
+    assert fake_provider.calls == [
+        "a query",
+        "a query",
+        "another query",
+        "a third query",
+        "a query",
+    ]
+    assert (provider.memory_hits, provider.disk_hits, provider.misses) == (1, 0, 4)
+
+    with pytest.raises(ValueError):
+        CachedEmbeddingProvider(fake_provider, db_path=None, max_memory_entries=0)
+
+
+def test_cached_embedding_provider_disk_tier(tmp_path):
+    db_path = str(tmp_path / "embedding_cache.sqlite3")
+    fake_provider = FakeEmbeddingProvider()
+    embedding = CachedEmbeddingProvider(fake_provider, db_path=db_path).build_embedding_array(
+        "def source(): ..."
+    )
+
+    # A new provider reads the embeddings of the same engine from disk
+    provider = CachedEmbeddingProvider(fake_provider, db_path=db_path)
+    assert np.array_equal(provider.build_embedding_array("def source(): ..."), embedding)
+    assert (provider.disk_hits, provider.misses) == (1, 0)
+    assert len(fake_provider.calls) == 1
+
+    other_engine_provider = CachedEmbeddingProvider(
+        FakeEmbeddingProvider("other-engine"), db_path=db_path
+    )
+    other_engine_provider.build_embedding_array("def source(): ...")
+    assert other_engine_provider.misses == 1
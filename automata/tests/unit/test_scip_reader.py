@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from automata.core.symbol.scip_pb2 import Index  # type: ignore
+from automata.core.symbol.scip_reader import ScipIndexReader
+
+TEST_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "index.scip")
+
+
+@pytest.fixture
+def index():
+    index = Index()
+    with open(TEST_INDEX_PATH, "rb") as f:
+        index.ParseFromString(f.read())
+    return index
+
+
+def test_streamed_documents_match_index(index):
+    reader = ScipIndexReader(TEST_INDEX_PATH)
+    documents = list(reader.iter_documents())
+    assert len(documents) == len(index.documents)
+    for streamed_document, document in zip(documents, index.documents):
+        assert streamed_document == document
+
+
+def test_documents_can_be_iterated_repeatedly(index):
+    reader = ScipIndexReader(TEST_INDEX_PATH)
+    first_paths = [document.relative_path for document in reader.documents]
+    second_paths = [document.relative_path for document in reader.documents]
+    assert first_paths == second_paths == [document.relative_path for document in index.documents]
+
+
+def test_documents_can_be_read_by_span(index):
+    reader = ScipIndexReader(TEST_INDEX_PATH)
+    spans = list(reader.iter_document_spans())
+    assert len(spans) == len(index.documents)
+    # Each span can be read on its own, in any order
+    assert list(reader.read_documents(spans[::-1])) == list(index.documents)[::-1]
+
+
+def test_metadata_and_external_symbols_match_index(index):
+    reader = ScipIndexReader(TEST_INDEX_PATH)
+    assert reader.read_metadata() == index.metadata
+    assert list(reader.iter_external_symbols()) == list(index.external_symbols)
+
+
+def test_truncated_index_raises(tmp_path):
+    with open(TEST_INDEX_PATH, "rb") as f:
+        data = f.read()
+    truncated_path = tmp_path / "index.scip"
+    truncated_path.write_bytes(data[: len(data) // 2])
+
+    with pytest.raises(ValueError):
+        list(ScipIndexReader(str(truncated_path)).iter_documents())
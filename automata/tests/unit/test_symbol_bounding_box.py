@@ -0,0 +1,161 @@
+import textwrap
+
+import pytest
+
+from automata.core.coding.py.module_loader import py_module_loader
+from automata.core.symbol.bounding_box import (
+    BoundingBox,
+    BoundingBoxCache,
+    BoundingBoxSource,
+    compute_ast_bounding_boxes,
+)
+from automata.core.symbol.graph import GraphNavigator, _BoundingBoxWorkerPool
+from automata.core.symbol.parser import parse_symbol
+from automata.core.symbol.symbol_utils import convert_to_fst_object
+
+SYMBOL_PREFIX = (
+    "scip-python python automata 7bcc14a4733f0168e88f0547befe83864dae01a2 `pkg.module`/"
+)
+
+MODULE_SOURCE = textwrap.dedent(
+    '''
+    import functools
+
+
+    @functools.lru_cache()
+    def decorated(x):
+        """A decorated function."""
+        return x + 1
+
+
+    class Outer:
+        # A comment between the class and its method
+
+        def method(self):
+            def method(y):
+                return y
+
+            return method(1)
+
+        class Inner:
+            def method(self):
+                return 2
+
+
+
+    async def coroutine():
+        return await coroutine()
+    '''
+)
+
+
+@pytest.fixture(autouse=True)
+def module_loader(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "module.py").write_text(MODULE_SOURCE)
+    (tmp_path / "pkg" / "broken.py").write_text("def broken(:\n")
+    py_module_loader.initialize(str(tmp_path), str(tmp_path / "pkg"))
+    yield py_module_loader
+    py_module_loader._dotpath_map = None
+    py_module_loader._loaded_modules.clear()
+    py_module_loader.initialized = False
+    py_module_loader.py_fpath = None
+    py_module_loader.root_fpath = None
+
+
+@pytest.mark.parametrize(
+    "descriptors",
+    [
+        "decorated().",
+        "Outer#",
+        "Outer#method().",
+        "Outer#Inner#",
+        "Outer#Inner#method().",
+        "coroutine().",
+    ],
+)
+def test_ast_bounding_box_matches_redbaron(descriptors):
+    symbol = parse_symbol(SYMBOL_PREFIX + descriptors)
+    bounding_boxes, unparsed_symbols = compute_ast_bounding_boxes([symbol])
+    assert unparsed_symbols == []
+    bounding_box = bounding_boxes[symbol]
+    assert isinstance(bounding_box, BoundingBox)
+
+    redbaron_box = convert_to_fst_object(symbol).absolute_bounding_box
+    assert tuple(bounding_box.top_left) == (
+        redbaron_box.top_left.line,
+        redbaron_box.top_left.column,
+    )
+    # The RedBaron box also covers the blank lines after the definition, which hold no references
+    lines = MODULE_SOURCE.split("\n")
+    assert bounding_box.bottom_right.line <= redbaron_box.bottom_right.line
+    assert not any(
+        line.strip()
+        for line in lines[bounding_box.bottom_right.line - 1 : redbaron_box.bottom_right.line - 1]
+    )
+
+
+def test_ast_bounding_boxes_missing_and_unparsed_symbols():
+    missing_symbol = parse_symbol(SYMBOL_PREFIX + "Outer#missing().")
+    unparsed_symbol = parse_symbol(SYMBOL_PREFIX.replace("pkg.module", "pkg.broken") + "broken().")
+    bounding_boxes, unparsed_symbols = compute_ast_bounding_boxes(
+        [missing_symbol, unparsed_symbol]
+    )
+    assert bounding_boxes == {}
+    assert unparsed_symbols == [unparsed_symbol]
+
+
+def test_redbaron_bounding_boxes_in_worker_pool():
+    symbols = [
+        parse_symbol(SYMBOL_PREFIX + descriptors)
+        for descriptors in ["decorated().", "Outer#", "Outer#Inner#method().", "missing()."]
+    ]
+    try:
+        bounding_boxes = GraphNavigator._compute_redbaron_bounding_boxes(symbols)
+        executor = _BoundingBoxWorkerPool._executor
+        assert executor is not None
+        assert GraphNavigator._compute_redbaron_bounding_boxes(symbols).keys() == (
+            bounding_boxes.keys()
+        )
+        # The pool is kept alive across calls
+        assert _BoundingBoxWorkerPool._executor is executor
+    finally:
+        _BoundingBoxWorkerPool.shutdown()
+
+    assert set(bounding_boxes) == set(symbols[:3])
+    for symbol, bounding_box in bounding_boxes.items():
+        expected_box = convert_to_fst_object(symbol).absolute_bounding_box
+        assert (bounding_box.top_left.line, bounding_box.bottom_right.line) == (
+            expected_box.top_left.line,
+            expected_box.bottom_right.line,
+        )
+
+
+def test_bounding_box_cache_round_trip(tmp_path):
+    db_path = str(tmp_path / "bounding_boxes.sqlite3")
+    symbols = [
+        parse_symbol(SYMBOL_PREFIX + descriptors)
+        for descriptors in ["decorated().", "Outer#method().", "missing()."]
+    ]
+    bounding_boxes, _ = compute_ast_bounding_boxes(symbols)
+    BoundingBoxCache(db_path).put_bounding_boxes(symbols, bounding_boxes, BoundingBoxSource.AST)
+
+    cache = BoundingBoxCache(db_path)
+    cached_boxes, missing_symbols = cache.get_bounding_boxes(symbols, BoundingBoxSource.AST)
+    assert missing_symbols == []
+    assert cached_boxes == {**bounding_boxes, symbols[2]: None}
+    # Bounding boxes computed by another source are stored separately
+    assert cache.get_bounding_boxes(symbols, BoundingBoxSource.REDBARON) == ({}, symbols)
+
+    # Editing the module invalidates the bounding boxes of its symbols
+    module_path = tmp_path / "pkg" / "module.py"
+    module_path.write_text("\n" + MODULE_SOURCE)
+    assert cache.get_bounding_boxes(symbols, BoundingBoxSource.AST) == ({}, symbols)
+
+    new_boxes, _ = compute_ast_bounding_boxes(symbols)
+    cache.put_bounding_boxes(symbols, new_boxes, BoundingBoxSource.AST)
+    cached_boxes, _ = cache.get_bounding_boxes(symbols, BoundingBoxSource.AST)
+    assert cached_boxes[symbols[0]].top_left.line == bounding_boxes[symbols[0]].top_left.line + 1
+    # The entries of the previous version of the module are replaced
+    cache.cursor.execute(f"SELECT COUNT(*) FROM {BoundingBoxCache.TABLE_NAME}")
+    assert cache.cursor.fetchone()[0] == len(symbols)
@@ -1,5 +1,32 @@
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from automata.core.coding.py.module_loader import py_module_loader
+from automata.core.symbol import bounding_box
+from automata.core.symbol.compact_graph import (
+    CompactGraphBuilder,
+    CompactSymbolGraph,
+    _CompactSymbolGraphNavigator,
+)
+from automata.core.symbol.graph import (
+    GraphNavigator,
+    SymbolGraph,
+    SymbolGraphBackend,
+    _LabeledEdgeIndex,
+)
+from automata.core.symbol.graph_snapshot import SubgraphSnapshot, SymbolGraphSnapshot
+from automata.core.symbol.scip_pb2 import Index  # type: ignore
+from automata.core.symbol.scip_reader import ScipIndexReader
 from automata.core.symbol.symbol_types import Symbol, SymbolFile
-from automata.tests.utils.factories import symbol_graph_static_test  # noqa: F401
+from automata.core.symbol.symbol_utils import get_rankable_symbols
+from automata.core.utils import get_root_fpath, get_root_py_fpath
+from automata.tests.utils.factories import (  # noqa: F401
+    symbol_graph_compact_static_test,
+    symbol_graph_static_test,
+)
 
 
 def test_get_all_files(symbol_graph_static_test):  # noqa: F811
@@ -13,3 +40,485 @@ def test_get_all_symbols(symbol_graph_static_test):  # noqa: F811
     graph_symbols = symbol_graph_static_test.get_all_available_symbols()
     assert isinstance(graph_symbols, list)
     assert all(isinstance(s, Symbol) for s in graph_symbols)
+
+
+def _reference_keys(references):
+    return [(ref.symbol.uri, ref.line_number, ref.column_number, ref.roles) for ref in references]
+
+
+def test_compact_backend_files_and_symbols(
+    symbol_graph_static_test, symbol_graph_compact_static_test  # noqa: F811
+):
+    compact_files = symbol_graph_compact_static_test.get_all_files()
+    files = symbol_graph_static_test.get_all_files()
+    assert [f.path for f in compact_files] == [f.path for f in files]
+    for compact_file, symbol_file in zip(compact_files, files):
+        assert list(compact_file.occurrences) == list(symbol_file.occurrences)
+    assert set(symbol_graph_compact_static_test.get_all_available_symbols()) == set(
+        symbol_graph_static_test.get_all_available_symbols()
+    )
+
+
+def test_compact_backend_edges(
+    symbol_graph_static_test, symbol_graph_compact_static_test  # noqa: F811
+):
+    symbols = get_rankable_symbols(symbol_graph_static_test.get_all_available_symbols())
+    for symbol in symbols[:250]:
+        assert symbol_graph_compact_static_test.get_symbol_relationships(
+            symbol
+        ) == symbol_graph_static_test.get_symbol_relationships(symbol)
+
+        expected_references = symbol_graph_static_test.get_references_to_symbol(symbol)
+        found_references = symbol_graph_compact_static_test.get_references_to_symbol(symbol)
+        assert found_references.keys() == expected_references.keys()
+        for file_path in expected_references:
+            assert _reference_keys(found_references[file_path]) == _reference_keys(
+                expected_references[file_path]
+            )
+
+        parent_file = symbol_graph_static_test.navigator._get_symbol_containing_file(symbol)
+        assert (
+            symbol_graph_compact_static_test.navigator._get_symbol_containing_file(symbol)
+            == parent_file
+        )
+        assert sorted(
+            _reference_keys(
+                symbol_graph_compact_static_test.navigator._get_references_to_module(parent_file)
+            )
+        ) == sorted(
+            _reference_keys(
+                symbol_graph_static_test.navigator._get_references_to_module(parent_file)
+            )
+        )
+
+
+def test_networkx_graph_property(
+    symbol_graph_static_test, symbol_graph_compact_static_test  # noqa: F811
+):
+    assert symbol_graph_static_test._graph is symbol_graph_static_test.navigator._graph
+    with pytest.raises(NotImplementedError):
+        symbol_graph_compact_static_test._graph
+
+
+def test_references_to_module_sorted_by_position(symbol_graph_static_test):  # noqa: F811
+    for symbol_file in symbol_graph_static_test.get_all_files():
+        references = symbol_graph_static_test.navigator._get_references_to_module(symbol_file.path)
+        positions = [(ref.line_number, ref.column_number) for ref in references]
+        assert positions == sorted(positions)
+
+
+def test_references_to_module_in_lines(
+    symbol_graph_static_test, symbol_graph_compact_static_test  # noqa: F811
+):
+    for symbol_file in symbol_graph_static_test.get_all_files()[:20]:
+        references = symbol_graph_static_test.navigator._get_references_to_module(symbol_file.path)
+        for start_line, end_line in [(0, 1), (3, 40), (10, 11), (25, 10_000), (50, 50)]:
+            expected = _reference_keys(
+                [ref for ref in references if start_line <= ref.line_number < end_line]
+            )
+            for graph in [symbol_graph_static_test, symbol_graph_compact_static_test]:
+                assert (
+                    _reference_keys(
+                        graph.navigator._get_references_to_module_in_lines(
+                            symbol_file.path, start_line, end_line
+                        )
+                    )
+                    == expected
+                )
+    assert (
+        symbol_graph_static_test.navigator._get_references_to_module_in_lines("x.py", 0, 9) == []
+    )
+
+
+TEST_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "index.scip")
+
+
+@pytest.mark.parametrize("backend", list(SymbolGraphBackend))
+def test_snapshot_round_trip(monkeypatch, tmp_path, backend):
+    built_graph = SymbolGraph(TEST_INDEX_PATH, backend=backend, snapshot_dir=str(tmp_path))
+    snapshot = SymbolGraphSnapshot(str(tmp_path), TEST_INDEX_PATH, backend.value)
+    assert os.path.exists(snapshot.path)
+    # Compact graphs are stored in a separate memory-mappable file
+    assert os.path.exists(snapshot.graph_path) == (backend == SymbolGraphBackend.COMPACT)
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("The graph should be loaded from the snapshot")
+
+    monkeypatch.setattr(SymbolGraph, "_build_navigator", fail_build)
+    loaded_graph = SymbolGraph(TEST_INDEX_PATH, backend=backend, snapshot_dir=str(tmp_path))
+
+    assert [f.path for f in loaded_graph.get_all_files()] == [
+        f.path for f in built_graph.get_all_files()
+    ]
+    symbols = loaded_graph.get_all_available_symbols()
+    assert set(symbols) == set(built_graph.get_all_available_symbols())
+    for symbol in get_rankable_symbols(symbols)[:50]:
+        assert loaded_graph.get_symbol_relationships(
+            symbol
+        ) == built_graph.get_symbol_relationships(symbol)
+        loaded_references = loaded_graph.get_references_to_symbol(symbol)
+        built_references = built_graph.get_references_to_symbol(symbol)
+        assert loaded_references.keys() == built_references.keys()
+        for file_path in built_references:
+            assert _reference_keys(loaded_references[file_path]) == _reference_keys(
+                built_references[file_path]
+            )
+
+
+def test_snapshot_key_changes_with_index(tmp_path):
+    index_path = tmp_path / "index.scip"
+    index_path.write_bytes(b"first index")
+    first_key = SymbolGraphSnapshot.compute_key(str(index_path), "networkx", False)
+    assert first_key == SymbolGraphSnapshot.compute_key(str(index_path), "networkx", False)
+    assert first_key != SymbolGraphSnapshot.compute_key(str(index_path), "compact", False)
+    assert first_key != SymbolGraphSnapshot.compute_key(str(index_path), "networkx", True)
+
+    index_path.write_bytes(b"second index")
+    assert first_key != SymbolGraphSnapshot.compute_key(str(index_path), "networkx", False)
+
+
+def test_corrupt_snapshot_is_rebuilt(tmp_path):
+    snapshot = SymbolGraphSnapshot(str(tmp_path), TEST_INDEX_PATH, "networkx")
+    with open(snapshot.path, "wb") as f:
+        f.write(b"not a snapshot")
+
+    graph = SymbolGraph(TEST_INDEX_PATH, snapshot_dir=str(tmp_path))
+    assert len(graph.get_all_available_symbols()) > 0
+    assert snapshot.load() is not None
+
+
+def test_compact_graph_mapped_round_trip(tmp_path, symbol_graph_compact_static_test):  # noqa: F811
+    graph = symbol_graph_compact_static_test.navigator._graph
+    path = str(tmp_path / "graph.csg")
+    graph.save_mapped(path)
+    mapped_graph = CompactSymbolGraph.open_mapped(path)
+
+    assert mapped_graph.arrays.keys() == graph.arrays.keys()
+    for name, values in graph.arrays.items():
+        assert not mapped_graph.arrays[name].flags.writeable
+        assert np.array_equal(mapped_graph.arrays[name], values)
+    assert [mapped_graph.symbols[i] for i in range(len(mapped_graph.symbols))] == [
+        graph.symbols[i] for i in range(len(graph.symbols))
+    ]
+    for i in range(len(graph.symbols)):
+        assert mapped_graph.symbols.get_id(graph.symbols[i]) == i
+    assert mapped_graph.symbols.get_id("not a symbol") is None
+
+    navigator = _CompactSymbolGraphNavigator(mapped_graph)
+    symbols = get_rankable_symbols(symbol_graph_compact_static_test.get_all_available_symbols())
+    for symbol in symbols[:50]:
+        assert (
+            navigator.get_references_to_symbol(symbol).keys()
+            == symbol_graph_compact_static_test.get_references_to_symbol(symbol).keys()
+        )
+        assert navigator._get_symbol_containing_file(
+            symbol
+        ) == symbol_graph_compact_static_test.navigator._get_symbol_containing_file(symbol)
+
+
+def test_compact_graph_mapped_version_mismatch(
+    tmp_path, symbol_graph_compact_static_test  # noqa: F811
+):
+    path = str(tmp_path / "graph.csg")
+    symbol_graph_compact_static_test.navigator._graph.save_mapped(path)
+    with open(path, "r+b") as f:
+        f.write(
+            CompactSymbolGraph._MAPPED_PREFIX.pack(
+                CompactSymbolGraph.MAPPED_MAGIC, CompactSymbolGraph.MAPPED_FORMAT_VERSION + 1, 0
+            )[:8]
+        )
+
+    with pytest.raises(ValueError) as excinfo:
+        CompactSymbolGraph.open_mapped(path)
+    assert f"version {CompactSymbolGraph.MAPPED_FORMAT_VERSION + 1}" in str(excinfo.value)
+    assert f"version {CompactSymbolGraph.MAPPED_FORMAT_VERSION} was expected" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("build_caller_relationships", [False, True])
+def test_parallel_compact_build_matches_serial_build(monkeypatch, build_caller_relationships):
+    monkeypatch.setattr("automata.core.symbol.compact_graph.MAX_WORKERS", 2)
+    index = ScipIndexReader(TEST_INDEX_PATH)
+    graph = CompactGraphBuilder(index, build_caller_relationships).build_graph()
+    parallel_graph = CompactGraphBuilder(
+        index, build_caller_relationships, parallel=True
+    ).build_graph()
+
+    for table in ["symbols", "files"]:
+        values = getattr(graph, table)
+        parallel_values = getattr(parallel_graph, table)
+        assert [parallel_values[i] for i in range(len(parallel_values))] == [
+            values[i] for i in range(len(values))
+        ]
+    assert parallel_graph.arrays.keys() == graph.arrays.keys()
+    for name, values in graph.arrays.items():
+        assert np.array_equal(parallel_graph.arrays[name], values), name
+
+
+def test_parallel_build_requires_index_file_and_compact_backend():
+    with pytest.raises(ValueError):
+        CompactGraphBuilder(Index(), parallel=True)
+    with pytest.raises(NotImplementedError):
+        SymbolGraph(TEST_INDEX_PATH, build_in_parallel=True)
+
+
+def _write_index(path, documents):
+    index = Index()
+    index.documents.extend(documents)
+    path.write_bytes(index.SerializeToString())
+    return str(path)
+
+
+def _graph_summary(graph):
+    # Local symbols are only unique within a file, so they are not compared across graphs
+    symbols = [
+        symbol
+        for symbol in graph.get_all_available_symbols()
+        if not symbol.uri.startswith("local")
+    ]
+    return {
+        symbol.uri: (
+            {
+                file_path: _reference_keys(references)
+                for file_path, references in graph.get_references_to_symbol(symbol).items()
+            },
+            graph.navigator._get_symbol_containing_file(symbol),
+            graph.get_symbol_relationships(symbol),
+        )
+        for symbol in symbols
+    }
+
+
+def _edge_index_summary(edge_index):
+    for file_path, references in edge_index.references_in_file.items():
+        assert edge_index.reference_positions_in_file[file_path] == sorted(
+            (ref.line_number, ref.column_number) for ref in references
+        )
+    return (
+        {str(symbol): sorted(files) for symbol, files in edge_index.containing_files.items()},
+        {
+            str(symbol): sorted((file_path, str(ref)) for file_path, ref in references)
+            for symbol, references in edge_index.references_to_symbol.items()
+        },
+        {
+            file_path: sorted(map(str, references))
+            for file_path, references in edge_index.references_in_file.items()
+        },
+        {
+            str(symbol): set(map(str, related_symbols))
+            for symbol, related_symbols in edge_index.relationships.items()
+        },
+        edge_index.callers,
+        edge_index.callees,
+    )
+
+
+def test_apply_index_delta_matches_rebuild(tmp_path):
+    documents = list(ScipIndexReader(TEST_INDEX_PATH).documents)
+    updated_document = documents[len(documents) // 2]
+    other_documents = [
+        document
+        for document in documents
+        if document.relative_path != updated_document.relative_path
+    ]
+
+    graph = SymbolGraph(TEST_INDEX_PATH)
+    graph.apply_index_delta(_write_index(tmp_path / "delta.scip", [updated_document]))
+    # Updated files are re-added after the others, as if they were last in the index
+    rebuilt_graph = SymbolGraph(
+        _write_index(tmp_path / "rebuilt.scip", other_documents + [updated_document])
+    )
+    assert _graph_summary(graph) == _graph_summary(rebuilt_graph)
+    # The edge index is updated in place, rather than rebuilt from the graph
+    edge_index = graph.navigator._edge_index
+    assert _edge_index_summary(edge_index) == _edge_index_summary(
+        _LabeledEdgeIndex.from_graph(graph.navigator._graph)
+    )
+
+    graph.apply_index_delta(
+        _write_index(tmp_path / "empty.scip", []),
+        removed_files=[updated_document.relative_path],
+    )
+    rebuilt_graph = SymbolGraph(_write_index(tmp_path / "removed.scip", other_documents))
+    assert updated_document.relative_path not in [f.path for f in graph.get_all_files()]
+    assert _graph_summary(graph) == _graph_summary(rebuilt_graph)
+    assert graph.navigator._edge_index is edge_index
+    assert _edge_index_summary(edge_index) == _edge_index_summary(
+        _LabeledEdgeIndex.from_graph(graph.navigator._graph)
+    )
+    # The symbols which were only referenced by the removed file are removed with it
+    assert {str(node) for node in graph.navigator._graph.nodes} == {
+        str(node) for node in rebuilt_graph.navigator._graph.nodes
+    }
+
+
+def test_apply_index_delta_requires_networkx_backend(
+    tmp_path, symbol_graph_compact_static_test  # noqa: F811
+):
+    with pytest.raises(NotImplementedError):
+        symbol_graph_compact_static_test.apply_index_delta(
+            _write_index(tmp_path / "empty.scip", [])
+        )
+
+
+@pytest.fixture
+def module_loader():
+    py_module_loader.initialize(get_root_fpath(), get_root_py_fpath())
+    yield py_module_loader
+    py_module_loader._dotpath_map = None
+    py_module_loader._loaded_modules.clear()
+    py_module_loader.initialized = False
+    py_module_loader.py_fpath = None
+    py_module_loader.root_fpath = None
+
+
+def _expected_subgraph_edges(graph, flow_rank):
+    edges = set()
+    for symbol in get_rankable_symbols(graph.get_all_available_symbols()):
+        try:
+            related_symbols = graph.get_symbol_dependencies(symbol).union(
+                graph.get_symbol_relationships(symbol)
+            )
+        except Exception:
+            continue
+        for related_symbol in get_rankable_symbols(list(related_symbols)):
+            if flow_rank != "from_dependents":
+                edges.add((symbol, related_symbol))
+            if flow_rank != "to_dependents":
+                edges.add((related_symbol, symbol))
+    return edges
+
+
+@pytest.mark.parametrize("flow_rank", ["bidirectional", "to_dependents", "from_dependents"])
+def test_rankable_symbol_dependency_subgraph(
+    module_loader,
+    symbol_graph_static_test,  # noqa: F811
+    symbol_graph_compact_static_test,  # noqa: F811
+    flow_rank,
+):
+    expected_edges = _expected_subgraph_edges(symbol_graph_static_test, flow_rank)
+    assert len(expected_edges) > 0
+    for graph in [symbol_graph_static_test, symbol_graph_compact_static_test]:
+        subgraph = graph.get_rankable_symbol_dependency_subgraph(flow_rank)
+        assert set(subgraph.graph.edges) == expected_edges
+
+        symbols, matrix = graph.get_rankable_symbol_dependency_matrix(flow_rank)
+        assert set(symbols) == set(subgraph.graph.nodes)
+        rows, columns = matrix.nonzero()
+        assert {(symbols[row], symbols[column]) for row, column in zip(rows, columns)} == (
+            expected_edges
+        )
+
+
+def test_rankable_symbol_dependency_subgraph_flow_rank(symbol_graph_static_test):  # noqa: F811
+    with pytest.raises(ValueError):
+        symbol_graph_static_test.get_rankable_symbol_dependency_subgraph("upstream")
+
+
+def test_rankable_subgraph_cache(monkeypatch, tmp_path, module_loader):
+    graph = SymbolGraph(TEST_INDEX_PATH, snapshot_dir=str(tmp_path))
+    subgraph = graph.get_rankable_symbol_dependency_subgraph("to_dependents")
+    # Subgraphs are shared between callers, so they cannot be modified
+    assert graph.get_rankable_symbol_dependency_subgraph("to_dependents") is subgraph
+    with pytest.raises(nx.NetworkXError):
+        subgraph.graph.remove_node(next(iter(subgraph.graph.nodes)))
+    subgraph_snapshot = SubgraphSnapshot(
+        graph._snapshot,
+        "to_dependents",
+        None,
+        "ast",
+        graph.navigator.get_rankable_module_hashes(),
+    )
+    assert os.path.exists(subgraph_snapshot.path)
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("The subgraph should be loaded from the snapshot")
+
+    monkeypatch.setattr(SymbolGraph, "_get_rankable_dependency_edges", fail_build)
+    loaded_graph = SymbolGraph(TEST_INDEX_PATH, snapshot_dir=str(tmp_path))
+    loaded_subgraph = loaded_graph.get_rankable_symbol_dependency_subgraph("to_dependents")
+    assert set(loaded_subgraph.graph.edges) == set(subgraph.graph.edges)
+    symbols, matrix = loaded_graph.get_rankable_symbol_dependency_matrix("to_dependents")
+    assert matrix.nnz == subgraph.graph.number_of_edges()
+
+    # Other arguments are stored under another key
+    with pytest.raises(AssertionError):
+        loaded_graph.get_rankable_symbol_dependency_subgraph("to_dependents", "core")
+
+
+def test_rankable_subgraph_cache_module_edit(monkeypatch, tmp_path, module_loader):
+    graph = SymbolGraph(TEST_INDEX_PATH, snapshot_dir=str(tmp_path))
+    subgraph = graph.get_rankable_symbol_dependency_subgraph("to_dependents")
+    module_hashes = graph.navigator.get_rankable_module_hashes()
+    assert graph.navigator.bounding_box_module_hashes == module_hashes
+    edited_module = next(iter(module_hashes))
+
+    # Editing a module changes the bounding boxes of its symbols, and thereby the edges
+    def get_module_content_hash(module_name):
+        if module_name == edited_module:
+            return "edited"
+        return module_hashes[module_name]
+
+    monkeypatch.setattr(
+        "automata.core.symbol.graph.get_module_content_hash", get_module_content_hash
+    )
+    computed_symbols = []
+    compute_bounding_boxes = GraphNavigator._compute_bounding_boxes
+
+    def record_compute_bounding_boxes(self, symbols):
+        computed_symbols.extend(symbols)
+        return compute_bounding_boxes(self, symbols)
+
+    monkeypatch.setattr(GraphNavigator, "_compute_bounding_boxes", record_compute_bounding_boxes)
+    loaded_graph = SymbolGraph(TEST_INDEX_PATH, snapshot_dir=str(tmp_path))
+    assert len(loaded_graph.navigator.bounding_box) > 0
+    loaded_subgraph = loaded_graph.get_rankable_symbol_dependency_subgraph("to_dependents")
+    assert set(loaded_subgraph.graph.edges) == set(subgraph.graph.edges)
+    # Neither the stored subgraph nor the stored bounding boxes were reused
+    assert computed_symbols
+    assert loaded_graph.navigator.bounding_box_module_hashes[edited_module] == "edited"
+
+
+def test_missing_bounding_boxes_are_not_searched_again(monkeypatch, tmp_path, module_loader):
+    cache_path = str(tmp_path / "bounding_boxes.sqlite3")
+    graph = SymbolGraph(TEST_INDEX_PATH, bounding_box_cache_path=cache_path)
+    missing_symbol = get_rankable_symbols(graph.get_all_available_symbols())[0]
+    compute_bounding_boxes = GraphNavigator._compute_bounding_boxes
+
+    def drop_missing_symbol(self, symbols):
+        bounding_boxes = compute_bounding_boxes(self, symbols)
+        bounding_boxes.pop(missing_symbol, None)
+        return bounding_boxes
+
+    hashed_modules = []
+    get_module_content_hash = bounding_box.get_module_content_hash
+
+    def record_module_content_hash(module_name):
+        hashed_modules.append(module_name)
+        return get_module_content_hash(module_name)
+
+    monkeypatch.setattr(GraphNavigator, "_compute_bounding_boxes", drop_missing_symbol)
+    monkeypatch.setattr(
+        "automata.core.symbol.graph.get_module_content_hash", record_module_content_hash
+    )
+    monkeypatch.setattr(
+        "automata.core.symbol.bounding_box.get_module_content_hash", record_module_content_hash
+    )
+    graph.get_rankable_symbol_dependency_subgraph("to_dependents")
+    # Each module is hashed once, for both the navigator and the cache
+    assert sorted(hashed_modules) == sorted(set(hashed_modules))
+
+    def fail_compute_bounding_box(self, symbol):
+        raise AssertionError("The bounding box of a missing symbol should not be searched for")
+
+    monkeypatch.setattr(GraphNavigator, "_compute_bounding_box", fail_compute_bounding_box)
+    with pytest.raises(ValueError):
+        graph.get_symbol_dependencies(missing_symbol)
+
+    # Symbols known to be missing are also loaded from the cache
+    cached_graph = SymbolGraph(TEST_INDEX_PATH, bounding_box_cache_path=cache_path)
+    cached_graph.navigator._pre_compute_rankable_bounding_boxes(cached_graph._bounding_box_cache)
+    missing_symbols = cached_graph.navigator._missing_bounding_boxes
+    assert missing_symbol in missing_symbols
+    assert missing_symbols == graph.navigator._missing_bounding_boxes
+    with pytest.raises(ValueError):
+        cached_graph.get_symbol_dependencies(missing_symbol)
@@ -1,4 +1,19 @@
-from automata.core.symbol.parser import Symbol, is_global_symbol, is_local_symbol
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from automata.core.symbol.parser import (
+    ParseSymbolCacheInfo,
+    Symbol,
+    _FastSymbolParser,
+    _parse_symbol_general,
+    clear_parse_symbol_cache,
+    get_parse_symbol_cache_info,
+    is_global_symbol,
+    is_local_symbol,
+    parse_symbol,
+    parse_symbols,
+)
 
 
 def test_parse_symbol(symbols):
@@ -28,3 +43,58 @@ def _unparse(symbol: Symbol):
 def test_unparse_symbol(symbols):
     for symbol in symbols:
         assert _unparse(symbol) == symbol.uri
+
+
+def test_parse_symbol_interns_symbols(symbols):
+    clear_parse_symbol_cache()
+    for symbol in symbols:
+        assert parse_symbol(symbol.uri) is parse_symbol(symbol.uri)
+        assert parse_symbol(symbol.uri) == symbol
+
+    cache_info = get_parse_symbol_cache_info()
+    assert cache_info.misses == len({symbol.uri for symbol in symbols})
+    assert cache_info.hits == 3 * len(symbols) - cache_info.misses
+    assert cache_info.currsize == cache_info.misses
+    assert isinstance(cache_info, ParseSymbolCacheInfo)
+
+
+def test_parsed_symbols_are_immutable(symbols):
+    with pytest.raises(FrozenInstanceError):
+        parse_symbol(symbols[0].uri).uri = "local 0"
+
+
+def _symbol_fields(symbol):
+    return (
+        symbol.uri,
+        symbol.scheme,
+        symbol.package.unparse(),
+        [(d.name, d.suffix, d.disambiguator) for d in symbol.descriptors],
+    )
+
+
+def test_fast_parser_matches_general_parser(symbols):
+    for symbol in symbols:
+        fast_symbol = _FastSymbolParser.parse(symbol.uri)
+        assert fast_symbol is not None
+        assert _symbol_fields(fast_symbol) == _symbol_fields(_parse_symbol_general(symbol.uri))
+
+
+@pytest.mark.parametrize(
+    "uri",
+    [
+        "local 12",
+        "scip-python python . . `a``b`/Foo#",
+        "scip  python python automata v1 `a.b`/Foo#",
+        "scip-python python automata v1 `a.b`/Foo#bär().",
+    ],
+)
+def test_fast_parser_falls_back_for_unusual_uris(uri):
+    assert _FastSymbolParser.parse(uri) is None
+    assert _symbol_fields(parse_symbol(uri)) == _symbol_fields(_parse_symbol_general(uri))
+
+
+def test_parse_symbols(symbols):
+    uris = [symbol.uri for symbol in symbols] * 2
+    parsed_symbols = parse_symbols(uris)
+    assert [symbol.uri for symbol in parsed_symbols] == uris
+    assert parsed_symbols[0] is parsed_symbols[len(symbols)]
@@ -4,7 +4,11 @@ import networkx as nx
 import pytest
 from networkx import DiGraph
 
-from automata.core.symbol.search.rank import SymbolRank, SymbolRankConfig
+from automata.core.symbol.search.rank import (
+    SymbolRank,
+    SymbolRankConfig,
+    SymbolRankEngine,
+)
 
 
 def generate_random_graph(nodes, edges):
@@ -35,6 +39,9 @@ def test_pagerank_config_validation():
             alpha=0.5, max_iterations=100, tolerance=1.0e-3
         )
         invalid_config_tolerance.validate_config(invalid_config_tolerance)
+    with pytest.raises(ValueError):
+        invalid_config_push_tolerance = SymbolRankConfig(push_tolerance=0.0)
+        invalid_config_push_tolerance.validate_config(invalid_config_push_tolerance)
 
 
 def test_prepare_initial_ranks():
@@ -72,3 +79,221 @@ def test_get_ranks_small_graph():
     ranks = pagerank.get_ranks()
     assert len(ranks) == 3
     assert sum(ele[1] for ele in ranks) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_get_ranks_matches_pagerank(weighted):
+    random.seed(0)
+    G = generate_random_graph(50, 120)
+    if weighted:
+        for source, target in G.edges:
+            G[source][target]["weight"] = random.random()
+    similarity = {node: random.random() for node in G}
+    config = SymbolRankConfig(tolerance=1.0e-7)
+
+    ranks = SymbolRank(G, config).get_ranks(query_to_symbol_similarity=similarity)
+    expected_ranks = nx.pagerank(
+        G, alpha=config.alpha, personalization=similarity, tol=1.0e-10, max_iter=1000
+    )
+    assert [rank for _, rank in ranks] == sorted((rank for _, rank in ranks), reverse=True)
+    for node, rank in ranks:
+        assert rank == pytest.approx(expected_ranks[node], abs=1.0e-6)
+
+
+def test_get_ranks_batch_matches_get_ranks():
+    random.seed(0)
+    G = generate_random_graph(40, 80)
+    similarities = [{node: random.random() for node in G} for _ in range(5)] + [None]
+    initial_weights = {node: random.random() for node in G}
+    dangling = {node: random.random() for node in G}
+    rank = SymbolRank(G, SymbolRankConfig())
+
+    for kwargs in [{}, {"initial_weights": initial_weights}, {"dangling": dangling}]:
+        batch_ranks = rank.get_ranks_batch(similarities, **kwargs)
+        assert len(batch_ranks) == len(similarities)
+        for similarity, ranks in zip(similarities, batch_ranks):
+            assert ranks == rank.get_ranks(query_to_symbol_similarity=similarity, **kwargs)
+
+    assert rank.get_ranks_batch([]) == []
+    with pytest.raises(nx.NetworkXError):
+        rank.get_ranks_batch([similarities[0], {0: 1.0}])
+
+
+def test_get_ranks_top_k():
+    random.seed(0)
+    G = generate_random_graph(60, 150)
+    # Repeated similarities produce tied ranks, which must be selected in the order of the graph
+    similarity = {node: float(random.randint(1, 3)) for node in G}
+    G.add_nodes_from(range(60, 70))
+    similarity.update({node: 1.0 for node in range(60, 70)})
+    rank = SymbolRank(G, SymbolRankConfig())
+    ranks = rank.get_ranks(query_to_symbol_similarity=similarity)
+
+    for top_k in [0, 1, 5, 37, len(G), len(G) + 10]:
+        assert rank.get_ranks(query_to_symbol_similarity=similarity, top_k=top_k) == ranks[:top_k]
+    assert rank.get_ranks_batch([similarity, None], top_k=5) == [
+        ranks[:5],
+        rank.get_ranks()[:5],
+    ]
+    with pytest.raises(ValueError):
+        rank.get_ranks(top_k=-1)
+
+
+def test_prepared_graph_invalidation(monkeypatch):
+    G = DiGraph()
+    G.add_edges_from([(1, 2), (2, 3), (3, 1)])
+    rank = SymbolRank(G, SymbolRankConfig())
+    prepared = rank._prepared
+    rank.get_ranks()
+    assert rank._prepared is prepared
+
+    # Changing the graph prepares it again
+    G.add_edge(3, 4)
+    assert len(rank.get_ranks()) == 4
+    assert rank._prepared is not prepared
+
+    # Edits which keep the node and edge counts require an explicit invalidation
+    G.remove_edge(3, 4)
+    G.add_edge(4, 1)
+    prepared = rank._prepared
+    rank.get_ranks()
+    assert rank._prepared is prepared
+    rank.invalidate()
+    ranks = dict(rank.get_ranks())
+    assert ranks == pytest.approx(dict(SymbolRank(G, SymbolRankConfig()).get_ranks()))
+
+    # Frozen graphs are never checked for changes
+    frozen_rank = SymbolRank(nx.freeze(G), SymbolRankConfig())
+
+    def fail_signature(*args, **kwargs):
+        raise AssertionError("Frozen graphs should not be checked for changes")
+
+    monkeypatch.setattr(SymbolRank, "_get_graph_signature", fail_signature)
+    frozen_rank.get_ranks()
+
+
+def test_prepared_graph_invalidation_of_views(monkeypatch):
+    G = DiGraph()
+    G.add_edges_from([(1, 2), (2, 3), (3, 1)])
+    G.add_node(4)
+    view = G.subgraph([1, 2, 3, 4])
+    rank = SymbolRank(view, SymbolRankConfig())
+    ranks = dict(rank.get_ranks())
+
+    # Views are frozen, but they follow the edits of a mutable graph
+    G.add_edge(3, 4)
+    assert dict(rank.get_ranks()) != ranks
+    assert dict(rank.get_ranks()) == pytest.approx(
+        dict(SymbolRank(G, SymbolRankConfig()).get_ranks())
+    )
+
+    # Views of frozen graphs are never checked for changes
+    frozen_view_rank = SymbolRank(nx.freeze(G).subgraph([1, 2, 3]), SymbolRankConfig())
+
+    def fail_signature(*args, **kwargs):
+        raise AssertionError("Views of frozen graphs should not be checked for changes")
+
+    monkeypatch.setattr(SymbolRank, "_get_graph_signature", fail_signature)
+    frozen_view_rank.get_ranks()
+
+
+def test_get_ranks_stats():
+    random.seed(0)
+    G = generate_random_graph(50, 120)
+    reported_stats = []
+    rank = SymbolRank(G, SymbolRankConfig(), stats_callback=reported_stats.append)
+    rank.get_ranks_batch([{node: random.random() for node in G} for _ in range(3)])
+
+    assert reported_stats == rank.last_stats
+    assert len(reported_stats) == 3
+    for stats in reported_stats:
+        assert stats.converged and not stats.warm_started
+        assert stats.iterations > 0 and stats.extrapolations == 0
+        assert stats.residual < len(G) * rank.config.tolerance
+        assert stats.elapsed_time >= 0.0
+
+    # The telemetry of a query which fails to converge is reported before raising
+    rank = SymbolRank(G, SymbolRankConfig(max_iterations=1), stats_callback=reported_stats.append)
+    with pytest.raises(nx.NetworkXError):
+        rank.get_ranks()
+    assert not reported_stats[-1].converged and reported_stats[-1].iterations == 1
+
+
+@pytest.mark.parametrize("alpha", [0.25, 0.85])
+def test_get_ranks_warm_start_and_extrapolation(alpha):
+    random.seed(0)
+    G = generate_random_graph(200, 600)
+    similarity = {node: random.random() for node in G}
+    expected_ranks = nx.pagerank(
+        G, alpha=alpha, personalization=similarity, tol=1.0e-10, max_iter=1000
+    )
+
+    for warm_start in [False, True]:
+        for aitken_extrapolation in [False, True]:
+            config = SymbolRankConfig(
+                alpha=alpha,
+                tolerance=1.0e-7,
+                warm_start=warm_start,
+                aitken_extrapolation=aitken_extrapolation,
+            )
+            rank = SymbolRank(G, config)
+            ranks = rank.get_ranks(query_to_symbol_similarity=similarity)
+            for node, node_rank in ranks:
+                assert node_rank == pytest.approx(expected_ranks[node], abs=1.0e-6)
+            assert rank.last_stats[0].warm_started == warm_start
+            assert (rank.last_stats[0].extrapolations > 0) == (
+                aitken_extrapolation and rank.last_stats[0].iterations > 10
+            )
+
+
+def test_warm_start_global_rank_is_cached():
+    G = DiGraph()
+    G.add_edges_from([(1, 2), (2, 3), (3, 1), (3, 4)])
+    rank = SymbolRank(G, SymbolRankConfig(warm_start=True))
+    rank.get_ranks()
+    global_rank = rank._global_rank
+    assert global_rank is not None
+    expected_ranks = dict(rank.get_ranks())
+    assert dict(zip(global_rank[0].nodes, global_rank[1])) == pytest.approx(
+        expected_ranks, abs=1.0e-5
+    )
+    rank.get_ranks({node: 1.0 for node in G})
+    assert rank._global_rank is global_rank
+
+    rank.invalidate()
+    rank.get_ranks()
+    assert rank._global_rank is not global_rank
+
+    # Explicit initial weights take precedence over the warm start
+    rank.get_ranks(initial_weights={1: 1.0})
+    assert not rank.last_stats[0].warm_started
+
+
+@pytest.mark.parametrize("push_tolerance", [1.0e-2, 1.0e-4])
+def test_get_ranks_push_engine(push_tolerance):
+    random.seed(0)
+    G = generate_random_graph(100, 250)
+    # A peaked similarity, like the cubed z-scores of SymbolSearch
+    similarities = [{node: random.random() ** 6 for node in G} for _ in range(3)]
+    dangling = {node: random.random() for node in G}
+    config = SymbolRankConfig(engine=SymbolRankEngine.PUSH, push_tolerance=push_tolerance)
+    rank = SymbolRank(G, config)
+
+    for kwargs in [{}, {"dangling": dangling}]:
+        push_ranks = rank.get_ranks_batch(similarities, **kwargs)
+        for similarity, ranks, stats in zip(similarities, push_ranks, rank.last_stats):
+            expected_ranks = nx.pagerank(
+                G,
+                alpha=config.alpha,
+                personalization=similarity,
+                dangling=kwargs.get("dangling"),
+                tol=1.0e-12,
+                max_iter=1000,
+            )
+            assert stats.converged and stats.residual <= push_tolerance
+            assert sum(abs(expected_ranks[node] - rank) for node, rank in ranks) <= push_tolerance
+            assert [rank for _, rank in ranks] == sorted((rank for _, rank in ranks), reverse=True)
+
+    rank = SymbolRank(G, SymbolRankConfig(engine=SymbolRankEngine.PUSH, max_iterations=1))
+    with pytest.raises(nx.NetworkXError):
+        rank.get_ranks(query_to_symbol_similarity=similarities[0])
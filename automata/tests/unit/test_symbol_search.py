@@ -1,8 +1,14 @@
 from unittest.mock import patch
 
+import networkx as nx
 import pytest
 
+from automata.core.embedding.code_embedding import SymbolCodeEmbeddingHandler
+from automata.core.embedding.symbol_similarity import SymbolSimilarityCalculator
+from automata.core.symbol.graph import SymbolGraph
 from automata.core.symbol.parser import parse_symbol
+from automata.core.symbol.search.rank import SymbolRank, SymbolRankConfig
+from automata.core.symbol.search.symbol_search import SymbolSearch
 
 
 def test_retrieve_source_code_by_symbol(symbols, symbol_search):
@@ -65,3 +71,38 @@ def test_process_queries(symbols, symbol_search, symbol_graph_mock):
 
     with pytest.raises(ValueError):
         symbol_search.process_query("type:unknown query")
+
+
+def test_symbol_search_does_not_mutate_subgraph(mocker, symbols, symbol_graph_mock):
+    graph = nx.DiGraph()
+    graph.add_edges_from(zip(symbols[:-1], symbols[1:]))
+    subgraph = SymbolGraph.SubGraph(parent=symbol_graph_mock, graph=nx.freeze(graph))
+
+    available_symbols = symbols[:5]
+    symbol_graph_mock.get_all_available_symbols.return_value = available_symbols
+    symbol_similarity_mock = mocker.MagicMock(spec=SymbolSimilarityCalculator)
+    symbol_similarity_mock.embedding_handler = mocker.MagicMock(spec=SymbolCodeEmbeddingHandler)
+    symbol_similarity_mock.embedding_handler.get_all_supported_symbols.return_value = symbols
+
+    for _ in range(2):
+        symbol_search = SymbolSearch(
+            symbol_graph_mock, symbol_similarity_mock, SymbolRankConfig(), subgraph
+        )
+        assert set(symbol_search.symbol_rank.graph.nodes) == set(available_symbols)
+    assert set(subgraph.graph.nodes) == set(symbols)
+
+
+def test_symbol_rank_search_batch(symbols, symbol_search):
+    similarities = {
+        "query 1": {symbol: 1.0 + i for i, symbol in enumerate(symbols)},
+        "query 2": {symbol: 1.0 + i % 3 for i, symbol in enumerate(symbols)},
+    }
+    symbol_search.symbol_code_similarity.calculate_query_similarity_dict.side_effect = (
+        lambda query: similarities[query]
+    )
+    graph = nx.DiGraph()
+    graph.add_edges_from(zip(symbols[:-1], symbols[1:]))
+    symbol_search.symbol_rank = SymbolRank(graph, SymbolRankConfig())
+
+    results = symbol_search.symbol_rank_search_batch(list(similarities))
+    assert results == [symbol_search.symbol_rank_search(query) for query in similarities]
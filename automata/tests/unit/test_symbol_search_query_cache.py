@@ -0,0 +1,179 @@
+import json
+import pickle
+from unittest.mock import MagicMock
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from automata.core.agent.tool.tool_utils import DependencyFactory
+from automata.core.llm.embedding import EmbeddingNormType
+from automata.core.symbol.search import query_cache as query_cache_module
+from automata.core.symbol.search.query_cache import SymbolSearchQueryCache
+from automata.core.symbol.search.rank import SymbolRank, SymbolRankConfig
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_query_cache_lru_eviction(symbols):
+    cache = SymbolSearchQueryCache(max_size=2)
+    cache.put("a", [(symbols[0], 1.0)])
+    cache.put("b", [(symbols[1], 1.0)])
+    assert cache.get("a") == [(symbols[0], 1.0)]
+    cache.put("c", [(symbols[2], 1.0)])
+
+    # "b" was the least recently used entry
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert len(cache) == 2
+    assert cache.metrics.evictions == 1
+    assert (cache.metrics.hits, cache.metrics.misses) == (3, 1)
+    assert cache.metrics.hit_rate == pytest.approx(0.75)
+
+    with pytest.raises(ValueError):
+        SymbolSearchQueryCache(max_size=0)
+
+
+def test_query_cache_ttl(symbols, clock):
+    cache = SymbolSearchQueryCache(ttl=10.0)
+    cache.put("a", [(symbols[0], 1.0)])
+    clock[0] += 5.0
+    assert cache.get("a") is not None
+    clock[0] += 6.0
+    assert cache.get("a") is None
+    assert cache.metrics.expirations == 1 and len(cache) == 0
+
+
+def test_query_cache_persistence(symbols, tmp_path, clock):
+    db_path = str(tmp_path / "query_cache.sqlite3")
+    cache = SymbolSearchQueryCache(max_size=2, ttl=10.0, db_path=db_path)
+    for i, key in enumerate(["a", "b", "c"]):
+        clock[0] += 1.0
+        cache.put(key, [(symbols[i], 1.0)])
+
+    # A new cache serves the most recently stored entries from disk
+    restarted_cache = SymbolSearchQueryCache(max_size=2, ttl=10.0, db_path=db_path)
+    assert restarted_cache.get("a") is None
+    assert restarted_cache.get("c") == [(symbols[2], 1.0)]
+    assert restarted_cache.metrics.disk_hits == 1 and len(restarted_cache) == 1
+
+    clock[0] += 10.0
+    assert restarted_cache.get("b") is None
+    restarted_cache.invalidate()
+    assert SymbolSearchQueryCache(db_path=db_path).get("c") is None
+
+
+def test_query_cache_stores_json(symbols, tmp_path):
+    db_path = str(tmp_path / "query_cache.sqlite3")
+    cache = SymbolSearchQueryCache(db_path=db_path)
+    cache.put("a", [(symbols[0], 0.5), (symbols[1], 0.25)])
+
+    store = cache._store
+    rows = store.select(store.TABLE_NAME, ["results"], {"key": "a"})
+    assert json.loads(rows[0][0]) == [[symbols[0].uri, 0.5], [symbols[1].uri, 0.25]]
+    assert SymbolSearchQueryCache(db_path=db_path).get("a") == [
+        (symbols[0], 0.5),
+        (symbols[1], 0.25),
+    ]
+
+    # Entries which are not JSON, e.g. pickled by an older version, are discarded
+    store.cursor.execute(
+        f"UPDATE {store.TABLE_NAME} SET results = ? WHERE key = ?",
+        (pickle.dumps([(symbols[0].uri, 0.5)]), "a"),
+    )
+    store.conn.commit()
+    restarted_cache = SymbolSearchQueryCache(db_path=db_path)
+    assert restarted_cache.get("a") is None
+    assert store.select(store.TABLE_NAME, ["results"], {"key": "a"}) == []
+
+
+def test_symbol_rank_search_query_cache(symbols, symbol_search):
+    similarity = symbol_search.symbol_code_similarity
+    similarity.calculate_query_similarity_dict.side_effect = lambda query: {
+        symbol: 1.0 + (i * len(query)) % 7 for i, symbol in enumerate(symbols)
+    }
+    similarity.embedding_provider = object()
+    similarity.norm_type = EmbeddingNormType.L2
+    similarity.index_to_symbol = dict(enumerate(symbols))
+    similarity.ordered_embeddings = np.eye(len(symbols))
+    graph = nx.DiGraph()
+    graph.add_edges_from(zip(symbols[:-1], symbols[1:]))
+    symbol_search.symbol_rank = SymbolRank(graph, SymbolRankConfig())
+    symbol_search.query_cache = SymbolSearchQueryCache()
+
+    result = symbol_search.symbol_rank_search("query")
+    assert symbol_search.symbol_rank_search("query") == result
+    assert symbol_search.symbol_rank_search("query", top_k=2) == result[:2]
+    assert symbol_search.symbol_rank_search_batch(["query", "other query"]) == [
+        result,
+        symbol_search.symbol_rank_search("other query"),
+    ]
+    assert similarity.calculate_query_similarity_dict.call_count == 3
+    assert symbol_search.query_cache.metrics.hits == 3
+
+    # Changes to the graph invalidate the cache
+    graph.add_edge(symbols[-1], symbols[0])
+    assert symbol_search.symbol_rank_search("query") != result
+    assert len(symbol_search.query_cache) == 1
+
+    # Changes to the embeddings require an explicit invalidation
+    similarity.ordered_embeddings = 2 * np.eye(len(symbols))
+    symbol_search.symbol_rank_search("query")
+    assert similarity.calculate_query_similarity_dict.call_count == 4
+    symbol_search.invalidate_query_cache()
+    symbol_search.symbol_rank_search("query")
+    assert similarity.calculate_query_similarity_dict.call_count == 5
+
+
+def test_symbol_rank_search_query_cache_embedding_db(symbols, symbol_search, tmp_path):
+    similarity = symbol_search.symbol_code_similarity
+    similarity.calculate_query_similarity_dict.side_effect = lambda query: {
+        symbol: 1.0 + (i * len(query)) % 7 for i, symbol in enumerate(symbols)
+    }
+    similarity.embedding_provider = object()
+    similarity.norm_type = EmbeddingNormType.L2
+    db_path = tmp_path / "embeddings.json"
+    db_path.write_text("[]")
+    similarity.embedding_handler.embedding_db = MagicMock(file_path=str(db_path))
+    graph = nx.DiGraph()
+    graph.add_edges_from(zip(symbols[:-1], symbols[1:]))
+    symbol_search.symbol_rank = SymbolRank(graph, SymbolRankConfig())
+    symbol_search.query_cache = SymbolSearchQueryCache()
+
+    symbol_search.symbol_rank_search("query")
+    symbol_search.symbol_rank_search("query")
+    assert similarity.calculate_query_similarity_dict.call_count == 1
+    # The embeddings are not hashed while they are backed by a file
+    assert symbol_search._embedding_fingerprint is None
+
+    # Rebuilding the embedding database, e.g. in another process, invalidates the cache
+    db_path.write_text("[{}]")
+    symbol_search.symbol_rank_search("query")
+    assert similarity.calculate_query_similarity_dict.call_count == 2
+    assert len(symbol_search.query_cache) == 1
+
+
+def test_dependency_factory_query_cache(symbols, tmp_path, monkeypatch):
+    monkeypatch.setattr(DependencyFactory, "_class_cache", {})
+    db_path = str(tmp_path / "query_cache.sqlite3")
+    symbol_graph = MagicMock()
+    subgraph = MagicMock(graph=nx.DiGraph())
+    subgraph.parent = symbol_graph
+    symbol_code_similarity = MagicMock()
+    symbol_code_similarity.embedding_handler.get_all_supported_symbols.return_value = []
+    factory = DependencyFactory(
+        symbol_graph=symbol_graph,
+        subgraph=subgraph,
+        symbol_code_similarity=symbol_code_similarity,
+        symbol_search_query_cache_path=db_path,
+    )
+
+    symbol_search = factory.get("symbol_search")
+    assert symbol_search.query_cache is factory.get("symbol_search_query_cache")
+    symbol_search.query_cache.put("a", [(symbols[0], 1.0)])
+    assert SymbolSearchQueryCache(db_path=db_path).get("a") == [(symbols[0], 1.0)]
@@ -34,6 +34,18 @@ def test_symbol_rank_search(symbols, symbol_search_tool_builder):
             assert tool.function("symbol") == symbols[0]
 
 
+def test_symbol_rank_search_top_k(symbols):
+    symbol_search_mock = MagicMock()
+    symbol_search_mock.symbol_rank_search.return_value = [(symbols[0], 1), (symbols[1], 0.5)]
+    tool_builder = SymbolSearchToolBuilder(symbol_search=symbol_search_mock, symbol_rank_top_k=2)
+
+    tools = tool_builder.build()
+    for tool in tools:
+        if tool.name == "symbol-rank-search":
+            assert tool.function("symbol") == f"{symbols[0].uri}\n{symbols[1].uri}"
+    symbol_search_mock.symbol_rank_search.assert_called_once_with("symbol", top_k=2)
+
+
 def test_symbol_references(symbol_search_tool_builder):
     symbol_search_tool_builder.symbol_search.symbol_references = MagicMock(
         # TODO - replace with real symbol ref if that remains return type in the manager
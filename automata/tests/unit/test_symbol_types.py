@@ -0,0 +1,58 @@
+import pickle
+from dataclasses import FrozenInstanceError
+
+import jsonpickle
+import pytest
+
+from automata.core.symbol.symbol_types import Symbol, SymbolFile, SymbolReference
+
+
+def test_symbol_types_are_immutable(symbols):
+    symbol = symbols[0]
+    reference = SymbolReference(symbol, 1, 2, {"Definition": True})
+    for obj, attribute in [
+        (symbol, "uri"),
+        (symbol.package, "name"),
+        (symbol.descriptors[0], "name"),
+        (reference, "line_number"),
+        (SymbolFile("a.py", occurrences=""), "path"),
+    ]:
+        with pytest.raises(FrozenInstanceError):
+            setattr(obj, attribute, None)
+        assert not hasattr(obj, "__dict__")
+
+
+def test_symbol_round_trips(symbols):
+    for symbol in symbols:
+        for restored_symbol in [
+            pickle.loads(pickle.dumps(symbol)),
+            jsonpickle.decode(jsonpickle.encode(symbol)),
+        ]:
+            assert restored_symbol == symbol
+            assert restored_symbol.dotpath == symbol.dotpath
+            assert restored_symbol.symbol_kind_by_suffix() == symbol.symbol_kind_by_suffix()
+
+
+def test_symbol_decodes_from_legacy_jsonpickle_format(symbols):
+    symbol = symbols[0]
+    encoded = (
+        '{"py/object": "automata.core.symbol.symbol_types.Symbol", "uri": "%s", '
+        '"scheme": "scip-python", "package": {"py/object": '
+        '"automata.core.symbol.symbol_types.SymbolPackage", "manager": "python", '
+        '"name": "automata", "version": "%s"}, "descriptors": {"py/tuple": []}}'
+        % (symbol.uri, symbol.package.version)
+    )
+    decoded_symbol = jsonpickle.decode(encoded)
+    assert isinstance(decoded_symbol, Symbol)
+    assert decoded_symbol == symbol
+    assert hash(decoded_symbol) == hash(symbol)
+    assert decoded_symbol.package == symbol.package
+
+
+def test_symbol_reference_equality(symbols):
+    reference = SymbolReference(symbols[0], 1, 2, {})
+    assert reference == SymbolReference(symbols[0], 1, 2, {"Definition": True})
+    assert hash(reference) == hash(SymbolReference(symbols[0], 1, 2, {}))
+    assert reference != SymbolReference(symbols[0], 1, 3, {})
+    assert reference != SymbolReference(symbols[1], 1, 2, {})
+    assert pickle.loads(pickle.dumps(reference)) == reference
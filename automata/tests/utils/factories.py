@@ -7,7 +7,7 @@ from automata.core.base.database.vector import JSONVectorDatabase
 from automata.core.embedding.code_embedding import SymbolCodeEmbeddingHandler
 from automata.core.embedding.symbol_similarity import SymbolSimilarityCalculator
 from automata.core.llm.providers.openai import OpenAIEmbeddingProvider
-from automata.core.symbol.graph import SymbolGraph
+from automata.core.symbol.graph import SymbolGraph, SymbolGraphBackend
 from automata.core.symbol.search.rank import SymbolRankConfig
 from automata.core.symbol.search.symbol_search import SymbolSearch
 from automata.core.utils import get_config_fpath
@@ -29,6 +29,15 @@ def symbol_graph_static_test() -> SymbolGraph:
     return graph
 
 
+@pytest.fixture
+def symbol_graph_compact_static_test() -> SymbolGraph:
+    """Creates a non-mock SymbolGraph object backed by the compact storage engine"""
+    file_dir = os.path.dirname(os.path.abspath(__file__))
+    index_path = os.path.join(file_dir, "..", "index.scip")
+    graph = SymbolGraph(index_path, backend=SymbolGraphBackend.COMPACT)
+    return graph
+
+
 @pytest.fixture
 def symbol_search_live() -> SymbolSearch:
     """